@@ -165,14 +165,17 @@ class ExecuteProject(QObject):
             }
             engine_server_address = app_settings.value("appSettings/engineServerAddress", defaultValue="")
             engine_manager = make_engine_manager(engine_server_address)
-            engine_manager.run_engine(engine_data)
-            while True:
-                event_type, data = engine_manager.get_engine_event()
-                self._process_engine_event(event_type, data)
-                if event_type == "dag_exec_finished":
-                    if data == SpineEngineState.FAILED:
-                        return _Status.ERROR
-                    break
+            try:
+                engine_manager.run_engine(engine_data)
+                while True:
+                    event_type, data = engine_manager.get_engine_event()
+                    self._process_engine_event(event_type, data)
+                    if event_type == "dag_exec_finished":
+                        if data == SpineEngineState.FAILED:
+                            return _Status.ERROR
+                        break
+            finally:
+                engine_manager.close()
         return _Status.OK
 
     def _process_engine_event(self, event_type, data):
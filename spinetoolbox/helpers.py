@@ -97,6 +97,25 @@ def add_message_to_document(document, message):
     return cursor
 
 
+def add_messages_to_document(document, messages):
+    """Adds messages to a document in a single insertion and returns the cursor.
+
+    Args:
+        document (QTextDocument)
+        messages (list of str)
+
+    Returns:
+        QTextCursor
+    """
+    cursor = QTextCursor(document)
+    cursor.movePosition(QTextCursor.End)
+    cursor.beginEditBlock()
+    cursor.insertBlock()
+    cursor.insertHtml("".join("<p style='margin:0'>" + message + "</p>" for message in messages))
+    cursor.endEditBlock()
+    return cursor
+
+
 def busy_effect(func):
     """ Decorator to change the mouse cursor to 'busy' while a function is processed.
 
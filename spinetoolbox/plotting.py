@@ -24,8 +24,8 @@ The main entrance points to plotting are:
 :date:   9.7.2019
 """
 
-import functools
 from numbers import Number
+from matplotlib.dates import date2num
 from matplotlib.ticker import MaxNLocator
 import numpy as np
 from PySide2.QtCore import QModelIndex
@@ -142,7 +142,7 @@ def add_array_plot(plot_widget, value, label=None):
         value (Array): the array to plot
         label (str): a label for the array
     """
-    plot_widget.canvas.axes.plot(value.indexes, value.values, label=label)
+    _add_decimated_line(plot_widget, plot_widget.canvas.axes.plot, value.indexes, value.values, label=label)
 
 
 def add_map_plot(plot_widget, map_value, label=None):
@@ -177,7 +177,9 @@ def add_time_series_plot(plot_widget, value, label=None):
         value (TimeSeries): the time series to plot
         label (str): a label for the time series
     """
-    plot_widget.canvas.axes.step(value.indexes, value.values, label=label, where='post')
+    _add_decimated_line(
+        plot_widget, plot_widget.canvas.axes.step, value.indexes, value.values, label=label, where='post'
+    )
     # matplotlib cannot have time stamps before 0001-01-01T00:00 on the x axis
     left, _ = plot_widget.canvas.axes.get_xlim()
     if left < 1.0:
@@ -186,6 +188,95 @@ def add_time_series_plot(plot_widget, value, label=None):
     plot_widget.canvas.figure.autofmt_xdate()
 
 
+def decimate(y, bucket_count):
+    """
+    Selects the points that keep the shape of a line drawn over given number of pixels.
+
+    Points are split into equally sized consecutive buckets,
+    and the first, the last, the minimum and the maximum point of each bucket are kept.
+    This preserves peaks which would be lost by plain subsampling.
+
+    Args:
+        y (numpy.ndarray): y values as floats
+        bucket_count (int): number of buckets, usually the width of the plot in pixels
+
+    Returns:
+        numpy.ndarray: sorted indexes of the kept points
+    """
+    point_count = len(y)
+    if point_count <= 4 * bucket_count:
+        return np.arange(point_count)
+    bucket_size = -(-point_count // bucket_count)
+    bucket_count = -(-point_count // bucket_size)
+    buckets = np.full(bucket_count * bucket_size, np.nan)
+    buckets[:point_count] = y
+    buckets = buckets.reshape(bucket_count, bucket_size)
+    missing = np.isnan(buckets)
+    firsts = np.arange(bucket_count) * bucket_size
+    minima = firsts + np.argmin(np.where(missing, np.inf, buckets), axis=1)
+    maxima = firsts + np.argmax(np.where(missing, -np.inf, buckets), axis=1)
+    lasts = np.minimum(firsts + bucket_size - 1, point_count - 1)
+    indexes = np.unique(np.concatenate((firsts, minima, maxima, lasts)))
+    return indexes[indexes < point_count]
+
+
+class DecimatedLine:
+    """
+    Keeps the full resolution data of a plotted line.
+
+    The line itself holds only the points that are needed to draw the visible x range at the current plot width.
+    """
+
+    def __init__(self, line, x, y):
+        """
+        Args:
+            line (Line2D): the plotted line
+            x (numpy.ndarray): all x values
+            y (numpy.ndarray): all y values as floats
+        """
+        self.line = line
+        self._x = x
+        self._y = y
+        self._numeric_x = date2num(x) if np.issubdtype(x.dtype, np.datetime64) else x.astype(float)
+        self._x_sorted = bool(np.all(self._numeric_x[1:] >= self._numeric_x[:-1]))
+
+    def update(self, x_min, x_max, bucket_count):
+        """
+        Sets the line's data to the decimated points within given x range.
+
+        Args:
+            x_min (float): left end of the visible range in axis units
+            x_max (float): right end of the visible range in axis units
+            bucket_count (int): number of decimation buckets
+        """
+        first = 0
+        last = len(self._y)
+        if self._x_sorted:
+            # Keep one point outside the range on both sides so the line reaches the axes' edges
+            first = max(first, int(np.searchsorted(self._numeric_x, x_min, side="right")) - 1)
+            last = min(last, int(np.searchsorted(self._numeric_x, x_max, side="left")) + 1)
+        indexes = first + decimate(self._y[first:last], bucket_count)
+        self.line.set_data(self._x[indexes], self._y[indexes])
+
+
+def _add_decimated_line(plot_widget, plot_method, x, y, **kwargs):
+    """
+    Plots a line decimated to the plot's width and registers its full resolution data with the plot widget.
+
+    Args:
+        plot_widget (PlotWidget): a plot widget to modify
+        plot_method (Callable): axes' plotting method, e.g. plot or step
+        x (Sequence): x values
+        y (Sequence): y values
+        **kwargs: keyword arguments passed to plot_method
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    indexes = decimate(y, plot_widget.decimation_bucket_count())
+    line = plot_method(x[indexes], y[indexes], **kwargs)[0]
+    plot_widget.add_decimated_line(DecimatedLine(line, x, y))
+
+
 class PlottingHints:
     """A base class for plotting hints.
 
@@ -201,6 +292,28 @@ class PlottingHints:
         """Returns a label for a column."""
         raise NotImplementedError()
 
+    def column_data(self, model, column, rows):
+        """
+        Returns the parsed values of the plottable cells in given rows of a column.
+
+        Args:
+            model (QAbstractTableModel): a table model
+            column (int): a column index to the model
+            rows (Sequence of int): row indexes
+
+        Returns:
+            tuple: list of rows that contain plottable data and list of their parsed values
+        """
+        data_rows = list()
+        values = list()
+        for row in rows:
+            index = model.index(row, column)
+            if not self.is_index_in_data(model, index):
+                continue
+            data_rows.append(row)
+            values.append(model.data(index, role=PARSED_ROLE))
+        return data_rows, values
+
     def filter_columns(self, selections, model):
         """Filters columns and returns the filtered selections."""
         raise NotImplementedError()
@@ -214,6 +327,10 @@ class PlottingHints:
         """Returns a 'human understandable' row number"""
         return row + 1
 
+    def normalize_rows(self, rows, model):
+        """Returns 'human understandable' row numbers as float array."""
+        return np.array([self.normalize_row(row, model) for row in rows], dtype=float)
+
     def special_x_values(self, model, column, rows):
         """Returns X values if available, otherwise returns None."""
         raise NotImplementedError()
@@ -269,6 +386,29 @@ class PivotTablePlottingHints(PlottingHints):
         """Returns a label for a table column."""
         return model.sourceModel().column_name(column)
 
+    def column_data(self, model, column, rows):
+        """See base class."""
+        source_model = model.sourceModel()
+        source_column = self._map_column_to_source(model, column)
+        source_rows = model.map_rows_to_source(rows)
+        data_column_end = source_model.columnCount() - source_model.emptyColumnCount()
+        if source_model.column_is_index_column(source_column):
+            data_rows = list(zip(rows, source_rows))
+        elif source_model.headerColumnCount() <= source_column < data_column_end:
+            first_data_row = source_model.headerRowCount()
+            data_row_end = source_model.rowCount() - source_model.emptyRowCount()
+            data_rows = [
+                (row, source_row)
+                for row, source_row in zip(rows, source_rows)
+                if first_data_row <= source_row < data_row_end
+            ]
+        else:
+            return [], []
+        if not data_rows:
+            return [], []
+        rows, source_rows = zip(*data_rows)
+        return list(rows), source_model.column_data(source_column, source_rows, PARSED_ROLE)
+
     def filter_columns(self, selections, model):
         """Filters the X column from selections."""
         x_column = model.sourceModel().plot_x_column
@@ -289,6 +429,11 @@ class PivotTablePlottingHints(PlottingHints):
         source_row = model.mapToSource(model.index(row, 0)).row()
         return source_row + 1 - model.sourceModel().headerRowCount()
 
+    def normalize_rows(self, rows, model):
+        """See base class."""
+        source_rows = np.array(model.map_rows_to_source(rows), dtype=float)
+        return source_rows + 1 - model.sourceModel().headerRowCount()
+
     def special_x_values(self, model, column, rows):
         """Returns the values from the X column if one is designated otherwise returns None."""
         x_column = model.sourceModel().plot_x_column
@@ -396,20 +541,15 @@ def _collect_single_column_values(model, column, rows, hints):
     Returns:
         tuple: values and label(s)
     """
-    values = list()
     labels = list()
-    for row in sorted(rows):
-        data_index = model.index(row, column)
-        if not hints.is_index_in_data(model, data_index):
-            continue
-        value = model.data(data_index, role=PARSED_ROLE)
+    data_rows, values = hints.column_data(model, column, sorted(rows))
+    for row, value in zip(data_rows, values):
         if isinstance(value, Exception):
             raise PlottingError(f"Failed to plot row {row}: {value}")
         if isinstance(value, (Array, Map, TimeSeries)):
-            labels.append(hints.cell_label(model, data_index))
+            labels.append(hints.cell_label(model, model.index(row, column)))
         elif value is not None and not isinstance(value, Number):
             raise PlottingError(f"Cannot plot row {row}: don't know how to plot a '{type(value).__name__}'.")
-        values.append(value)
     if not values:
         return values, labels
     if isinstance(first_non_null(values), float):
@@ -430,19 +570,12 @@ def _collect_x_column_values(model, column, rows, hints):
     Returns:
         a tuple of values and label(s)
     """
-    values = list()
-    for row in sorted(rows):
-        data_index = model.index(row, column)
-        if not hints.is_index_in_data(model, data_index):
-            continue
-        value = model.data(data_index, role=PARSED_ROLE)
+    _, values = hints.column_data(model, column, sorted(rows))
+    for value in values:
         if isinstance(value, Exception):
             raise PlottingError(f"Failed to plot '{value}'")
         if not isinstance(value, Number):
             raise PlottingError(f"Cannot plot X column value of type {type(value).__name__}.")
-        values.append(value)
-    if not values:
-        return values
     return values
 
 
@@ -459,16 +592,7 @@ def _collect_index_column_values(model, column, rows, hints):
     Returns:
         list: column's values
     """
-    values = list()
-    for row in sorted(rows):
-        data_index = model.index(row, column)
-        if not hints.is_index_in_data(model, data_index):
-            continue
-        data_index = model.index(row, column)
-        data = model.data(data_index, role=PARSED_ROLE)
-        values.append(data)
-    if not values:
-        return values
+    _, values = hints.column_data(model, column, sorted(rows))
     return values
 
 
@@ -605,10 +729,4 @@ def _raise_if_value_types_clash(values, plot_widget):
 
 def _x_values_from_rows(model, rows, hints):
     """Returns x value array constructed from model rows."""
-    normalize = functools.partial(hints.normalize_row, model=model)
-
-    def row_to_index(row):
-        return float(normalize(row))
-
-    x_values = np.asarray(list(map(row_to_index, rows)))
-    return x_values
+    return hints.normalize_rows(rows, model)
@@ -23,7 +23,7 @@ from ..helpers import create_dir, open_url
 from ..metaobject import MetaObject
 from ..project_commands import SetItemSpecificationCommand
 from ..widgets.custom_qtextbrowser import SignedTextDocument
-from ..helpers import format_log_message, add_message_to_document, rename_dir
+from ..helpers import format_log_message, add_message_to_document, add_messages_to_document, rename_dir
 
 
 class ProjectItem(MetaObject):
@@ -480,6 +480,19 @@ class ProjectItem(MetaObject):
             document = self._create_log_document()
         add_message_to_document(document, message)
 
+    def add_log_messages(self, filter_id, messages):
+        """Adds several messages to the log document at once.
+
+        Args:
+            filter_id (str): filter identifier
+            messages (list of str): formatted messages
+        """
+        if filter_id:
+            document = self._create_filter_log_document(filter_id)
+        else:
+            document = self._create_log_document()
+        add_messages_to_document(document, messages)
+
     def add_event_message(self, filter_id, msg_type, msg_text):
         """Adds a message to the log document.
 
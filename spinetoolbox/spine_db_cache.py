@@ -0,0 +1,634 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+The SpineDBCache class
+
+:date:   18.10.2026
+"""
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from copy import deepcopy
+import sys
+from threading import Lock
+
+_MISSING = object()
+
+
+def _restore_cache_item(keys, values, extra):
+    item = CacheItem(keys, values)
+    item._extra = extra  # pylint: disable=protected-access
+    return item
+
+
+class CacheItem(MutableMapping):
+    """A compact, dict-like record for one cached database item.
+
+    The values of the queried columns are kept in a tuple. The mapping from column name to tuple position
+    is shared by all items with the same columns. Keys that are not columns (e.g. lazily computed values)
+    go in a separate dict that is only created when needed.
+    Copies are plain dicts.
+
+    While the item is in a SpineDBCache, changes made to it in place are reported to the cache
+    so the indexes file the item under its new values.
+    """
+
+    __slots__ = ("_layout", "_values", "_extra", "_owner")
+    _layouts = {}
+
+    def __init__(self, keys, values):
+        """
+        Args:
+            keys (tuple(str)): column names
+            values (tuple): column values
+        """
+        layout = self._layouts.get(keys)
+        if layout is None:
+            layout = self._layouts[keys] = {key: pos for pos, key in enumerate(keys)}
+        self._layout = layout
+        self._values = values
+        self._extra = None
+        self._owner = None
+
+    @classmethod
+    def from_row(cls, row):
+        """Makes an item from a query result row.
+
+        Args:
+            row (KeyedTuple)
+
+        Returns:
+            CacheItem
+        """
+        return cls(tuple(row._fields), tuple(row))
+
+    @classmethod
+    def from_dict(cls, d):
+        """Makes an item from a dictionary.
+
+        Args:
+            d (dict)
+
+        Returns:
+            CacheItem
+        """
+        return cls(tuple(d), tuple(d.values()))
+
+    def __getitem__(self, key):
+        pos = self._layout.get(key)
+        if pos is not None:
+            value = self._values[pos]
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        pos = self._layout.get(key)
+        if pos is not None:
+            value = self._values[pos]
+            return default if value is _MISSING else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        pos = self._layout.get(key)
+        if pos is not None:
+            return self._values[pos] is not _MISSING
+        return self._extra is not None and key in self._extra
+
+    def __setitem__(self, key, value):
+        old_value = self.get(key) if self._owner is not None else None
+        pos = self._layout.get(key)
+        if pos is not None:
+            self._values = self._values[:pos] + (value,) + self._values[pos + 1 :]
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        if self._owner is not None:
+            self._owner.field_changed(self, key, old_value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._layout:
+            self[key] = _MISSING
+            return
+        del self._extra[key]
+        if self._owner is not None:
+            self._owner.field_changed(self, key, None)
+
+    def __iter__(self):
+        for key, value in zip(self._layout, self._values):
+            if value is not _MISSING:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"CacheItem({dict(self)!r})"
+
+    def copy(self):
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return _restore_cache_item, (tuple(self._layout), self._values, self._extra)
+
+    def column_record(self):
+        """Returns the column names and values, leaving out keys that are not columns.
+
+        Returns:
+            tuple: column names (tuple of str) and values (tuple)
+        """
+        if _MISSING not in self._values:
+            return tuple(self._layout), self._values
+        pairs = [(key, value) for key, value in zip(self._layout, self._values) if value is not _MISSING]
+        return tuple(key for key, _ in pairs), tuple(value for _, value in pairs)
+
+
+def _approximate_size(value):
+    """Returns the approximate memory footprint of a parsed value in bytes.
+
+    Args:
+        value (object): a value as returned by spinedb_api.from_database
+
+    Returns:
+        int
+    """
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        # NumPy array
+        return nbytes
+    if hasattr(value, "indexes"):
+        # Indexed value
+        return sys.getsizeof(value) + _approximate_size(value.indexes) + _approximate_size(value.values)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_approximate_size(x) for x in value)
+    return sys.getsizeof(value)
+
+
+class ParsedValueCache:
+    """A least recently used cache of parsed parameter values, bounded by their approximate total size in bytes.
+
+    Attributes:
+        max_size (int): maximum total size of cached values in bytes
+        size (int): current total size of cached values in bytes
+        hits (int): number of lookups that found the value in cache
+        misses (int): number of lookups that had to parse the value
+    """
+
+    DEFAULT_MAX_SIZE = 256 * 2 ** 20
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, make_value):
+        """Returns the value for given key. On a miss, calls make_value() and caches the result.
+
+        Args:
+            key (tuple): (db_map, item_type, id)
+            make_value (Callable): returns the parsed value
+
+        Returns:
+            object
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = make_value()
+        size = _approximate_size(value)
+        if size > self.max_size:
+            return value
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self.size -= old_entry[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            self._evict()
+        return value
+
+    def discard(self, key):
+        """Removes the value for given key, if any.
+
+        Args:
+            key (tuple): (db_map, item_type, id)
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size -= entry[1]
+
+    def discard_db_map(self, db_map):
+        """Removes all values from given db map.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] is db_map]:
+                self.size -= self._entries.pop(key)[1]
+
+    def set_max_size(self, max_size):
+        """Sets the maximum total size, evicting values if needed.
+
+        Args:
+            max_size (int): size in bytes
+        """
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def reset_statistics(self):
+        """Zeroes the hit and miss counters."""
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self):
+        while self.size > self.max_size:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+
+
+class _TableOwner:
+    """Forwards in-place changes of the items in one cached table to the cache."""
+
+    __slots__ = ("cache", "db_map", "item_type")
+
+    def __init__(self, cache, db_map, item_type):
+        """
+        Args:
+            cache (SpineDBCache, optional): the cache, or None once the table has been dropped
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+        """
+        self.cache = cache
+        self.db_map = db_map
+        self.item_type = item_type
+
+    def field_changed(self, item, field, old_value):
+        """Updates the cache after an item's field has changed.
+
+        Args:
+            item (CacheItem): changed item
+            field (str): changed field
+            old_value: the field's value before the change
+        """
+        if self.cache is not None:
+            self.cache._reindex_field(  # pylint: disable=protected-access
+                self.db_map, self.item_type, item, field, old_value
+            )
+
+
+def _split_id_list(id_list):
+    """Splits a comma separated id list as found in the wide subqueries.
+    Empty lists give [0], which is never a valid id; e.g. the parameter tag filter uses it for 'untagged'.
+
+    Args:
+        id_list (str, NoneType)
+
+    Returns:
+        list(int)
+    """
+    if not id_list:
+        return [0]
+    return [int(id_) for id_ in id_list.split(",")]
+
+
+class SpineDBCache:
+    """In-memory cache of database items, keyed by db_map, item type and id.
+
+    Besides the items themselves, the cache keeps secondary indexes over the foreign key fields,
+    so items referencing a given set of ids can be found without scanning the whole table.
+    The indexes are updated incrementally as items are cached and uncached.
+
+    Lookups by any other field go through value indexes, which are built lazily
+    the first time a (db_map, item type, field) combination is queried and then kept up to date the same way.
+    CacheItems changed in place are re-indexed as well; items cached as plain dicts must be re-added instead.
+
+    Parsed parameter values are kept separately in a size bounded ParsedValueCache
+    and discarded whenever the corresponding item is updated or uncached.
+    """
+
+    _FOREIGN_KEYS = {
+        "object": ("class_id",),
+        "relationship": ("class_id",),
+        "entity_group": ("entity_id", "group_id", "member_id"),
+        "parameter_definition": ("entity_class_id", "value_list_id"),
+        "parameter_value": ("entity_class_id", "entity_id", "parameter_id", "alternative_id"),
+        "scenario_alternative": ("scenario_id", "alternative_id"),
+        "feature": ("parameter_definition_id", "parameter_value_list_id"),
+        "tool_feature": ("feature_id",),
+    }
+    """Indexed fields holding a single id, per item type."""
+    _FOREIGN_KEY_LISTS = {
+        "relationship_class": ("object_class_id_list",),
+        "relationship": ("object_id_list",),
+        "parameter_definition": ("parameter_tag_id_list",),
+    }
+    """Indexed fields holding a comma separated list of ids, per item type."""
+
+    def __init__(self):
+        self._tables = {}
+        self._indexes = {}
+        self._value_indexes = {}
+        self._owners = {}
+        self._commit_ids = {}
+        self.parsed_values = ParsedValueCache()
+
+    def __contains__(self, db_map):
+        return db_map in self._tables
+
+    def table(self, db_map, item_type):
+        """Returns the cached items of given type in given db map.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+
+        Returns:
+            dict: mapping id to item; empty if nothing is cached
+        """
+        return self._tables.get(db_map, {}).get(item_type, {})
+
+    def get_item(self, db_map, item_type, id_):
+        """Returns the item of the given type in the given db map that has the given id,
+        or an empty dict if not found.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            id_ (int)
+
+        Returns:
+            dict
+        """
+        return self.table(db_map, item_type).get(id_, {})
+
+    def add_items(self, db_map, item_type, items):
+        """Adds items to the cache, replacing any cached items with the same id.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            items (Iterable of dict)
+        """
+        table = self._tables.setdefault(db_map, {}).setdefault(item_type, {})
+        indexes = self._indexes.setdefault(db_map, {}).setdefault(item_type, self._make_indexes(item_type))
+        value_indexes = self._value_indexes.get(db_map, {}).get(item_type, {})
+        owners = self._owners.setdefault(db_map, {})
+        owner = owners.get(item_type)
+        if owner is None:
+            owner = owners[item_type] = _TableOwner(self, db_map, item_type)
+        for item in items:
+            id_ = item["id"]
+            old_item = table.get(id_)
+            if old_item is not None:
+                self._release(old_item)
+                self._unindex(indexes, item_type, id_, old_item)
+                self.parsed_values.discard((db_map, item_type, id_))
+                for field, index in value_indexes.items():
+                    self._discard(index, old_item.get(field), id_)
+            table[id_] = item
+            if isinstance(item, CacheItem):
+                item._owner = owner  # pylint: disable=protected-access
+            self._index(indexes, item_type, id_, item)
+            for field, index in value_indexes.items():
+                index.setdefault(item.get(field), {})[id_] = item
+
+    def pop_item(self, db_map, item_type, id_):
+        """Removes an item from the cache.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            id_ (int)
+
+        Returns:
+            dict: the removed item or an empty dict if not found
+        """
+        item = self.table(db_map, item_type).pop(id_, None)
+        if item is None:
+            return {}
+        self._release(item)
+        self.parsed_values.discard((db_map, item_type, id_))
+        indexes = self._indexes.get(db_map, {}).get(item_type)
+        if indexes is not None:
+            self._unindex(indexes, item_type, id_, item)
+        for field, index in self._value_indexes.get(db_map, {}).get(item_type, {}).items():
+            self._discard(index, item.get(field), id_)
+        return item
+
+    def pop_db_map(self, db_map):
+        """Removes everything cached for given db map.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            bool: True if something was cached for db_map, False otherwise
+        """
+        self._indexes.pop(db_map, None)
+        self._value_indexes.pop(db_map, None)
+        for owner in self._owners.pop(db_map, {}).values():
+            owner.cache = None
+        self._commit_ids.pop(db_map, None)
+        self.parsed_values.discard_db_map(db_map)
+        return self._tables.pop(db_map, None) is not None
+
+    def commit_id(self, db_map):
+        """Returns the id of the latest commit whose changes are known to be cached.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            int or NoneType: commit id, or None if db_map has not been cached in full
+        """
+        return self._commit_ids.get(db_map)
+
+    def set_commit_id(self, db_map, commit_id):
+        """Records that all changes up to given commit are cached.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            commit_id (int, optional): commit id
+        """
+        self._commit_ids[db_map] = commit_id
+
+    def find_items(self, db_map, item_type, field, ids):
+        """Returns cached items whose foreign key field references any of the given ids.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            field (str): a foreign key field or id list field of item_type
+            ids (Iterable of int)
+
+        Returns:
+            list(dict)
+        """
+        index = self._indexes.get(db_map, {}).get(item_type, {}).get(field)
+        if index is None:
+            return self._scan(db_map, item_type, field, set(ids))
+        found = {}
+        for id_ in ids:
+            found.update(index.get(id_, {}))
+        return list(found.values())
+
+    def find_items_by_field(self, db_map, item_type, field, value):
+        """Returns cached items that have the given value for the given field.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            field (str)
+            value
+
+        Returns:
+            list(dict)
+        """
+        if field in self._FOREIGN_KEYS.get(item_type, ()):
+            index = self._indexes.get(db_map, {}).get(item_type, {}).get(field, {})
+        else:
+            index = self._value_index(db_map, item_type, field)
+        try:
+            bucket = index.get(value, {})
+        except TypeError:
+            # Unhashable value
+            return [item for item in self.table(db_map, item_type).values() if item.get(field) == value]
+        # NOTE: Plain dict items modified in place may have left stale entries behind, so check the value again
+        return [item for item in bucket.values() if item.get(field) == value]
+
+    def _value_index(self, db_map, item_type, field):
+        """Returns the value index for given field, building it if needed.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            field (str)
+
+        Returns:
+            dict: mapping field value to a dict of items keyed by id
+        """
+        table = self.table(db_map, item_type)
+        if not table:
+            return {}
+        value_indexes = self._value_indexes.setdefault(db_map, {}).setdefault(item_type, {})
+        index = value_indexes.get(field)
+        if index is None:
+            index = value_indexes[field] = {}
+            for id_, item in table.items():
+                index.setdefault(item.get(field), {})[id_] = item
+        return index
+
+    def _reindex_field(self, db_map, item_type, item, field, old_value):
+        """Moves an item that was changed in place to the index buckets of its new field value.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            item (CacheItem): changed item
+            field (str): changed field
+            old_value: the field's value before the change
+        """
+        id_ = item.get("id")
+        if field in item._layout:  # pylint: disable=protected-access
+            self.parsed_values.discard((db_map, item_type, id_))
+        new_value = item.get(field)
+        indexes = self._indexes.get(db_map, {}).get(item_type, {})
+        index = indexes.get(field)
+        if index is not None:
+            if field in self._FOREIGN_KEY_LISTS.get(item_type, ()):
+                for key in _split_id_list(old_value):
+                    self._discard(index, key, id_)
+                for key in _split_id_list(new_value):
+                    index.setdefault(key, {})[id_] = item
+            else:
+                self._discard(index, old_value, id_)
+                index.setdefault(new_value, {})[id_] = item
+        value_indexes = self._value_indexes.get(db_map, {}).get(item_type, {})
+        value_index = value_indexes.get(field)
+        if value_index is not None:
+            try:
+                self._discard(value_index, old_value, id_)
+                value_index.setdefault(new_value, {})[id_] = item
+            except TypeError:
+                # Unhashable value, the index cannot be kept up to date
+                del value_indexes[field]
+
+    def _scan(self, db_map, item_type, field, ids):
+        """Finds items by going through the whole table. Used for fields that are not indexed."""
+        if field in self._FOREIGN_KEY_LISTS.get(item_type, ()):
+            return [
+                item
+                for item in self.table(db_map, item_type).values()
+                if ids.intersection(_split_id_list(item.get(field)))
+            ]
+        return [item for item in self.table(db_map, item_type).values() if item.get(field) in ids]
+
+    def _make_indexes(self, item_type):
+        fields = self._FOREIGN_KEYS.get(item_type, ()) + self._FOREIGN_KEY_LISTS.get(item_type, ())
+        return {field: {} for field in fields}
+
+    def _index(self, indexes, item_type, id_, item):
+        for field in self._FOREIGN_KEYS.get(item_type, ()):
+            indexes[field].setdefault(item.get(field), {})[id_] = item
+        for field in self._FOREIGN_KEY_LISTS.get(item_type, ()):
+            for key in _split_id_list(item.get(field)):
+                indexes[field].setdefault(key, {})[id_] = item
+
+    def _unindex(self, indexes, item_type, id_, item):
+        for field in self._FOREIGN_KEYS.get(item_type, ()):
+            self._discard(indexes[field], item.get(field), id_)
+        for field in self._FOREIGN_KEY_LISTS.get(item_type, ()):
+            for key in _split_id_list(item.get(field)):
+                self._discard(indexes[field], key, id_)
+
+    @staticmethod
+    def _release(item):
+        """Stops reporting in-place changes of an item that leaves the cache."""
+        if isinstance(item, CacheItem):
+            item._owner = None  # pylint: disable=protected-access
+
+    @staticmethod
+    def _discard(index, key, id_):
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.pop(id_, None)
+        if not bucket:
+            del index[key]
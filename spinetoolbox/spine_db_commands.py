@@ -75,7 +75,7 @@ def _cache_to_db_item(item_type, item):
         "parameter_value": _cache_to_db_parameter_value,
         "parameter_value_list": _cache_to_db_parameter_value_list,
         "entity_group": _cache_to_db_entity_group,
-    }.get(item_type, lambda x: x)(item)
+    }.get(item_type, dict)(item)
 
 
 def _format_item(item_type, item):
@@ -465,3 +465,95 @@ class RemoveItemsCommand(SpineDBCommand):
             item_type: [_format_item(item_type, item) for item in self.undo_typed_db_map_data[item_type][self.db_map]]
             for item_type in reversed(list(self.undo_typed_db_map_data.keys()))
         }
+
+
+class BulkImportCommand(SpineDBCommand):
+    """Undoes and redoes a bulk import.
+
+    Added items are recorded by the highest id each item type had before the import,
+    so undoing removes the items with higher ids. Only the items that the import updated are copied.
+    The removed items are copied when the command is undone, so they can be added back on redo.
+    """
+
+    def __init__(self, db_mngr, db_map, command_text, id_marks, added_counts, updated_items, parent=None):
+        """
+        Args:
+            db_mngr (SpineDBManager): SpineDBManager instance
+            db_map (DiffDatabaseMapping): DiffDatabaseMapping instance
+            command_text (str): command text
+            id_marks (dict): mapping item type to highest id before the import, in the order items are added
+            added_counts (dict): mapping item type to number of added items
+            updated_items (dict): mapping item type to list of updated cache items as they were before the import
+            parent (QUndoCommand, optional): The parent command, used for defining macros.
+        """
+        super().__init__(db_mngr, db_map, parent=parent)
+        if not any(added_counts.values()) and not any(updated_items.values()):
+            self.setObsolete(True)
+        self.setText(command_text)
+        self._id_marks = id_marks
+        self._added_counts = added_counts
+        self._undo_updated_items = {
+            item_type: [_cache_to_db_item(item_type, item) for item in items]
+            for item_type, items in updated_items.items()
+        }
+        self._redo_added_items = None
+        self._redo_updated_items = None
+
+    def redo(self):
+        super().redo()
+        if self._redo_added_items is None:
+            # The import has already been done
+            return
+        for item_type, items in self._redo_added_items.items():
+            if items:
+                self._readd(item_type, items)
+        for item_type, items in self._redo_updated_items.items():
+            if items:
+                self._update(item_type, items)
+        self._redo_added_items = self._redo_updated_items = None
+
+    def undo(self):
+        super().undo()
+        typed_ids = {}
+        self._redo_added_items = {}
+        self._redo_updated_items = {}
+        for item_type, id_mark in self._id_marks.items():
+            added = [x for x in self.db_mngr.get_items(self.db_map, item_type) if x["id"] > id_mark]
+            self._redo_added_items[item_type] = [_cache_to_db_item(item_type, x) for x in added]
+            if added:
+                typed_ids[item_type] = {x["id"] for x in added}
+        for item_type, items in self._undo_updated_items.items():
+            self._redo_updated_items[item_type] = [
+                _cache_to_db_item(item_type, self.db_mngr.get_item(self.db_map, item_type, x["id"])) for x in items
+            ]
+        if typed_ids:
+            self.db_mngr.do_remove_items({self.db_map: typed_ids})
+        for item_type, items in self._undo_updated_items.items():
+            if items:
+                self._update(item_type, items)
+
+    def _readd(self, item_type, items):
+        self.db_mngr.add_or_update_items(
+            {self.db_map: items},
+            self._readd_method_name[item_type],
+            self._get_method_name[item_type],
+            self._added_signal_name[item_type],
+        )
+
+    def _update(self, item_type, items):
+        self.db_mngr.add_or_update_items(
+            {self.db_map: items},
+            self._update_method_name[item_type],
+            self._get_method_name[item_type],
+            self._updated_signal_name[item_type],
+        )
+
+    def data(self):
+        data = {}
+        for item_type, count in self._added_counts.items():
+            if count:
+                data.setdefault(item_type, []).append(f"{count} added")
+        for item_type, items in self._undo_updated_items.items():
+            if items:
+                data.setdefault(item_type, []).append(f"{len(items)} updated")
+        return data
@@ -15,7 +15,7 @@ Classes for drawing graphics items on graph view's QGraphicsScene.
 :authors: M. Marin (KTH), P. Savolainen (VTT)
 :date:   4.4.2018
 """
-from PySide2.QtCore import Qt, Signal, Slot, QLineF, QPointF
+from PySide2.QtCore import Qt, Signal, Slot, QLineF, QPointF, QTimer, QSize
 from PySide2.QtSvg import QGraphicsSvgItem
 from PySide2.QtWidgets import (
     QGraphicsItem,
@@ -60,9 +60,39 @@ def make_figure_graphics_item(scene, z=0, static=True):
     return proxy_widget, figure
 
 
+class _EntityIconItem(QGraphicsSvgItem):
+    """Draws an entity class icon from the pre-rendered pixmaps of SpineDBIconManager."""
+
+    def __init__(self, parent):
+        """
+        Args:
+            parent (EntityItem): the entity item
+        """
+        super().__init__(parent)
+        self.icon_mngr = None
+        self.cached = True
+
+    def paint(self, painter, option, widget=None):
+        """Draws the pixmap that matches the icon's on-screen size, or the vector icon if caching is off."""
+        renderer = self.renderer()
+        if not self.cached or self.icon_mngr is None or not renderer.isValid():
+            super().paint(painter, option, widget)
+            return
+        rect = self.boundingRect()
+        device_rect = painter.worldTransform().mapRect(rect)
+        size = QSize(round(device_rect.width()), round(device_rect.height()))
+        if size.isEmpty():
+            return
+        pixmap = self.icon_mngr.renderer_pixmap(renderer, size, painter.device().devicePixelRatioF())
+        painter.drawPixmap(rect, pixmap, pixmap.rect())
+
+
 class EntityItem(QGraphicsRectItem):
     """Base class for ObjectItem and RelationshipItem."""
 
+    _DOT_MAX_EXTENT = 8
+    """On-screen extent in pixels below which the item is drawn as a plain dot instead of its icon."""
+
     def __init__(self, spine_db_editor, x, y, extent, db_map_entity_id=None):
         """Initializes item
 
@@ -81,8 +111,11 @@ class EntityItem(QGraphicsRectItem):
         self._extent = extent
         self.setRect(-0.5 * self._extent, -0.5 * self._extent, self._extent, self._extent)
         self.setPen(Qt.NoPen)
-        self._svg_item = QGraphicsSvgItem(self)
-        self._svg_item.setCacheMode(QGraphicsItem.CacheMode.NoCache)  # Needed for the exported pdf to be vector
+        self._svg_item = _EntityIconItem(self)
+        self._dot = False
+        dot_color = QGuiApplication.palette().color(QPalette.Normal, QPalette.WindowText)
+        dot_color.setAlphaF(0.8)
+        self._dot_brush = QBrush(dot_color)
         self.refresh_icon()
         self.setPos(x, y)
         self._moved_on_scene = False
@@ -171,6 +204,7 @@ class EntityItem(QGraphicsRectItem):
         self._set_renderer(renderer)
 
     def _set_renderer(self, renderer):
+        self._svg_item.icon_mngr = self.db_mngr.get_icon_mngr(self.db_map)
         self._svg_item.setSharedRenderer(renderer)
         size = renderer.defaultSize()
         scale = self._extent / max(size.width(), size.height())
@@ -185,13 +219,17 @@ class EntityItem(QGraphicsRectItem):
         return path
 
     def paint(self, painter, option, widget=None):
-        """Shows or hides the selection halo."""
+        """Shows or hides the selection halo, and draws the dot if the item is too small for its icon."""
         if option.state & (QStyle.State_Selected):
             self._paint_as_selected()
             option.state &= ~QStyle.State_Selected
         else:
             self._paint_as_deselected()
         super().paint(painter, option, widget)
+        if self._dot:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._dot_brush)
+            painter.drawEllipse(self.rect())
 
     def _paint_as_selected(self):
         self._bg.setBrush(QGuiApplication.palette().highlight())
@@ -217,6 +255,31 @@ class EntityItem(QGraphicsRectItem):
         if factor > 1:
             factor = 1
         self.setScale(factor)
+        self.set_level_of_detail(factor * self._extent)
+
+    def set_level_of_detail(self, extent):
+        """Shows the icon or a plain dot depending on the size of the item on screen.
+
+        Args:
+            extent (float): on-screen extent in pixels
+        """
+        dot = extent < self._DOT_MAX_EXTENT
+        if dot == self._dot:
+            return
+        self._dot = dot
+        self._svg_item.setVisible(not dot)
+        self.update()
+
+    def set_icon_cached(self, cached):
+        """Sets whether the icon is drawn from the icon manager's pre-rendered pixmaps.
+
+        Caching makes painting fast, but the icon must not be cached when exporting to a vector format.
+
+        Args:
+            cached (bool)
+        """
+        self._svg_item.cached = cached
+        self._svg_item.update()
 
     def apply_rotation(self, angle, center):
         """Applies rotation.
@@ -362,6 +425,9 @@ class RelationshipItem(EntityItem):
 class ObjectItem(EntityItem):
     """Represents an object in the Entity graph."""
 
+    _LABEL_MIN_EXTENT = 24
+    """On-screen extent in pixels below which the label is hidden."""
+
     def __init__(self, spine_db_editor, x, y, extent, db_map_entity_id=None):
         """Initializes the item.
 
@@ -395,6 +461,15 @@ class ObjectItem(EntityItem):
         """Refreshes the name."""
         self.label_item.setPlainText(name)
 
+    def set_level_of_detail(self, extent):
+        """Also hides the label if the item is small on screen.
+
+        Args:
+            extent (float): on-screen extent in pixels
+        """
+        super().set_level_of_detail(extent)
+        self.label_item.setVisible(extent >= self._LABEL_MIN_EXTENT)
+
     def _make_tool_tip(self):
         return f"<html><p style='text-align:center;'>{self.entity_name}<br>@{self.db_map.codename}</html>"
 
@@ -519,6 +594,9 @@ class ArcItem(QGraphicsPathItem):
         super().__init__()
         self.rel_item = rel_item
         self.obj_item = obj_item
+        self.batch_item = None
+        self._batched = False
+        self._shown = True
         self._width = float(width)
         self._pen = self._make_pen()
         self.setPen(self._pen)
@@ -558,6 +636,36 @@ class ArcItem(QGraphicsPathItem):
             ctrl_point = line.pointAt(t)
             path.quadTo(ctrl_point, self.obj_item.pos())
         self.setPath(path)
+        if self._batched:
+            self.batch_item.schedule_rebuild()
+
+    def setVisible(self, visible):
+        """Sets visibility, but keeps the item hidden while it is drawn by an ArcBatchItem.
+
+        Args:
+            visible (bool)
+        """
+        self._shown = visible
+        super().setVisible(visible and not self._batched)
+        if self._batched:
+            self.batch_item.schedule_rebuild()
+
+    def is_shown(self):
+        """Returns True if the arc should be drawn, either by itself or by its batch item.
+
+        Returns:
+            bool
+        """
+        return self._shown
+
+    def set_batched(self, batched):
+        """Sets whether the arc is drawn by its batch item instead of by itself.
+
+        Args:
+            batched (bool)
+        """
+        self._batched = batched
+        super().setVisible(self._shown and not batched)
 
     def mousePressEvent(self, event):
         """Accepts the event so it's not propagated."""
@@ -579,6 +687,72 @@ class ArcItem(QGraphicsPathItem):
         self.setPen(self._pen)
 
 
+class ArcBatchItem(QGraphicsPathItem):
+    """Draws many ArcItems as a single path of thin lines when the graph is zoomed out,
+    so the view paints one item instead of thousands."""
+
+    _MAX_WIDTH = 2
+    """On-screen arc width in pixels below which arcs are batched."""
+
+    def __init__(self, arc_items, width):
+        """Initializes item.
+
+        Args:
+            arc_items (list of ArcItem): arcs to batch
+            width (float): the arcs' line width
+        """
+        super().__init__()
+        self._arc_items = arc_items
+        self._width = float(width)
+        self._batched = False
+        self._rebuild_scheduled = False
+        pen = QPen(arc_items[0].pen()) if arc_items else QPen()
+        pen.setCosmetic(True)
+        pen.setWidth(1)
+        self.setPen(pen)
+        self.setZValue(-2)
+        self.setAcceptedMouseButtons(Qt.NoButton)
+        self.setVisible(False)
+        for arc_item in arc_items:
+            arc_item.batch_item = self
+
+    def apply_zoom(self, factor):
+        """Batches or unbatches the arcs.
+
+        Args:
+            factor (float): The zoom factor.
+        """
+        batched = self._width * factor < self._MAX_WIDTH
+        if batched == self._batched:
+            return
+        self._batched = batched
+        for arc_item in self._arc_items:
+            arc_item.set_batched(batched)
+        if batched:
+            self.rebuild()
+        self.setVisible(batched)
+
+    def schedule_rebuild(self):
+        """Rebuilds the path once control returns to the event loop, no matter how many arcs changed."""
+        if self._rebuild_scheduled:
+            return
+        self._rebuild_scheduled = True
+        QTimer.singleShot(0, self.rebuild)
+
+    def rebuild(self):
+        """Rebuilds the path from the arcs that are shown."""
+        self._rebuild_scheduled = False
+        path = QPainterPath()
+        try:
+            for arc_item in self._arc_items:
+                if arc_item.is_shown():
+                    path.addPath(arc_item.path())
+            self.setPath(path)
+        except RuntimeError:
+            # The scene was cleared before the scheduled rebuild
+            pass
+
+
 class CrossHairsItem(RelationshipItem):
     """Creates new relationships directly in the graph."""
 
@@ -20,18 +20,91 @@ import operator
 from ...helpers import tuple_itemgetter
 
 
+class _CountedValues:
+    """Unique values in first-seen order, with the number of times each value has been added."""
+
+    def __init__(self):
+        self._counts = {}
+        self._values = []
+        self._values_valid = True
+
+    def add(self, value):
+        """Adds one reference to value.
+
+        Returns:
+            bool: True if value is new
+        """
+        count = self._counts.get(value, 0)
+        self._counts[value] = count + 1
+        if count:
+            return False
+        if self._values_valid:
+            self._values.append(value)
+        return True
+
+    def remove(self, value):
+        """Removes one reference to value.
+
+        Returns:
+            bool: True if value is gone
+        """
+        count = self._counts.get(value, 0)
+        if count > 1:
+            self._counts[value] = count - 1
+            return False
+        if count == 1:
+            del self._counts[value]
+            self._values_valid = False
+            return True
+        return False
+
+    def values(self):
+        """Returns the values as a list.
+
+        Returns:
+            list
+        """
+        if not self._values_valid:
+            self._values = list(self._counts)
+            self._values_valid = True
+        return self._values
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __iter__(self):
+        return iter(self._counts)
+
+
 class PivotModel:
     def __init__(self):
         self._data = {}  # dictionary of unpivoted data
-        self.index_values = {}  # Maps index id to a sorted set of values for that index
+        self._index_values = {}  # Maps index id to _CountedValues of that index
         self.index_ids = ()  # ids of the indexes in _data, cannot contain duplicates
         self.pivot_rows = ()  # current selected rows indexes
         self.pivot_columns = ()  # current selected columns indexes
         self.pivot_frozen = ()  # current filtered frozen indexes
         self.frozen_value = ()  # current selected value of index_frozen
         self._key_getter = None  # operator.itemgetter placeholder used to translate pivot to keys in _data
-        self._row_data_header = []  # header values for row data
-        self._column_data_header = []  # header values for column data
+        self._row_getter = None  # translates keys in _data to row header values
+        self._column_getter = None  # translates keys in _data to column header values
+        self._frozen_getter = None  # translates keys in _data to frozen values
+        self._row_headers = _CountedValues()  # header values for row data
+        self._column_headers = _CountedValues()  # header values for column data
+        self._frozen_values = _CountedValues()  # values of the frozen indexes
+
+    @property
+    def index_values(self):
+        """Maps index id to unique values of that index in first-seen order."""
+        return self._index_values
+
+    @property
+    def _row_data_header(self):
+        return self._row_headers.values()
+
+    @property
+    def _column_data_header(self):
+        return self._column_headers.values()
 
     def reset_model(self, data, index_ids=(), rows=(), columns=(), frozen=(), frozen_value=()):
         """Resets the model.
@@ -48,51 +121,141 @@ class PivotModel:
         self.frozen_value = None
         # create data dict with keys as long as index_ids
         self._data = data
-        self.index_values = dict(zip(index_ids, zip(*data.keys())))
         self.index_ids = tuple(index_ids)
+        self._index_values = {index_id: _CountedValues() for index_id in self.index_ids}
+        self._add_index_values(self._data)
         self.set_pivot(rows, columns, frozen, frozen_value)
 
     def clear_model(self):
         self._data = {}
-        self.index_values = {}
+        self._index_values = {}
         self.index_ids = ()
         self.pivot_rows = ()
         self.pivot_columns = ()
         self.pivot_frozen = ()
         self.frozen_value = ()
         self._key_getter = None
-        self._row_data_header = []
-        self._column_data_header = []
+        self._row_getter = None
+        self._column_getter = None
+        self._frozen_getter = None
+        self._row_headers = _CountedValues()
+        self._column_headers = _CountedValues()
+        self._frozen_values = _CountedValues()
 
     def update_model(self, data):
+        new_keys = [key for key in data if key not in self._data]
         self._data.update(data)
+        self._add_index_values(new_keys)
+        self._add_headers(new_keys)
 
     def add_to_model(self, data):
+        """Adds data to the model. Time is proportional to the size of data.
+
+        Args:
+            data (dict): data to add
+
+        Returns:
+            tuple: number of rows and columns added at the end of the headers
+        """
+        new_keys = [key for key in data if key not in self._data]
         self._data.update(data)
+        self._add_index_values(new_keys)
+        old_row_count = len(self._row_headers)
+        old_column_count = len(self._column_headers)
+        frozen_value_changed = False
         if not any(self.frozen_value):
             key = next(iter(data), [None, None])
             frozen_value = key[-2:]
+            frozen_value_changed = frozen_value != self.frozen_value
             self.frozen_value = frozen_value
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        added_row_count = len(self._row_data_header) - old_row_count
-        added_column_count = len(self._column_data_header) - old_column_count
+        if frozen_value_changed and self._frozen_getter is not None:
+            self._rebuild_headers()
+        else:
+            self._add_headers(new_keys)
+        added_row_count = len(self._row_headers) - old_row_count
+        added_column_count = len(self._column_headers) - old_column_count
         return added_row_count, added_column_count
 
     def remove_from_model(self, data):
-        self._data = {key: self._data[key] for key in self._data if key not in data}
-        self.index_values = dict(zip(self.index_ids, zip(*self._data.keys())))
-        old_row_count = len(self._row_data_header)
-        old_column_count = len(self._column_data_header)
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
-        removed_row_count = old_row_count - len(self._row_data_header)
-        removed_column_count = old_column_count - len(self._column_data_header)
+        """Removes data from the model. Time is proportional to the size of data.
+
+        Args:
+            data (Iterable): keys to remove
+
+        Returns:
+            tuple: number of rows and columns removed from the headers
+        """
+        removed_keys = [key for key in data if key in self._data]
+        for key in removed_keys:
+            del self._data[key]
+        for key in removed_keys:
+            for value, values in zip(key, self._index_values.values()):
+                values.remove(value)
+        old_row_count = len(self._row_headers)
+        old_column_count = len(self._column_headers)
+        for key in removed_keys:
+            if self._frozen_getter is not None:
+                self._frozen_values.remove(self._frozen_getter(key))
+            if not self._accepts(key):
+                continue
+            if self._row_getter is not None:
+                self._row_headers.remove(self._row_getter(key))
+            if self._column_getter is not None:
+                self._column_headers.remove(self._column_getter(key))
+        removed_row_count = old_row_count - len(self._row_headers)
+        removed_column_count = old_column_count - len(self._column_headers)
         return removed_row_count, removed_column_count
 
+    def frozen_values(self, frozen):
+        """Returns the unique combinations of values of given indexes.
+
+        Args:
+            frozen (tuple): index ids
+
+        Returns:
+            list(tuple): unique value combinations in first-seen order
+        """
+        if tuple(frozen) == self.pivot_frozen and self._frozen_getter is not None:
+            return list(self._frozen_values.values())
+        frozen = tuple(i for i in frozen if i in self.index_ids)
+        if not frozen:
+            return []
+        getter = self._index_key_getter(frozen)
+        return list(dict.fromkeys(getter(key) for key in self._data))
+
+    def _add_index_values(self, keys):
+        for key in keys:
+            for value, values in zip(key, self._index_values.values()):
+                values.add(value)
+
+    def _accepts(self, key):
+        """Checks if key matches the frozen value."""
+        return self._frozen_getter is None or self._frozen_getter(key) == self.frozen_value
+
+    def _add_headers(self, keys):
+        for key in keys:
+            if self._frozen_getter is not None:
+                self._frozen_values.add(self._frozen_getter(key))
+            if not self._accepts(key):
+                continue
+            if self._row_getter is not None:
+                header = self._row_getter(key)
+                if None not in header:
+                    self._row_headers.add(header)
+            if self._column_getter is not None:
+                header = self._column_getter(key)
+                if None not in header:
+                    self._column_headers.add(header)
+
+    def _rebuild_headers(self):
+        self._row_getter = self._index_key_getter(self.pivot_rows) if self.pivot_rows else None
+        self._column_getter = self._index_key_getter(self.pivot_columns) if self.pivot_columns else None
+        self._frozen_getter = self._index_key_getter(self.pivot_frozen) if self.pivot_frozen else None
+        self._row_headers = _CountedValues()
+        self._column_headers = _CountedValues()
+        self._frozen_values = _CountedValues()
+        self._add_headers(self._data)
+
     def _check_pivot(self, rows, columns, frozen, frozen_value):
         """Checks if given pivot is valid.
 
@@ -165,8 +328,7 @@ class PivotModel:
         order = tuple(self.index_ids.index(i) for i in self.pivot_rows + self.pivot_columns + self.pivot_frozen)
         order = tuple(sorted(range(len(order)), key=order.__getitem__))
         self._key_getter = tuple_itemgetter(operator.itemgetter(*order), len(order))
-        self._row_data_header = self._get_unique_index_values(self.pivot_rows)
-        self._column_data_header = self._get_unique_index_values(self.pivot_columns)
+        self._rebuild_headers()
 
     def set_frozen_value(self, value):
         """Sets values for the frozen indexes."""
@@ -195,15 +357,11 @@ class PivotModel:
             raise ValueError("row_mask contains invalid indexes for current row pivot")
         if self.pivot_columns and any(c >= len(self.columns) or c < 0 for c in column_mask):
             raise ValueError("column_mask contains invalid indexes for current column pivot")
+        column_keys = [self.column_key(column) + self.frozen_value for column in column_mask]
         data = []
         for row in row_mask:
-            data_row = []
             row_key = self.row_key(row)
-            for column in column_mask:
-                column_key = self.column_key(column)
-                key = self._key_getter(row_key + column_key + self.frozen_value)
-                data_row.append(self._data.get(key, None))
-            data.append(data_row)
+            data.append([self._data.get(self._key_getter(row_key + column_key), None) for column_key in column_keys])
         return data
 
     def row_key(self, row):
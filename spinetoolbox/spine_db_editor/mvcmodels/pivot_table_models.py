@@ -389,6 +389,53 @@ class PivotTableModelBase(QAbstractTableModel):
     def _data(self, index, role):
         raise NotImplementedError()
 
+    def _column_data(self, rows, column, data, role):
+        """Returns the data of given data rows of one data column.
+
+        Args:
+            rows (list of int): rows in pivot coordinates
+            column (int): column in pivot coordinates
+            data (list): the pivot model's data for each row
+            role (int): data role
+
+        Returns:
+            list: data for each row
+        """
+        header_row_count = self.headerRowCount()
+        header_column_count = self.headerColumnCount()
+        return [self._data(self.index(row + header_row_count, column + header_column_count), role) for row in rows]
+
+    def column_data(self, column, rows, role=Qt.DisplayRole):
+        """Returns the data of given rows of one column.
+
+        The data area of the column is read from the pivot model in one go instead of cell by cell.
+
+        Args:
+            column (int): column
+            rows (Sequence of int): rows
+            role (int): data role
+
+        Returns:
+            list: data for each row
+        """
+        header_row_count = self.headerRowCount()
+        header_column_count = self.headerColumnCount()
+        data_row_end = self.rowCount() - self.emptyRowCount()
+        if role not in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole, PARSED_ROLE) or not (
+            header_column_count <= column < self.columnCount() - self.emptyColumnCount()
+        ):
+            return [self.data(self.index(row, column), role) for row in rows]
+        pivot_rows = [row - header_row_count for row in rows if header_row_count <= row < data_row_end]
+        pivot_column = column - header_column_count
+        pivoted_data = self.model.get_pivoted_data(pivot_rows, [pivot_column]) if pivot_rows else []
+        if len(pivoted_data) != len(pivot_rows):
+            return [self.data(self.index(row, column), role) for row in rows]
+        data = iter(self._column_data(pivot_rows, pivot_column, [data_row[0] for data_row in pivoted_data], role))
+        return [
+            next(data) if header_row_count <= row < data_row_end else self.data(self.index(row, column), role)
+            for row in rows
+        ]
+
     def data(self, index, role=Qt.DisplayRole):
         if role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole, PARSED_ROLE):
             if self.index_in_top(index):
@@ -823,6 +870,14 @@ class ParameterValuePivotTableModel(PivotTableModelBase):
         db_map, id_ = data[0][0]
         return self.db_mngr.get_value(db_map, "parameter_value", id_, role)
 
+    def _column_data(self, rows, column, data, role):
+        """See base class."""
+        get_value = self.db_mngr.get_value
+        return [
+            get_value(db_map_id[0], "parameter_value", db_map_id[1], role) if db_map_id is not None else None
+            for db_map_id in data
+        ]
+
     def _do_batch_set_inner_data(self, row_map, column_map, data, values):
         return self._batch_set_parameter_value_data(row_map, column_map, data, values)
 
@@ -1099,6 +1154,19 @@ class IndexExpansionPivotTableModel(ParameterValuePivotTableModel):
         db_map, id_ = data[0][0]
         return self.db_mngr.get_value_index(db_map, "parameter_value", id_, parameter_index, role)
 
+    def _column_data(self, rows, column, data, role):
+        """See base class."""
+        get_value_index = self.db_mngr.get_value_index
+        column_data = []
+        for row, db_map_id in zip(rows, data):
+            if db_map_id is None:
+                column_data.append(None)
+                continue
+            _, parameter_index = self._header_ids(row, column)[-4]
+            db_map, id_ = db_map_id
+            column_data.append(get_value_index(db_map, "parameter_value", id_, parameter_index, role))
+        return column_data
+
     @staticmethod
     def _parameter_value_to_update(id_, header_ids, value):
         return {"id": id_, "value": value, "index": header_ids[-3]}
@@ -1351,3 +1419,17 @@ class PivotTableSortFilterProxy(QSortFilterProxyModel):
     def batch_set_data(self, indexes, values):
         indexes = [self.mapToSource(index) for index in indexes]
         return self.sourceModel().batch_set_data(indexes, values)
+
+    def map_rows_to_source(self, rows):
+        """Maps proxy rows to source model rows.
+
+        Args:
+            rows (Iterable of int): proxy rows
+
+        Returns:
+            list of int: source rows
+        """
+        if self.sortColumn() < 0 and all(accepted is None for accepted in self.index_filters.values()):
+            # Nothing is filtered out nor sorted, so rows map one to one.
+            return list(rows)
+        return [self.mapToSource(self.index(row, 0)).row() for row in rows]
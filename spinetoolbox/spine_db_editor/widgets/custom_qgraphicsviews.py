@@ -17,16 +17,17 @@ Classes for custom QGraphicsViews for the Entity graph view.
 """
 
 import sys
-from PySide2.QtCore import Qt, QTimeLine, Signal, Slot, QRectF
+from time import monotonic
+from PySide2.QtCore import Qt, QTimeLine, Signal, Slot, QRectF, QThreadPool
 from PySide2.QtWidgets import QMenu
-from PySide2.QtGui import QCursor, QPainter, QIcon
+from PySide2.QtGui import QCursor, QPainter, QIcon, QGuiApplication
 from PySide2.QtPrintSupport import QPrinter
 from ...helpers import CharIconEngine
 from ...widgets.custom_qgraphicsviews import CustomQGraphicsView
 from ...widgets.custom_qwidgets import ToolBarWidgetAction
 from ..graphics_items import EntityItem, ObjectItem, RelationshipItem, CrossHairsArcItem, make_figure_graphics_item
 from .select_position_parameters_dialog import SelectPositionParametersDialog
-from .graph_layout_generator import make_heat_map
+from .graph_layout_generator import HeatMapGenerator, HeatMapTriangulations
 
 
 class EntityQGraphicsView(CustomQGraphicsView):
@@ -51,6 +52,9 @@ class EntityQGraphicsView(CustomQGraphicsView):
         self.prunned_entity_ids = dict()
         self.heat_map_items = list()
         self._point_value_tuples_per_parameter_name = dict()  # Used in the heat map menu
+        self._heat_map_triangulations = HeatMapTriangulations()
+        self._heat_map_gen = None
+        self._heat_map_gen_id = None
         self._hovered_obj_item = None
         self.relationship_class = None
         self.cross_hairs_items = []
@@ -385,12 +389,16 @@ class EntityQGraphicsView(CustomQGraphicsView):
         current_zoom_factor = self.zoom_factor
         self._zoom(1.0 / current_zoom_factor)
         self.scene().clearSelection()
+        for item in self.entity_items:
+            item.set_icon_cached(False)  # Needed for the exported pdf to be vector
         printer = QPrinter()
         printer.setPaperSize(source.size(), QPrinter.Point)
         printer.setOutputFileName(file_path)
         painter = QPainter(printer)
         self.scene().render(painter, QRectF(), source)
         painter.end()
+        for item in self.entity_items:
+            item.set_icon_cached(True)
         self._zoom(current_zoom_factor)
         self._spine_db_editor.file_exported.emit(file_path)
 
@@ -414,6 +422,7 @@ class EntityQGraphicsView(CustomQGraphicsView):
                 )[db_map]
             }
         self._point_value_tuples_per_parameter_name.clear()
+        self._heat_map_triangulations = HeatMapTriangulations()
         for item in self.entity_items:
             for parameter in db_map_class_parameters.get((item.db_map, item.entity_class_id), ()):
                 pv_id = parameter_value_ids.get((item.db_map, parameter["id"], item.entity_id))
@@ -433,12 +442,53 @@ class EntityQGraphicsView(CustomQGraphicsView):
 
     @Slot("QAction")
     def add_heat_map(self, action):
-        """Adds heat map for the parameter in the action text.
+        """Starts computing the heat map for the parameter in the action text.
+        Parameters defined on the same items share the triangulation of the items' positions.
         """
         self._clean_up_heat_map_items()
         point_value_tuples = self._point_value_tuples_per_parameter_name[action.text()]
         x, y, values = zip(*point_value_tuples)
-        heat_map, xv, yv, min_x, min_y, max_x, max_y = make_heat_map(x, y, values)
+        self._heat_map_gen_id = monotonic()
+        self._heat_map_gen = HeatMapGenerator(
+            self._heat_map_gen_id, x, y, values, self._heat_map_tick_count(x, y), self._heat_map_triangulations
+        )
+        self._heat_map_gen.finished.connect(self._add_heat_map_items)
+        QThreadPool.globalInstance().start(self._heat_map_gen)
+
+    def _heat_map_tick_count(self, x, y):
+        """Returns the heat map grid resolution along the longer side of the heat map.
+
+        The heat map figure is never bigger on screen than its extent in scene coordinates, nor than the screen itself,
+        so a finer grid would not be visible.
+
+        Args:
+            x (Sequence of float): x coordinates of the points
+            y (Sequence of float): y coordinates of the points
+
+        Returns:
+            int: tick count
+        """
+        extent = max(max(x) - min(x), max(y) - min(y))
+        screen = QGuiApplication.primaryScreen()
+        if screen is None:
+            return max(2, round(extent))
+        screen_size = screen.size() * screen.devicePixelRatio()
+        return max(2, min(round(extent), max(screen_size.width(), screen_size.height())))
+
+    @Slot(object, object)
+    def _add_heat_map_items(self, heat_map_gen_id, heat_map_data):
+        """Adds the heat map computed by a HeatMapGenerator to the scene.
+
+        Args:
+            heat_map_gen_id (object): generator identifier
+            heat_map_data (tuple): heat map, grid x and y coordinates, and heat map bounds, or None if it failed
+        """
+        if heat_map_gen_id != self._heat_map_gen_id:
+            return
+        self._heat_map_gen = None
+        if heat_map_data is None:
+            return
+        heat_map, xv, yv, min_x, min_y, max_x, max_y = heat_map_data
         heat_map_item, hm_figure = make_figure_graphics_item(self.scene(), z=-3, static=True)
         colorbar_item, cb_figure = make_figure_graphics_item(self.scene(), z=3, static=False)
         colormesh = hm_figure.gca().pcolormesh(xv, yv, heat_map)
@@ -452,6 +502,7 @@ class EntityQGraphicsView(CustomQGraphicsView):
         self.heat_map_items += [heat_map_item, colorbar_item]
 
     def _clean_up_heat_map_items(self):
+        self._heat_map_gen_id = None
         for item in self.heat_map_items:
             item.hide()
             self.scene().removeItem(item)
@@ -17,37 +17,166 @@ Contains the GraphViewMixin class.
 """
 
 import math
+from threading import Lock
 import numpy as np
 from numpy import atleast_1d as arr
-from scipy.sparse.csgraph import dijkstra
+from scipy.interpolate import CloughTocher2DInterpolator
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
+from scipy.spatial import Delaunay
 from PySide2.QtCore import Signal, Slot, QObject, Qt, QRunnable
 from PySide2.QtWidgets import QProgressBar, QDialogButtonBox, QLabel, QWidget, QVBoxLayout, QHBoxLayout
 from PySide2.QtGui import QPainter, QColor
-from spinetoolbox.helpers import busy_effect
 
 
-@busy_effect
-def make_heat_map(x, y, values):
-    values = np.array(values)
-    min_x, min_y, max_x, max_y = min(x), min(y), max(x), max(y)
-    tick_count = round(len(values) ** 2)
-    xticks = np.linspace(min_x, max_x, tick_count)
-    yticks = np.linspace(min_y, max_y, tick_count)
-    xv, yv = np.meshgrid(xticks, yticks)
-    try:
-        import scipy.interpolate  # pylint: disable=import-outside-toplevel
+SPARSE_LAYOUT_THRESHOLD = 1500
+"""Vertex count above which graphs are laid out by :class:`SparseGraphLayoutGenerator`."""
+MULTILEVEL_LAYOUT_THRESHOLD = 5000
+"""Vertex count above which graphs are laid out by :class:`MultilevelGraphLayoutGenerator`."""
+INCREMENTAL_LAYOUT_MAX_NEW_FRACTION = 0.5
+"""Maximum fraction of unplaced vertices for :class:`IncrementalGraphLayoutGenerator` to be used."""
+HEAT_MAP_MAX_TICK_COUNT = 512
+"""Default number of heat map grid ticks along the longer side of the heat map."""
+
+
+def make_layout_generator(
+    identifier, vertex_count, src_inds=(), dst_inds=(), spread=0, heavy_positions=None, initial_positions=None
+):
+    """Returns a layout generator suitable for the size of the graph.
+
+    Args:
+        identifier (object): generator identifier passed along with the signals
+        vertex_count (int): number of vertices
+        src_inds (Sequence of int): source vertex indices of edges
+        dst_inds (Sequence of int): destination vertex indices of edges
+        spread (float): preferred edge length
+        heavy_positions (dict, optional): mapping vertex index to fixed position dict with keys "x" and "y"
+        initial_positions (dict, optional): mapping vertex index to current position dict with keys "x" and "y";
+            if most vertices have one, only the others and their neighborhoods are laid out
+
+    Returns:
+        GraphLayoutGenerator
+    """
+    if heavy_positions is None:
+        heavy_positions = {}
+    if initial_positions:
+        placed_count = len(initial_positions.keys() | heavy_positions.keys())
+        if vertex_count - placed_count <= INCREMENTAL_LAYOUT_MAX_NEW_FRACTION * vertex_count:
+            return IncrementalGraphLayoutGenerator(
+                identifier,
+                vertex_count,
+                src_inds,
+                dst_inds,
+                spread,
+                heavy_positions=heavy_positions,
+                initial_positions=initial_positions,
+            )
+        heavy_positions = {**initial_positions, **heavy_positions}
+    if vertex_count > MULTILEVEL_LAYOUT_THRESHOLD:
+        generator_class = MultilevelGraphLayoutGenerator
+    elif vertex_count > SPARSE_LAYOUT_THRESHOLD:
+        generator_class = SparseGraphLayoutGenerator
+    else:
+        generator_class = GraphLayoutGenerator
+    return generator_class(identifier, vertex_count, src_inds, dst_inds, spread, heavy_positions=heavy_positions)
 
-        points = np.column_stack((x, y))
-        heat_map = scipy.interpolate.griddata(points, values, (xv, yv), method="cubic")
-    except ImportError:
-        import matplotlib.tri as tri  # pylint: disable=import-outside-toplevel
 
-        triang = tri.Triangulation(x, y)
-        interpolator = tri.CubicTriInterpolator(triang, values)
-        heat_map = interpolator(xv, yv)
+def make_heat_map(x, y, values, max_tick_count=HEAT_MAP_MAX_TICK_COUNT, triangulation=None):
+    """Interpolates values scattered on the plane over a regular grid.
+
+    Args:
+        x (Sequence of float): x coordinates of the points
+        y (Sequence of float): y coordinates of the points
+        values (Sequence of float): values at the points
+        max_tick_count (int): number of grid ticks along the longer side of the points' bounding box
+        triangulation (Delaunay, optional): triangulation of the points; computed if not given
+
+    Returns:
+        tuple: heat map, grid x coordinates, grid y coordinates, min x, min y, max x, max y
+    """
+    values = np.asarray(values, dtype=float)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    min_x, min_y, max_x, max_y = x.min(), y.min(), x.max(), y.max()
+    width = max_x - min_x
+    height = max_y - min_y
+    longest = max(width, height)
+    if longest == 0:
+        longest = 1
+    x_tick_count = max(2, round(max_tick_count * width / longest))
+    y_tick_count = max(2, round(max_tick_count * height / longest))
+    xticks = np.linspace(min_x, max_x, x_tick_count)
+    yticks = np.linspace(min_y, max_y, y_tick_count)
+    xv, yv = np.meshgrid(xticks, yticks)
+    if triangulation is None:
+        triangulation = Delaunay(np.column_stack((x, y)))
+    heat_map = CloughTocher2DInterpolator(triangulation, values)(xv, yv)
     return heat_map, xv, yv, min_x, min_y, max_x, max_y
 
 
+class HeatMapTriangulations:
+    """Caches Delaunay triangulations of heat map points,
+    so heat maps of parameters defined on the same points share one triangulation."""
+
+    def __init__(self):
+        self._triangulations = {}
+        self._lock = Lock()
+
+    def get(self, x, y):
+        """Returns the triangulation of given points.
+
+        Args:
+            x (Sequence of float): x coordinates of the points
+            y (Sequence of float): y coordinates of the points
+
+        Returns:
+            Delaunay: triangulation
+        """
+        points = np.column_stack((x, y)).astype(float)
+        key = points.tobytes()
+        with self._lock:
+            triangulation = self._triangulations.get(key)
+            if triangulation is None:
+                triangulation = self._triangulations[key] = Delaunay(points)
+        return triangulation
+
+
+class HeatMapGenerator(QRunnable):
+    """Computes a heat map for the Entity Graph View."""
+
+    class Signals(QObject):
+        finished = Signal(object, object)
+
+    def __init__(self, identifier, x, y, values, max_tick_count=HEAT_MAP_MAX_TICK_COUNT, triangulations=None):
+        """
+        Args:
+            identifier (object): generator identifier passed along with the finished signal
+            x (Sequence of float): x coordinates of the points
+            y (Sequence of float): y coordinates of the points
+            values (Sequence of float): values at the points
+            max_tick_count (int): number of grid ticks along the longer side of the points' bounding box
+            triangulations (HeatMapTriangulations, optional): triangulation cache
+        """
+        super().__init__()
+        self._id = identifier
+        self._x = x
+        self._y = y
+        self._values = values
+        self._max_tick_count = max_tick_count
+        self._triangulations = triangulations if triangulations is not None else HeatMapTriangulations()
+        self._signals = self.Signals()
+        self.finished = self._signals.finished
+
+    def run(self):
+        try:
+            triangulation = self._triangulations.get(self._x, self._y)
+            heat_map = make_heat_map(self._x, self._y, self._values, self._max_tick_count, triangulation)
+        except RuntimeError:
+            # Points are degenerate, e.g. all on the same line
+            heat_map = None
+        self.finished.emit(self._id, heat_map)
+
+
 class ProgressBarWidget(QWidget):
     def __init__(self, layout_generator):
         super().__init__()
@@ -267,3 +396,699 @@ class GraphLayoutGenerator(QRunnable):
         x, y = layout[:, 0], layout[:, 1]
         self.emit_layout_available(x, y)
         self.emit_finished()
+
+
+class SparseGraphLayoutGenerator(GraphLayoutGenerator):
+    """Computes the layout for big graphs without ever building vertex-by-vertex matrices.
+
+    Graph distances are only computed from a handful of pivot vertices over a sparse adjacency matrix.
+    The initial layout comes from pivot MDS and is refined by stochastic stress minimization
+    over the edges and the vertex-pivot pairs, so time and memory are O(pivot_count * (V + E)).
+    Each connected component is laid out on its own, and the components are packed side by side.
+    """
+
+    def __init__(self, *args, pivot_count=50, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pivot_count = pivot_count
+
+    def adjacency_matrix(self):
+        """Returns the sparse, symmetric adjacency matrix of the graph with edge lengths as entries.
+
+        Returns:
+            csr_matrix
+        """
+        src_inds = np.concatenate((arr(self.src_inds), arr(self.dst_inds))).astype(int)
+        dst_inds = np.concatenate((arr(self.dst_inds), arr(self.src_inds))).astype(int)
+        lengths = np.full(len(src_inds), float(self.spread))
+        adjacency = coo_matrix((lengths, (src_inds, dst_inds)), shape=(self.vertex_count, self.vertex_count)).tocsr()
+        adjacency.data[:] = self.spread  # Duplicate edges were summed up
+        return adjacency
+
+    def pivot_distances(self, adjacency):
+        """Picks pivots by max-min selection and computes their shortest-path distances to all vertices.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix
+
+        Returns:
+            tuple: array of pivot indices, and pivot_count x vertex_count array of distances;
+                None if the generator was stopped
+        """
+        vertex_count = adjacency.shape[0]
+        pivot_count = min(self.pivot_count, vertex_count)
+        pivots = np.zeros(pivot_count, dtype=int)
+        dist = np.empty((pivot_count, vertex_count))
+        min_dist = np.full(vertex_count, np.inf)
+        pivot = int(np.argmax(np.diff(adjacency.indptr)))  # Start from the best connected vertex
+        step = math.ceil(pivot_count / 10)
+        for k in range(pivot_count):
+            if self._stopped:
+                return None
+            if k % step == 0:
+                self.progressed.emit(k // step)
+            pivots[k] = pivot
+            dist[k] = dijkstra(adjacency, directed=False, indices=pivot)
+            np.minimum(min_dist, dist[k], out=min_dist)
+            # The farthest reachable vertex from all pivots so far
+            pivot = int(np.argmax(np.where(min_dist == np.inf, -1, min_dist)))
+        # Remove infinites, like the dense generator does
+        dist[dist == np.inf] = self.spread * vertex_count ** (0.5)
+        return pivots, dist
+
+    @staticmethod
+    def pivot_mds(dist):
+        """Returns a two-dimensional embedding from the pivot distances.
+
+        Args:
+            dist (ndarray): pivot_count x vertex_count array of distances
+
+        Returns:
+            ndarray: vertex_count x 2 array of coordinates
+        """
+        squared = dist.T ** 2
+        centered = (
+            squared - squared.mean(axis=0, keepdims=True) - squared.mean(axis=1, keepdims=True) + squared.mean()
+        ) / -2
+        u, s, _ = np.linalg.svd(centered, full_matrices=False)
+        layout = np.zeros((dist.shape[1], 2))
+        dimensions = min(2, len(s))
+        layout[:, :dimensions] = u[:, :dimensions] * s[:dimensions]
+        return layout
+
+    def edge_pairs(self):
+        """Returns the edges as a group of vertex pairs with the preferred edge length as target distance.
+
+        Returns:
+            tuple: first vertices, second vertices and target distances
+        """
+        pair_src = arr(self.src_inds).astype(int)
+        return pair_src, arr(self.dst_inds).astype(int), np.full(len(pair_src), float(self.spread))
+
+    def pivot_pairs(self, pivots, dist):
+        """Returns the vertex-pivot pairs as a group of vertex pairs with graph distances as targets.
+
+        Args:
+            pivots (ndarray): pivot indices
+            dist (ndarray): pivot_count x vertex_count array of distances
+
+        Returns:
+            tuple: first vertices, second vertices and target distances
+        """
+        vertex_count = dist.shape[1]
+        pair_src = np.repeat(pivots, vertex_count)
+        pair_dst = np.tile(np.arange(vertex_count), len(pivots))
+        not_self = pair_src != pair_dst
+        return pair_src[not_self], pair_dst[not_self], dist.ravel()[not_self]
+
+    @staticmethod
+    def fit_scale(layout, pairs):
+        """Scales layout in place so that it best matches the target distances of given vertex pairs.
+
+        Args:
+            layout (ndarray): vertex_count x 2 array of coordinates
+            pairs (tuple): first vertices, second vertices and target distances
+        """
+        pair_src, pair_dst, pair_dist = pairs
+        current = np.linalg.norm(layout[pair_src] - layout[pair_dst], axis=1)
+        denominator = np.dot(current, current)
+        if denominator > 0:
+            layout *= np.dot(current, pair_dist) / denominator
+
+    def refine(self, layout, pair_groups, iterations, fixed=None, preview=True, max_step=None):
+        """Minimizes stress over groups of vertex pairs by stochastic gradient descent.
+
+        All pairs are relaxed simultaneously in each iteration. Moves are averaged per vertex within each group,
+        so that e.g. a vertex's few edges are not drowned out by its many pivot distances.
+
+        Args:
+            layout (ndarray): vertex_count x 2 array of coordinates, updated in place
+            pair_groups (list of tuple): first vertices, second vertices and target distances of each group
+            iterations (int): number of iterations
+            fixed (ndarray, optional): indices of vertices that must not move
+            preview (bool): whether to emit previews and progress
+            max_step (float, optional): upper bound for the step size, to keep a good initial layout from being undone
+
+        Returns:
+            bool: False if the generator was stopped, True otherwise
+        """
+        groups = []
+        for pair_src, pair_dst, pair_dist in pair_groups:
+            if not len(pair_src):
+                continue
+            pair_dist = np.maximum(pair_dist, self.spread * 1e-6)
+            counts = np.bincount(np.concatenate((pair_src, pair_dst)), minlength=len(layout))[:, None]
+            counts[counts == 0] = 1
+            groups.append((pair_src, pair_dst, pair_dist, pair_dist ** self.weight_exp, counts))
+        if not groups:
+            return True
+        maxstep = 1 / min(np.min(weights) for *_, weights, _counts in groups)
+        minstep = 1 / max(np.max(weights) for *_, weights, _counts in groups)
+        if max_step is not None:
+            maxstep = max(minstep, min(maxstep, max_step))
+        lambda_ = np.log(minstep / maxstep) / max(1, iterations - 1)
+        fixed_layout = layout[fixed] if fixed is not None and len(fixed) else None
+        for iteration in range(iterations):
+            if self._stopped:
+                return False
+            if preview:
+                if self._show_previews:
+                    self.emit_layout_available(layout[:, 0], layout[:, 1])
+                self.progressed.emit(iteration)
+            step = maxstep * np.exp(lambda_ * iteration)
+            total_moves = np.zeros_like(layout)
+            for pair_src, pair_dst, pair_dist, weights, counts in groups:
+                delta = layout[pair_src] - layout[pair_dst]
+                dist = np.linalg.norm(delta, axis=1)
+                dist[dist == 0] = self.spread * 1e-6
+                r = ((pair_dist - dist) / dist / 2 * np.minimum(1, weights * step))[:, None] * delta
+                for axis in range(2):
+                    moves = np.bincount(pair_src, weights=r[:, axis], minlength=len(layout))
+                    moves -= np.bincount(pair_dst, weights=r[:, axis], minlength=len(layout))
+                    total_moves[:, axis] += moves / counts[:, 0]
+            layout += total_moves
+            if fixed_layout is not None:
+                layout[fixed] = fixed_layout
+        return True
+
+    def heavy_indices(self, layout):
+        """Places heavy vertices at their positions in layout.
+
+        Args:
+            layout (ndarray): vertex_count x 2 array of coordinates, updated in place
+
+        Returns:
+            ndarray: indices of heavy vertices
+        """
+        heavy_ind = arr(list(self.heavy_positions)).astype(int)
+        if len(heavy_ind):
+            layout[heavy_ind, :] = [[pos["x"], pos["y"]] for pos in self.heavy_positions.values()]
+        return heavy_ind
+
+    def components(self, adjacency):
+        """Splits the graph into its connected components.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix
+
+        Returns:
+            tuple: array mapping each vertex to its component, and list of vertex index arrays, one per component
+        """
+        component_count, labels = connected_components(adjacency, directed=False)
+        order = np.argsort(labels, kind="stable")
+        splits = np.cumsum(np.bincount(labels, minlength=component_count))[:-1]
+        return labels, np.split(order, splits)
+
+    def component_layout(self, adjacency, edge_pairs, heavy_ind, heavy_pos, preview):
+        """Lays out a connected graph with pivot MDS and sparse stress.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix of the component
+            edge_pairs (tuple): first vertices, second vertices and target distances of the component's edges
+            heavy_ind (ndarray): indices of heavy vertices within the component
+            heavy_pos (ndarray): positions of the heavy vertices
+            preview (bool): whether the component is the whole graph, so messages and previews make sense
+
+        Returns:
+            ndarray: vertex_count x 2 array of coordinates; None if the generator was stopped
+        """
+        if preview:
+            self.msg.emit("Step 1 of 2: Computing distances to pivots...")
+        pivot_dist = self.pivot_distances(adjacency)
+        if pivot_dist is None:
+            return None
+        pivots, dist = pivot_dist
+        layout = self.pivot_mds(dist)
+        pivot_pairs = self.pivot_pairs(pivots, dist)
+        self.fit_scale(layout, pivot_pairs)
+        layout[heavy_ind] = heavy_pos
+        if preview:
+            self.msg.emit("Step 2 of 2: Generating layout...")
+        if not self.refine(layout, [edge_pairs, pivot_pairs], self.iterations, fixed=heavy_ind, preview=preview):
+            return None
+        return layout
+
+    def layout_components(self, adjacency):
+        """Lays out each connected component on its own and packs the components side by side.
+
+        Graph distances between components are infinite, so laying them out together
+        would pile them up on top of each other.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix
+
+        Returns:
+            ndarray: vertex_count x 2 array of coordinates; None if the generator was stopped
+        """
+        labels, components = self.components(adjacency)
+        whole_graph = len(components) == 1
+        if not whole_graph:
+            self.msg.emit(f"Laying out {len(components)} connected components...")
+        is_heavy = np.zeros(self.vertex_count, dtype=bool)
+        layout = np.zeros((self.vertex_count, 2))
+        heavy_ind = self.heavy_indices(layout)
+        is_heavy[heavy_ind] = True
+        edge_src, edge_dst, edge_dist = self.edge_pairs()
+        edge_labels = labels[edge_src]
+        edge_order = np.argsort(edge_labels, kind="stable")
+        edge_splits = np.cumsum(np.bincount(edge_labels, minlength=len(components)))[:-1]
+        local = np.zeros(self.vertex_count, dtype=int)
+        fixed_components = []
+        free_components = []
+        small_components = []
+        for inds, edges in zip(components, np.split(edge_order, edge_splits)):
+            if self._stopped:
+                return None
+            component_heavy_ind = np.flatnonzero(is_heavy[inds])
+            (fixed_components if len(component_heavy_ind) else free_components).append(inds)
+            if len(inds) == 1:
+                continue
+            if not whole_graph and len(inds) <= self.pivot_count:
+                small_components.append(inds)
+                continue
+            local[inds] = np.arange(len(inds))
+            edge_pairs = local[edge_src[edges]], local[edge_dst[edges]], edge_dist[edges]
+            component_layout = self.component_layout(
+                adjacency[inds][:, inds],
+                edge_pairs,
+                component_heavy_ind,
+                layout[inds[component_heavy_ind]],
+                whole_graph,
+            )
+            if component_layout is None:
+                return None
+            layout[inds] = component_layout
+        if small_components and not self.small_components_layout(adjacency, small_components, layout, is_heavy):
+            return None
+        self.pack_components(layout, fixed_components, free_components)
+        return layout
+
+    def small_components_layout(self, adjacency, components, layout, is_heavy, batch_size=500):
+        """Lays out small components all at once by stress over every vertex pair within each component.
+
+        All vertices of a component no bigger than pivot_count would be pivots anyway,
+        and a single run avoids the overhead of laying out thousands of tiny components one by one.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix
+            components (list of ndarray): vertex indices of the small components
+            layout (ndarray): vertex_count x 2 array of coordinates, updated in place
+            is_heavy (ndarray): boolean mask of heavy vertices
+            batch_size (int): number of vertices whose distances are computed at a time
+
+        Returns:
+            bool: False if the generator was stopped, True otherwise
+        """
+        inds = np.concatenate(components)
+        sizes = np.array([len(component) for component in components])
+        bounds = np.cumsum(sizes)
+        sub_adjacency = adjacency[inds][:, inds]
+        pair_src, pair_dst, pair_dist = [], [], []
+        start = 0
+        # The components follow each other, so their distances come from blocks along the diagonal
+        for stop in bounds:
+            if stop - start < batch_size and stop != bounds[-1]:
+                continue
+            dist = dijkstra(sub_adjacency[start:stop, start:stop], directed=False)
+            rows, cols = np.nonzero(np.isfinite(dist) & (dist > 0))
+            upper = rows < cols
+            rows, cols = rows[upper], cols[upper]
+            pair_src.append(start + rows)
+            pair_dst.append(start + cols)
+            pair_dist.append(dist[rows, cols])
+            start = stop
+        rng = np.random.default_rng(0)
+        diameters = np.repeat(self.spread * np.sqrt(sizes), sizes)[:, None]
+        sub_layout = (rng.random((len(inds), 2)) - 0.5) * diameters
+        heavy_ind = np.flatnonzero(is_heavy[inds])
+        sub_layout[heavy_ind] = layout[inds[heavy_ind]]
+        pairs = np.concatenate(pair_src), np.concatenate(pair_dst), np.concatenate(pair_dist)
+        if not self.refine(sub_layout, [pairs], self.iterations, fixed=heavy_ind, preview=False):
+            return False
+        layout[inds] = sub_layout
+        return True
+
+    def pack_components(self, layout, fixed_components, free_components):
+        """Moves components without heavy vertices into rows, tallest first, next to the components with them.
+
+        Args:
+            layout (ndarray): vertex_count x 2 array of coordinates, updated in place
+            fixed_components (list of ndarray): vertex indices of components that must stay where they are
+            free_components (list of ndarray): vertex indices of components that can be moved
+        """
+        if not free_components or (len(free_components) == 1 and not fixed_components):
+            return
+        gap = self.spread
+        mins = np.array([layout[inds].min(axis=0) for inds in free_components])
+        sizes = np.array([layout[inds].max(axis=0) for inds in free_components]) - mins + gap
+        row_width = max(sizes[:, 0].max(), math.sqrt(sizes.prod(axis=1).sum()))
+        if fixed_components:
+            fixed_layout = layout[np.concatenate(fixed_components)]
+            origin = np.array([fixed_layout[:, 0].max() + gap, fixed_layout[:, 1].min()])
+        else:
+            origin = np.zeros(2)
+        x = y = row_height = 0.0
+        for k in np.argsort(-sizes[:, 1], kind="stable"):
+            width, height = sizes[k]
+            if x > 0 and x + width > row_width:
+                x, y, row_height = 0.0, y + row_height, 0.0
+            layout[free_components[k]] += origin + (x, y) - mins[k]
+            x += width
+            row_height = max(row_height, height)
+
+    def run(self):
+        """Computes and returns x and y coordinates for each vertex in the graph, component by component."""
+        if self.vertex_count <= 1:
+            self.emit_layout_available(np.array([0.0]), np.array([0.0]))
+            self.emit_finished()
+            return
+        layout = self.layout_components(self.adjacency_matrix())
+        if layout is not None:
+            self.emit_layout_available(layout[:, 0], layout[:, 1])
+        self.emit_finished()
+
+
+class IncrementalGraphLayoutGenerator(SparseGraphLayoutGenerator):
+    """Extends an existing layout with new vertices.
+
+    Vertices with an initial position keep it, unless they neighbor a new vertex.
+    New vertices are placed next to their placed neighbors, and then only the new vertices
+    and their neighborhoods are optimized against graph distances within a few hops.
+    """
+
+    def __init__(self, *args, initial_positions=None, neighborhood_hops=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        if initial_positions is None:
+            initial_positions = {}
+        self.initial_positions = initial_positions
+        self.neighborhood_hops = neighborhood_hops
+
+    def place_new_vertices(self, layout, placed, links):
+        """Places unplaced vertices at the center of their placed neighbors, growing out from the placed ones.
+
+        Vertices not connected to any placed vertex are scattered around the layout.
+
+        Args:
+            layout (ndarray): vertex_count x 2 array of coordinates, updated in place
+            placed (ndarray): boolean mask of placed vertices, updated in place
+            links (csr_matrix): binary adjacency matrix
+        """
+        rng = np.random.default_rng(0)
+        while not placed.all():
+            unplaced = np.flatnonzero(~placed)
+            neighbor_counts = links[unplaced] @ placed.astype(float)
+            reachable = neighbor_counts > 0
+            if not reachable.any():
+                center = layout[placed].mean(axis=0) if placed.any() else np.zeros(2)
+                layout[unplaced] = center + (rng.random((len(unplaced), 2)) - 0.5) * self.initial_diameter
+                placed[unplaced] = True
+                break
+            unplaced = unplaced[reachable]
+            centers = (links[unplaced] @ (layout * placed[:, None])) / neighbor_counts[reachable, None]
+            angles = rng.random(len(unplaced)) * 2 * np.pi
+            offsets = 0.5 * self.spread * np.column_stack((np.cos(angles), np.sin(angles)))
+            layout[unplaced] = centers + offsets
+            placed[unplaced] = True
+
+    def neighborhood(self, new_inds, links):
+        """Returns new vertices together with the vertices within neighborhood_hops from them.
+
+        Args:
+            new_inds (ndarray): indices of new vertices
+            links (csr_matrix): binary adjacency matrix
+
+        Returns:
+            ndarray: vertex indices
+        """
+        in_neighborhood = np.zeros(self.vertex_count, dtype=bool)
+        in_neighborhood[new_inds] = True
+        for _ in range(self.neighborhood_hops):
+            in_neighborhood |= (links @ in_neighborhood.astype(float)) > 0
+        return np.flatnonzero(in_neighborhood)
+
+    def local_pairs(self, movable, adjacency, chunk_size=100):
+        """Returns pairs between movable vertices and the vertices around them, with graph distances as targets.
+
+        Args:
+            movable (ndarray): indices of movable vertices
+            adjacency (csr_matrix): adjacency matrix
+            chunk_size (int): number of movable vertices to process at a time
+
+        Returns:
+            tuple: first vertices, second vertices and target distances
+        """
+        limit = self.spread * (self.neighborhood_hops + 2)
+        pair_src, pair_dst, pair_dist = [], [], []
+        for start in range(0, len(movable), chunk_size):
+            sources = movable[start : start + chunk_size]
+            dist = np.atleast_2d(dijkstra(adjacency, directed=False, indices=sources, limit=limit))
+            rows, cols = np.nonzero(np.isfinite(dist) & (dist > 0))
+            pair_src.append(sources[rows])
+            pair_dst.append(cols)
+            pair_dist.append(dist[rows, cols])
+        return np.concatenate(pair_src), np.concatenate(pair_dst), np.concatenate(pair_dist)
+
+    def run(self):
+        """Computes and returns x and y coordinates for each vertex in the graph, laying out only the new part."""
+        layout = np.zeros((self.vertex_count, 2))
+        placed = np.zeros(self.vertex_count, dtype=bool)
+        for ind, pos in self.initial_positions.items():
+            layout[ind] = pos["x"], pos["y"]
+            placed[ind] = True
+        heavy_ind = self.heavy_indices(layout)
+        placed[heavy_ind] = True
+        new_inds = np.flatnonzero(~placed)
+        if not len(new_inds):
+            self.emit_layout_available(layout[:, 0], layout[:, 1])
+            self.emit_finished()
+            return
+        self.msg.emit("Placing new vertices...")
+        adjacency = self.adjacency_matrix()
+        links = adjacency.copy()
+        links.data[:] = 1.0
+        self.place_new_vertices(layout, placed, links)
+        movable = np.setdiff1d(self.neighborhood(new_inds, links), heavy_ind)
+        fixed = np.setdiff1d(np.arange(self.vertex_count), movable)
+        if len(movable):
+            self.refine(layout, [self.local_pairs(movable, adjacency)], self.iterations, fixed=fixed)
+        self.emit_layout_available(layout[:, 0], layout[:, 1])
+        self.emit_finished()
+
+
+class MultilevelGraphLayoutGenerator(SparseGraphLayoutGenerator):
+    """Computes the layout for very big graphs level by level.
+
+    The graph is coarsened repeatedly by merging matched neighbors into clusters until it is small.
+    Pivot distances are computed once on the original graph and averaged over the clusters of each level.
+    The coarsest graph is laid out with pivot MDS and sparse stress, and each finer level starts from
+    the layout of the level above, with vertices placed at their cluster's position, and is refined briefly.
+    Each connected component goes through the levels on its own.
+    """
+
+    def __init__(
+        self, *args, coarsest_vertex_count=500, min_reduction=0.25, local_extent=4, refine_pivot_count=10, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.refine_pivot_count = refine_pivot_count
+        self.coarsest_vertex_count = coarsest_vertex_count
+        self.min_reduction = min_reduction
+        self.local_extent = local_extent
+
+    @staticmethod
+    def coarsen(links, weights):
+        """Clusters the vertices of a graph by matching each vertex with its lightest unmatched neighbor.
+
+        Lower degree vertices are visited first. A vertex whose neighbors are all taken joins
+        the lightest neighboring cluster, unless that would make it more than twice as heavy as a matched pair.
+
+        Args:
+            links (csr_matrix): binary adjacency matrix
+            weights (ndarray): vertex weights, i.e. the number of original vertices each vertex stands for
+
+        Returns:
+            tuple: array mapping each vertex to its cluster, and number of clusters
+        """
+        vertex_count = links.shape[0]
+        parent = np.full(vertex_count, -1)
+        cluster_weights = np.zeros(vertex_count)
+        max_cluster_weight = 4 * weights.mean()
+        cluster_count = 0
+        indptr, indices = links.indptr, links.indices
+        for vertex in np.argsort(np.diff(indptr), kind="stable"):
+            if parent[vertex] != -1:
+                continue
+            neighbors = indices[indptr[vertex] : indptr[vertex + 1]]
+            free_neighbors = neighbors[parent[neighbors] == -1]
+            if len(free_neighbors):
+                mate = free_neighbors[np.argmin(weights[free_neighbors])]
+                parent[vertex] = parent[mate] = cluster_count
+                cluster_weights[cluster_count] = weights[vertex] + weights[mate]
+                cluster_count += 1
+                continue
+            if len(neighbors):
+                clusters = parent[neighbors]
+                cluster = clusters[np.argmin(cluster_weights[clusters])]
+                if cluster_weights[cluster] + weights[vertex] <= max_cluster_weight:
+                    parent[vertex] = cluster
+                    cluster_weights[cluster] += weights[vertex]
+                    continue
+            parent[vertex] = cluster_count
+            cluster_weights[cluster_count] = weights[vertex]
+            cluster_count += 1
+        return parent, cluster_count
+
+    @staticmethod
+    def contract(links, parent, cluster_count):
+        """Returns the binary adjacency matrix between clusters.
+
+        Args:
+            links (csr_matrix): binary adjacency matrix
+            parent (ndarray): array mapping each vertex to its cluster
+            cluster_count (int): number of clusters
+
+        Returns:
+            csr_matrix
+        """
+        vertex_count = links.shape[0]
+        membership = coo_matrix(
+            (np.ones(vertex_count), (np.arange(vertex_count), parent)), shape=(vertex_count, cluster_count)
+        ).tocsr()
+        coarse_links = (membership.T @ links @ membership).tocsr()
+        coarse_links.setdiag(0)
+        coarse_links.eliminate_zeros()
+        coarse_links.data[:] = 1.0
+        return coarse_links
+
+    def build_levels(self, adjacency):
+        """Coarsens the graph until it is small enough or stops shrinking.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix of the original graph
+
+        Returns:
+            list: tuples of binary adjacency matrix, vertex weights and mapping from original vertices
+                of each level, from finest to coarsest; None if the generator was stopped
+        """
+        links = adjacency.copy()
+        links.data[:] = 1.0
+        weights = np.ones(links.shape[0])
+        to_level = np.arange(links.shape[0])
+        levels = [(links, weights, to_level)]
+        while links.shape[0] > self.coarsest_vertex_count:
+            if self._stopped:
+                return None
+            parent, cluster_count = self.coarsen(links, weights)
+            if cluster_count > (1 - self.min_reduction) * links.shape[0]:
+                break
+            links = self.contract(links, parent, cluster_count)
+            weights = np.bincount(parent, weights=weights, minlength=cluster_count)
+            to_level = parent[to_level]
+            levels.append((links, weights, to_level))
+        return levels
+
+    @staticmethod
+    def level_pivot_distances(dist, to_level, weights):
+        """Averages pivot distances over the clusters of a level.
+
+        Args:
+            dist (ndarray): pivot_count x vertex_count array of distances in the original graph
+            to_level (ndarray): mapping from original vertices to the clusters of the level
+            weights (ndarray): cluster sizes
+
+        Returns:
+            ndarray: pivot_count x cluster_count array of distances
+        """
+        return np.array([np.bincount(to_level, weights=row, minlength=len(weights)) for row in dist]) / weights
+
+    def level_edge_pairs(self, links, dist):
+        """Returns the edges of a level as a group of vertex pairs.
+
+        Edge lengths are estimated as the largest difference in distance to any pivot,
+        which is a lower bound for the distance between the clusters.
+
+        Args:
+            links (csr_matrix): binary adjacency matrix
+            dist (ndarray): pivot_count x cluster_count array of distances
+
+        Returns:
+            tuple: first vertices, second vertices and target distances
+        """
+        edges = links.tocoo()
+        upper = edges.row < edges.col
+        pair_src, pair_dst = edges.row[upper], edges.col[upper]
+        pair_dist = np.max(np.abs(dist[:, pair_src] - dist[:, pair_dst]), axis=0, initial=0)
+        return pair_src, pair_dst, np.maximum(pair_dist, self.spread)
+
+    def component_layout(self, adjacency, edge_pairs, heavy_ind, heavy_pos, preview):
+        """Lays out a connected graph with multi-level sparse stress.
+
+        Args:
+            adjacency (csr_matrix): adjacency matrix of the component
+            edge_pairs (tuple): first vertices, second vertices and target distances of the component's edges
+            heavy_ind (ndarray): indices of heavy vertices within the component
+            heavy_pos (ndarray): positions of the heavy vertices
+            preview (bool): whether the component is the whole graph, so messages and previews make sense
+
+        Returns:
+            ndarray: vertex_count x 2 array of coordinates; None if the generator was stopped
+        """
+        if preview:
+            self.msg.emit("Step 1 of 3: Computing distances to pivots...")
+        pivot_dist = self.pivot_distances(adjacency)
+        if pivot_dist is None:
+            return None
+        pivots, dist = pivot_dist
+        if preview:
+            self.msg.emit("Step 2 of 3: Coarsening graph...")
+        levels = self.build_levels(adjacency)
+        if levels is None:
+            return None
+        rng = np.random.default_rng(0)
+        layout = None
+        previous_to_level = None
+        for level in reversed(range(len(levels))):
+            links, weights, to_level = levels[level]
+            vertex_count = links.shape[0]
+            if preview:
+                self.msg.emit(f"Step 3 of 3: Laying out level {len(levels) - level} of {len(levels)}...")
+            if level == 0:
+                level_dist = dist
+                level_edge_pairs = edge_pairs
+            else:
+                level_dist = self.level_pivot_distances(dist, to_level, weights)
+                level_edge_pairs = self.level_edge_pairs(links, level_dist)
+            if layout is not None:
+                # The global shape is settled, the first few pivots are enough to keep it
+                level_pivots, level_dist = pivots[: self.refine_pivot_count], level_dist[: self.refine_pivot_count]
+            else:
+                level_pivots = pivots
+            pivot_pairs = self.pivot_pairs(to_level[level_pivots], level_dist)
+            if layout is None:
+                layout = self.pivot_mds(level_dist)
+                self.fit_scale(layout, pivot_pairs)
+                iterations = self.iterations
+                max_step = None
+            else:
+                # Put each vertex where its cluster was, give or take half an edge
+                parent = np.zeros(vertex_count, dtype=int)
+                parent[to_level] = previous_to_level
+                layout = layout[parent] + (rng.random((vertex_count, 2)) - 0.5) * self.spread
+                iterations = max(3, self.iterations // 2)
+                max_step = (self.local_extent * self.spread) ** 2 * weights.max()
+            fixed = None
+            if level == 0:
+                layout[heavy_ind] = heavy_pos
+                fixed = heavy_ind
+            if not self.refine(
+                layout,
+                [level_edge_pairs, pivot_pairs],
+                iterations,
+                fixed=fixed,
+                preview=preview and level == 0,
+                max_step=max_step,
+            ):
+                return None
+            if level != 0 and preview and self._show_previews:
+                level_preview = layout[to_level]
+                self.emit_layout_available(level_preview[:, 0], level_preview[:, 1])
+            previous_to_level = to_level
+        return layout
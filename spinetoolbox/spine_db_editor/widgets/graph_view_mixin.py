@@ -27,11 +27,12 @@ from ..graphics_items import (
     ObjectItem,
     RelationshipItem,
     ArcItem,
+    ArcBatchItem,
     CrossHairsItem,
     CrossHairsRelationshipItem,
     CrossHairsArcItem,
 )
-from .graph_layout_generator import GraphLayoutGenerator
+from .graph_layout_generator import GraphLayoutGenerator, make_layout_generator
 from .add_items_dialogs import AddObjectsDialog, AddReadyRelationshipsDialog
 
 
@@ -51,6 +52,7 @@ class GraphViewMixin:
         self.object_items = list()
         self.relationship_items = list()
         self.arc_items = list()
+        self.arc_batch_item = None
         self.selected_tree_inds = {}
         self.object_ids = list()
         self.relationship_ids = list()
@@ -358,24 +360,29 @@ class GraphViewMixin:
         Returns:
             GraphLayoutGenerator
         """
-        fixed_positions = {}
+        current_positions = {}
         if self._persistent:
             for item in self.ui.graphicsView.items():
                 if isinstance(item, EntityItem):
-                    fixed_positions[item.db_map_entity_id] = {"x": item.pos().x(), "y": item.pos().y()}
+                    current_positions[item.db_map_entity_id] = {"x": item.pos().x(), "y": item.pos().y()}
+        fixed_positions = {}
         param_pos_x = dict(self._get_parameter_positions(self.ui.graphicsView.pos_x_parameter))
         param_pos_y = dict(self._get_parameter_positions(self.ui.graphicsView.pos_y_parameter))
         for db_map_entity_id in param_pos_x.keys() & param_pos_y.keys():
             fixed_positions[db_map_entity_id] = {"x": param_pos_x[db_map_entity_id], "y": param_pos_y[db_map_entity_id]}
         entity_ids = self.object_ids + self.relationship_ids
         heavy_positions = {ind: fixed_positions[id_] for ind, id_ in enumerate(entity_ids) if id_ in fixed_positions}
-        return GraphLayoutGenerator(
+        initial_positions = {
+            ind: current_positions[id_] for ind, id_ in enumerate(entity_ids) if id_ in current_positions
+        }
+        return make_layout_generator(
             self._layout_gen_id,
             len(entity_ids),
             self.src_inds,
             self.dst_inds,
             self._ARC_LENGTH_HINT,
             heavy_positions=heavy_positions,
+            initial_positions=initial_positions,
         )
 
     def _make_new_items(self, x, y):
@@ -400,10 +407,11 @@ class GraphViewMixin:
         for rel_ind, obj_ind in zip(self.src_inds, self.dst_inds):
             arc_item = ArcItem(self.relationship_items[rel_ind - offset], self.object_items[obj_ind], self._ARC_WIDTH)
             self.arc_items.append(arc_item)
+        self.arc_batch_item = ArcBatchItem(self.arc_items, self._ARC_WIDTH)
         return any(self.object_items)
 
     def _add_new_items(self):
-        for item in self.object_items + self.relationship_items + self.arc_items:
+        for item in self.object_items + self.relationship_items + self.arc_items + [self.arc_batch_item]:
             self.scene.addItem(item)
 
     def start_relationship(self, relationship_class, obj_item):
@@ -178,6 +178,7 @@ class ParameterViewMixin:
 
     def reset_filters(self):
         """Resets filters."""
+        self.prioritize_fetching(self.filter_class_ids)
         for model in self._parameter_models:
             model.set_filter_class_ids(self._get_filter_class_ids())
             model.set_filter_parameter_ids(self.filter_parameter_ids)
@@ -160,6 +160,7 @@ class SpineDBEditorBase(QMainWindow):
         if not db_maps:
             db_maps = self.db_maps
         self._fetcher = self.db_mngr.get_fetcher()
+        self._fetcher.tables_fetched.connect(self.unsetCursor)
         self._fetcher.finished.connect(self._make_iddle)
         self._make_busy()
         self._fetcher.fetch(self, db_maps)
@@ -174,6 +175,15 @@ class SpineDBEditorBase(QMainWindow):
         self.unsetCursor()
         self._fetcher = None
 
+    def prioritize_fetching(self, db_map_class_ids):
+        """Asks the fetcher to load parameter values of given entity classes next, if fetching is still going on.
+
+        Args:
+            db_map_class_ids (dict): mapping DiffDatabaseMapping to set of entity class ids
+        """
+        if self._fetcher is not None:
+            self._fetcher.prioritize(db_map_class_ids)
+
     @Slot(bool)
     def load_previous_urls(self, _=False):
         urls = self.url_toolbar.get_previous_urls()
@@ -411,8 +421,8 @@ class SpineDBEditorBase(QMainWindow):
         call_on_focused_widget(self, "paste")
 
     @Slot(dict)
-    def import_data(self, data):
-        self.db_mngr.import_data({db_map: data for db_map in self.db_maps})
+    def import_data(self, data, bulk=False):
+        self.db_mngr.import_data({db_map: data for db_map in self.db_maps}, bulk=bulk)
 
     @Slot(bool)
     def import_file(self, checked=False):
@@ -445,7 +455,7 @@ class SpineDBEditorBase(QMainWindow):
             except json.decoder.JSONDecodeError as err:
                 self.msg_error.emit(f"File {file_path} is not a valid json: {err}")
                 return
-        self.import_data(data)
+        self.import_data(data, bulk=True)
         filename = os.path.split(file_path)[1]
         self.msg.emit(f"File {filename} successfully imported.")
 
@@ -458,7 +468,7 @@ class SpineDBEditorBase(QMainWindow):
             self.msg.emit(f"Could'n import file {filename}: {str(err)}")
             return
         data = export_data(db_map)
-        self.import_data(data)
+        self.import_data(data, bulk=True)
         self.msg.emit(f"File {filename} successfully imported.")
 
     def import_from_excel(self, file_path):
@@ -471,7 +481,7 @@ class SpineDBEditorBase(QMainWindow):
         if errors:
             msg = f"The following errors where found parsing {filename}:" + format_string_list(errors)
             self.msg_error.emit(msg)
-        self.import_data(mapped_data)
+        self.import_data(mapped_data, bulk=True)
         self.msg.emit(f"File {filename} successfully imported.")
 
     @Slot(bool)
@@ -733,7 +733,7 @@ class TabularViewMixin:
         Returns:
             list(tuple(list(int)))
         """
-        return list(dict.fromkeys(zip(*[self.pivot_table_model.model.index_values.get(k, []) for k in frozen])).keys())
+        return self.pivot_table_model.model.frozen_values(frozen)
 
     # TODO: Move this to the models?
     @staticmethod
@@ -16,14 +16,235 @@ SpineDBFetcher class.
 :date:   13.3.2020
 """
 
+from collections import deque
+import functools
+import queue
+import threading
+import time
 from PySide2.QtCore import Signal, Slot, QObject
+from sqlalchemy.engine.url import make_url
+from spinedb_api.db_mapping_base import DatabaseMappingBase
+from .spine_db_snapshot import db_fingerprint, load_snapshot, make_snapshot, save_snapshot
+
+_DONE = object()
+
+
+def _put(chunks, chunk, is_stopped):
+    """Puts a chunk into a bounded queue, giving up if fetching is stopped.
+
+    Returns:
+        bool: True if the chunk was put, False if fetching was stopped
+    """
+    while not is_stopped():
+        try:
+            chunks.put(chunk, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+class _FetchPool:
+    """A pool of threads that run fetch queries. Each thread opens its own connection to each database.
+
+    The connections are made through DatabaseMappingBase which, unlike DatabaseMapping,
+    does not start a commit on first use, so the workers only read and never hold write locks on the database.
+    """
+
+    def __init__(self, worker_count, is_stopped):
+        """
+        Args:
+            worker_count (int): number of worker threads
+            is_stopped (Callable): returns True if fetching has been stopped
+        """
+        self._tasks = queue.Queue()
+        self._is_stopped = is_stopped
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(worker_count)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, url, getter, chunks):
+        """Schedules a query. Tasks start in submission order.
+
+        Args:
+            url (str): database URL
+            getter (Callable): a SpineDBManager getter, e.g. ``get_object_classes``
+            chunks (Queue): where to put the resulting chunks, followed by _DONE
+        """
+        self._tasks.put((url, getter, chunks))
+
+    def shutdown(self):
+        """Makes the workers quit once they are done with the submitted tasks."""
+        for _ in self._threads:
+            self._tasks.put(None)
+
+    def _work(self):
+        db_maps = {}
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    break
+                url, getter, chunks = task
+                if self._is_stopped():
+                    continue
+                try:
+                    db_map = db_maps.get(url)
+                    if db_map is None:
+                        db_map = db_maps[url] = DatabaseMappingBase(url)
+                    for chunk in getter(db_map):
+                        if not _put(chunks, chunk, self._is_stopped):
+                            break
+                except Exception as error:  # pylint: disable=broad-except
+                    _put(chunks, error, self._is_stopped)
+                _put(chunks, _DONE, self._is_stopped)
+        finally:
+            for db_map in db_maps.values():
+                db_map.connection.close()
+
+
+class ChunkPacer(QObject):
+    """Sizes fetched chunks so that listeners can handle each of them within a frame budget,
+    and holds the fetcher back when listeners have too many chunks waiting.
+
+    The pacer lives in the listeners' thread. The fetcher calls :meth:`wait_for_room` before emitting a chunk
+    and :meth:`chunk_emitted` right after. The signaller reports handling times through :meth:`record`.
+
+    The fetcher never waits for long: the listeners' thread may itself be blocked on a call into the fetcher's thread.
+    """
+
+    _chunk_posted = Signal()
+    FRAME_BUDGET = 0.02
+    """Target time in seconds for the listeners to handle one chunk."""
+    MAX_PENDING = 2
+    """Maximum number of emitted chunks the listeners may be behind."""
+    MAX_WAIT = 1.0
+    """Longest time in seconds to wait for the listeners before emitting anyway."""
+
+    def __init__(self, initial_chunk_size=1000, min_chunk_size=100, max_chunk_size=20000):
+        """
+        Args:
+            initial_chunk_size (int): chunk size to use before any handling times have been measured
+            min_chunk_size (int): smallest allowed chunk size
+            max_chunk_size (int): largest allowed chunk size
+        """
+        super().__init__()
+        self._initial_chunk_size = initial_chunk_size
+        self._min_chunk_size = min_chunk_size
+        self._max_chunk_size = max_chunk_size
+        self._seconds_per_row = None
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._chunk_posted.connect(self._handle_chunk_posted)
+
+    @property
+    def chunk_size(self):
+        """Number of rows the listeners can handle within the frame budget."""
+        with self._condition:
+            seconds_per_row = self._seconds_per_row
+        if not seconds_per_row:
+            return self._initial_chunk_size
+        size = round(self.FRAME_BUDGET / seconds_per_row)
+        return min(max(size, self._min_chunk_size), self._max_chunk_size)
+
+    def record(self, row_count, seconds):
+        """Updates the handling time estimate. Called in the listeners' thread after handling a chunk.
+
+        Args:
+            row_count (int): number of rows in the chunk
+            seconds (float): time it took to handle the chunk
+        """
+        if not row_count:
+            return
+        seconds_per_row = seconds / row_count
+        with self._condition:
+            if self._seconds_per_row is None:
+                self._seconds_per_row = seconds_per_row
+            else:
+                self._seconds_per_row = 0.7 * self._seconds_per_row + 0.3 * seconds_per_row
+
+    def wait_for_room(self, is_stopped, is_waited_on=lambda: False):
+        """Blocks until the listeners have caught up enough to receive another chunk,
+        but at most :attr:`MAX_WAIT` seconds and not at all while the listeners' thread is waiting on the fetcher's.
+
+        Args:
+            is_stopped (Callable): returns True if fetching has been stopped
+            is_waited_on (Callable): returns True if the listeners' thread is blocked calling into the fetcher's thread
+
+        Returns:
+            bool: True if the chunk may be emitted, False if fetching was stopped
+        """
+        deadline = time.monotonic() + self.MAX_WAIT
+        with self._condition:
+            while self._pending >= self.MAX_PENDING:
+                if is_stopped():
+                    return False
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 or is_waited_on():
+                    break
+                self._condition.wait(min(timeout, 0.1))
+            self._pending += 1
+        return True
+
+    def chunk_emitted(self):
+        """Posts a marker behind the emitted chunk; the chunk is handled once the marker reaches this object."""
+        self._chunk_posted.emit()
+
+    @Slot()
+    def _handle_chunk_posted(self):
+        with self._condition:
+            self._pending = max(0, self._pending - 1)
+            self._condition.notify_all()
+
+    def paced(self, chunks):
+        """Re-slices chunks to the current chunk size.
+
+        Args:
+            chunks (Iterable of list): chunks as they come from the database
+
+        Yields:
+            list: paced chunks
+        """
+        buffer = []
+        for chunk in chunks:
+            buffer.extend(chunk)
+            size = self.chunk_size
+            while len(buffer) >= size:
+                yield buffer[:size]
+                del buffer[:size]
+                size = self.chunk_size
+        if buffer:
+            yield buffer
 
 
 class SpineDBFetcher(QObject):
-    """Fetches content from a Spine database."""
+    """Fetches content from a Spine database.
+
+    Databases that can be opened from another connection are queried concurrently by a pool of worker threads,
+    one table per task. Chunks are still emitted from the fetcher's thread in table order,
+    so classes arrive before entities and entities before parameter values.
+
+    Parameter values are fetched last, one entity class at a time, with the pool running a few classes ahead.
+    Classes passed to :meth:`prioritize` are fetched first, the rest are filled in afterwards.
+
+    Chunk sizes follow how fast the listeners handle them, see :class:`ChunkPacer`.
+
+    If snapshots are enabled, databases that have not changed since their last full fetch
+    are loaded from an on-disk snapshot instead of being queried, see :mod:`spine_db_snapshot`.
+    """
 
     finished = Signal()
+    tables_fetched = Signal()
+    """Emitted when everything but parameter values has been fetched."""
     _started = Signal()
+    _WORKER_COUNT = 4
+    _QUEUE_SIZE = 8
+    """Maximum number of chunks a worker can get ahead of the listeners, per table and db_map."""
+    _VALUE_GETTER_NAMES = {
+        "object_class": ("get_object_classes", "get_object_parameter_values"),
+        "relationship_class": ("get_relationship_classes", "get_relationship_parameter_values"),
+    }
+    """Maps entity class item type to the SpineDBManager getters of the classes and of their parameter values."""
 
     def __init__(self, db_mngr, mini):
         """Initializes the fetcher object.
@@ -37,6 +258,8 @@ class SpineDBFetcher(QObject):
         super().__init__()
         self._db_mngr = db_mngr
         self._mini = mini
+        self._pacer = ChunkPacer()
+        self._mini.signaller.pacer = self._pacer
         self.moveToThread(db_mngr.thread)
         self._started.connect(self._do_work)
         self._db_maps = None
@@ -44,8 +267,11 @@ class SpineDBFetcher(QObject):
         self.prepared = False
         self.started = False
         self._stopped = False
+        self._priority_lock = threading.Lock()
+        self._priority_class_ids = deque()
 
     def clean_up(self):
+        self._pacer.deleteLater()
         self.deleteLater()
 
     def fetch(self, listener, db_maps, tablenames=None):
@@ -70,6 +296,33 @@ class SpineDBFetcher(QObject):
         self._stopped = True
         self.finished.emit()
 
+    def prioritize(self, db_map_class_ids):
+        """Makes the fetcher load parameter values of given entity classes before the others.
+        Classes prioritized later are fetched first. Can be called from any thread.
+
+        Args:
+            db_map_class_ids (dict): mapping DiffDatabaseMapping to Iterable of entity class ids
+        """
+        with self._priority_lock:
+            for db_map, class_ids in db_map_class_ids.items():
+                self._priority_class_ids.extendleft((db_map, class_id) for class_id in class_ids)
+
+    def _next_class(self, pending):
+        """Picks the next entity class to fetch parameter values for.
+
+        Args:
+            pending (dict): mapping tuple (DiffDatabaseMapping, entity class id) to getter, in fetch order
+
+        Returns:
+            tuple: (DiffDatabaseMapping, entity class id)
+        """
+        with self._priority_lock:
+            while self._priority_class_ids:
+                key = self._priority_class_ids.popleft()
+                if key in pending:
+                    return key
+        return next(iter(pending))
+
     @Slot()
     def _do_work(self):
         getter_signal_lookup = {
@@ -94,16 +347,201 @@ class SpineDBFetcher(QObject):
             "tool_feature": (self._db_mngr.get_tool_features, self._mini.tool_features_added),
             "tool_feature_method": (self._db_mngr.get_tool_feature_methods, self._mini.tool_feature_methods_added),
         }
-        if self._tablenames is None:
+        fetch_all = self._tablenames is None
+        if fetch_all:
             self._tablenames = getter_signal_lookup.keys()
-        for tablename in self._tablenames:
-            getter_signal = getter_signal_lookup.get(tablename)
-            if getter_signal is None:
-                continue
-            getter, signal = getter_signal
+        tablenames = [tablename for tablename in self._tablenames if tablename in getter_signal_lookup]
+        fetch_values = "parameter_value" in tablenames
+        if fetch_values:
+            tablenames.remove("parameter_value")
+        commit_ids = {}
+        if fetch_all:
+            commit_ids = {db_map: self._db_mngr.get_latest_commit_id(db_map) for db_map in self._db_maps}
+        snapshot_dir = self._db_mngr.snapshot_dir if fetch_all else None
+        fingerprints = {}
+        snapshots = {}
+        if snapshot_dir is not None:
             for db_map in self._db_maps:
-                for chunk in getter(db_map):
-                    if self._stopped:
+                fingerprint = fingerprints[db_map] = db_fingerprint(db_map)
+                snapshot = load_snapshot(snapshot_dir, db_map.db_url, fingerprint)
+                if snapshot is not None:
+                    snapshots[db_map] = snapshot
+        queried_db_maps = [db_map for db_map in self._db_maps if db_map not in snapshots]
+        parallel_db_maps = [db_map for db_map in queried_db_maps if self._can_fetch_in_parallel(db_map)]
+        task_count = len(tablenames) * len(parallel_db_maps)
+        worker_count = self._WORKER_COUNT if fetch_values else min(self._WORKER_COUNT, task_count)
+        pool = _FetchPool(worker_count, lambda: self._stopped) if parallel_db_maps and worker_count else None
+        db_map_table_chunks = {}
+        for tablename in tablenames:
+            getter, _ = getter_signal_lookup[tablename]
+            for db_map in parallel_db_maps:
+                chunks = db_map_table_chunks[db_map, tablename] = queue.Queue(self._QUEUE_SIZE)
+                pool.submit(db_map.db_url, getter, chunks)
+        fetched_classes = {}
+        snapshot_items = {}
+        if snapshot_dir is not None:
+            snapshot_items = {db_map: {} for db_map in queried_db_maps if fingerprints[db_map] is not None}
+        try:
+            for tablename in tablenames:
+                getter, signal = getter_signal_lookup[tablename]
+                for db_map in self._db_maps:
+                    collected = None
+                    if db_map in snapshots:
+                        chunks = [snapshots[db_map].get(tablename, [])]
+                    else:
+                        chunks = self._chunks(
+                            db_map, getter, db_map_table_chunks.get((db_map, tablename)), lambda: self._stopped
+                        )
+                        if db_map in snapshot_items:
+                            collected = snapshot_items[db_map][tablename] = []
+                        if fetch_values and tablename in self._VALUE_GETTER_NAMES:
+                            if collected is None:
+                                collected = []
+                            fetched_classes.setdefault(db_map, {})[tablename] = collected
+                    if not self._emit(signal, db_map, chunks, collected):
                         return
-                    signal.emit({db_map: chunk})
+            if fetch_values:
+                for db_map, snapshot in snapshots.items():
+                    if not self._emit(self._mini.parameter_values_added, db_map, [snapshot.get("parameter_value", [])]):
+                        return
+            self.tables_fetched.emit()
+            collected_values = {}
+            for db_map, items in snapshot_items.items():
+                collected_values[db_map] = items["parameter_value"] = []
+            if fetch_values and not self._fetch_parameter_values(
+                queried_db_maps, fetched_classes, pool, parallel_db_maps, collected_values
+            ):
+                return
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        for db_map, commit_id in commit_ids.items():
+            self._db_mngr.set_cached_commit_id(db_map, commit_id)
+        # NOTE: Snapshots are made from the emitted rows since the last chunks may not be cached yet
+        new_snapshots = {
+            db_map: make_snapshot(items)
+            for db_map, items in snapshot_items.items()
+            if fingerprints[db_map] == db_fingerprint(db_map)
+        }
         self.finished.emit()
+        for db_map, snapshot in new_snapshots.items():
+            save_snapshot(snapshot_dir, db_map.db_url, fingerprints[db_map], snapshot)
+
+    def _fetch_parameter_values(self, db_maps, fetched_classes, pool, parallel_db_maps, collected_values):
+        """Fetches parameter values class by class, prioritized classes first.
+
+        Queries of databases that can be read through other connections go to the pool,
+        a few classes ahead of the one being emitted.
+
+        Args:
+            db_maps (list of DiffDatabaseMapping): database maps to fetch values from
+            fetched_classes (dict): mapping DiffDatabaseMapping to a dict mapping class item type
+                to the list of class rows fetched for it; class types that were not fetched are queried here
+            pool (_FetchPool, optional): worker pool
+            parallel_db_maps (list of DiffDatabaseMapping): database maps the pool can read
+            collected_values (dict): mapping DiffDatabaseMapping to a list where emitted values are appended
+
+        Returns:
+            bool: True if all values were fetched, False if fetching was stopped
+        """
+        pending_classes = {}
+        for db_map in db_maps:
+            for class_type, (class_getter_name, value_getter_name) in self._VALUE_GETTER_NAMES.items():
+                classes = fetched_classes.get(db_map, {}).get(class_type)
+                if classes is None:
+                    classes = [x for chunk in getattr(self._db_mngr, class_getter_name)(db_map) for x in chunk]
+                value_getter = getattr(self._db_mngr, value_getter_name)
+                pending_classes.update(((db_map, x["id"]), value_getter) for x in classes)
+        ahead = self._WORKER_COUNT if pool is not None else 1
+        in_flight = {}
+        while pending_classes or in_flight:
+            while pending_classes and len(in_flight) < ahead:
+                db_map, class_id = key = self._next_class(pending_classes)
+                getter = functools.partial(pending_classes.pop(key), entity_class_ids=(class_id,))
+                chunks = None
+                if pool is not None and db_map in parallel_db_maps:
+                    chunks = queue.Queue(self._QUEUE_SIZE)
+                    pool.submit(db_map.db_url, getter, chunks)
+                in_flight[key] = getter, chunks
+            key = next(iter(in_flight))
+            getter, chunks = in_flight.pop(key)
+            db_map = key[0]
+            chunks = self._chunks(db_map, getter, chunks, lambda: self._stopped)
+            if not self._emit(self._mini.parameter_values_added, db_map, chunks, collected_values.get(db_map)):
+                return False
+        return True
+
+    def _emit(self, signal, db_map, chunks, collected=None):
+        """Emits paced chunks, waiting for the listeners whenever they fall behind.
+
+        Args:
+            signal (Signal): signal to emit
+            db_map (DiffDatabaseMapping): database map
+            chunks (Iterable of list): chunks from the database
+            collected (list, optional): if given, emitted items are appended here
+
+        Returns:
+            bool: True if all chunks were emitted, False if fetching was stopped
+        """
+        is_stopped = lambda: self._stopped
+        is_waited_on = lambda: self._db_mngr.worker_waited_on
+        for chunk in self._pacer.paced(chunks):
+            if self._stopped or not self._pacer.wait_for_room(is_stopped, is_waited_on):
+                return False
+            if collected is not None:
+                collected.extend(chunk)
+            signal.emit({db_map: chunk})
+            self._pacer.chunk_emitted()
+        return not self._stopped
+
+    @staticmethod
+    def _can_fetch_in_parallel(db_map):
+        """Checks if the given db_map's data can be read through other connections.
+        In-memory databases and uncommitted changes are only visible to db_map's own connection.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            bool
+        """
+        url = make_url(db_map.db_url)
+        if url.drivername.startswith("sqlite") and url.database in (None, "", ":memory:"):
+            return False
+        return not db_map.has_pending_changes()
+
+    @staticmethod
+    def _chunks(db_map, getter, chunks, is_stopped=lambda: False):
+        """Yields chunks for a table, either from a worker or by running the query in this thread.
+
+        If the worker fails, the rest of the table is read through db_map,
+        leaving out the rows the worker had already delivered.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            getter (Callable): a SpineDBManager getter
+            chunks (Queue, NoneType): worker's chunk queue or None if the table is fetched in this thread
+            is_stopped (Callable): returns True if fetching has been stopped
+        """
+        if chunks is None:
+            yield from getter(db_map)
+            return
+        delivered_ids = set()
+        while True:
+            try:
+                chunk = chunks.get(timeout=0.1)
+            except queue.Empty:
+                if is_stopped():
+                    return
+                continue
+            if chunk is _DONE:
+                return
+            if isinstance(chunk, Exception):
+                # The worker could not read the table, so read the rest through db_map instead
+                for chunk in getter(db_map):
+                    rest = [item for item in chunk if item["id"] not in delivered_ids]
+                    if rest:
+                        yield rest
+                return
+            delivered_ids.update(item["id"] for item in chunk)
+            yield chunk
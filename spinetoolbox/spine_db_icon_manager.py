@@ -16,9 +16,10 @@ Provides SpineDBIconManager.
 :date:   3.2.2021
 """
 
-from PySide2.QtCore import Qt, QPointF, QRectF, QBuffer
+from collections import OrderedDict
+from PySide2.QtCore import Qt, QPointF, QRectF, QBuffer, QSize
 from PySide2.QtWidgets import QGraphicsScene
-from PySide2.QtGui import QIcon, QFont, QTextOption, QPainter
+from PySide2.QtGui import QIcon, QFont, QTextOption, QPainter, QPixmap
 from PySide2.QtSvg import QSvgGenerator, QSvgRenderer
 from .helpers import TransparentIconEngine, interpret_icon_id
 
@@ -69,14 +70,30 @@ class _SceneSvgRenderer(QSvgRenderer):
 
 
 class SpineDBIconManager:
-    """A class to manage object_class icons for spine db editors."""
+    """A class to manage object_class icons for spine db editors.
 
-    def __init__(self):
+    Attributes:
+        pixmap_cache_max_size (int): maximum total size of pre-rendered pixmaps in bytes
+        pixmap_cache_size (int): current total size of pre-rendered pixmaps in bytes
+    """
+
+    DEFAULT_PIXMAP_CACHE_MAX_SIZE = 64 * 2 ** 20
+
+    def __init__(self, pixmap_cache_max_size=DEFAULT_PIXMAP_CACHE_MAX_SIZE):
+        """
+        Args:
+            pixmap_cache_max_size (int): maximum total size of pre-rendered pixmaps in bytes;
+                the least recently used pixmaps are dropped beyond it
+        """
         self.display_icons = {}  # A mapping from object_class name to display icon code
         self.rel_cls_renderers = {}  # A mapping from object_class name list to associated renderer
         self.obj_group_renderers = {}  # A mapping from class name to associated group renderer
         self.obj_cls_renderers = {}  # A mapping from class name to associated renderer
         self.icon_renderers = {}
+        self._pixmaps = OrderedDict()  # A mapping from (renderer, width, height, dpr) to pre-rendered pixmap
+        self.pixmap_cache_max_size = pixmap_cache_max_size
+        self.pixmap_cache_size = 0
+        self._icons = {}  # A mapping from renderer to icon
 
     def update_icon_caches(self, object_classes):
         """Called after adding or updating object classes.
@@ -86,11 +103,57 @@ class SpineDBIconManager:
             self.display_icons[object_class["name"]] = object_class["display_icon"]
         object_class_names = [x["name"] for x in object_classes]
         dirty_keys = [k for k in self.rel_cls_renderers if any(x in object_class_names for x in k)]
+        obsolete_renderers = set()
         for k in dirty_keys:
-            del self.rel_cls_renderers[k]
+            obsolete_renderers.add(self.rel_cls_renderers.pop(k))
         for name in object_class_names:
-            self.obj_group_renderers.pop(name, None)
-            self.obj_cls_renderers.pop(name, None)
+            obsolete_renderers.add(self.obj_group_renderers.pop(name, None))
+            obsolete_renderers.add(self.obj_cls_renderers.pop(name, None))
+        obsolete_renderers.discard(None)
+        self._drop_pixmaps(obsolete_renderers)
+
+    def _drop_pixmaps(self, renderers):
+        """Removes pre-rendered pixmaps and icons of given renderers.
+
+        Args:
+            renderers (set of QSvgRenderer): obsolete renderers
+        """
+        if not renderers:
+            return
+        for key in [key for key in self._pixmaps if key[0] in renderers]:
+            self.pixmap_cache_size -= _pixmap_size(self._pixmaps.pop(key))
+        for renderer in renderers:
+            self._icons.pop(renderer, None)
+
+    def renderer_pixmap(self, renderer, size, device_pixel_ratio=1.0):
+        """Returns given renderer rasterized to a pixmap.
+
+        The renderer is rendered only the first time a pixmap of given size and device pixel ratio is requested;
+        subsequent requests return the same pixmap until it is dropped to keep the cache within its size limit.
+
+        Args:
+            renderer (QSvgRenderer): renderer
+            size (QSize): pixmap size in device independent pixels
+            device_pixel_ratio (float): device pixel ratio of the paint device
+
+        Returns:
+            QPixmap: pre-rendered pixmap with the renderer's contents centered and scaled to fit
+        """
+        key = (renderer, size.width(), size.height(), device_pixel_ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+        pixmap = _render_pixmap(renderer, size, device_pixel_ratio)
+        pixmap_size = _pixmap_size(pixmap)
+        if pixmap_size > self.pixmap_cache_max_size:
+            return pixmap
+        self._pixmaps[key] = pixmap
+        self.pixmap_cache_size += pixmap_size
+        while self.pixmap_cache_size > self.pixmap_cache_max_size:
+            _, old_pixmap = self._pixmaps.popitem(last=False)
+            self.pixmap_cache_size -= _pixmap_size(old_pixmap)
+        return pixmap
 
     def _create_icon_renderer(self, icon_code, color_code):
         scene = QGraphicsScene()
@@ -166,19 +229,75 @@ class SpineDBIconManager:
             self._create_obj_group_renderer(object_class_name)
         return self.obj_group_renderers[object_class_name]
 
-    @staticmethod
-    def icon_from_renderer(renderer):
-        return QIcon(SceneIconEngine(renderer.scene))
+    def icon_from_renderer(self, renderer):
+        """Returns an icon that draws from the pre-rendered pixmaps of given renderer.
+
+        Args:
+            renderer (QSvgRenderer): renderer
 
+        Returns:
+            QIcon
+        """
+        icon = self._icons.get(renderer)
+        if icon is None:
+            icon = self._icons[renderer] = QIcon(RendererIconEngine(self, renderer))
+        return icon
 
-class SceneIconEngine(TransparentIconEngine):
-    """Specialization of QIconEngine used to draw scene-based icons."""
 
-    def __init__(self, scene):
+def _pixmap_size(pixmap):
+    """Returns the approximate memory footprint of given pixmap in bytes.
+
+    Args:
+        pixmap (QPixmap): pixmap
+
+    Returns:
+        int
+    """
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+def _render_pixmap(renderer, size, device_pixel_ratio):
+    """Renders given renderer to a new transparent pixmap, keeping the renderer's aspect ratio.
+
+    Args:
+        renderer (QSvgRenderer): renderer
+        size (QSize): pixmap size in device independent pixels
+        device_pixel_ratio (float): device pixel ratio
+
+    Returns:
+        QPixmap
+    """
+    pixmap = QPixmap(size * device_pixel_ratio)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    pixmap.fill(Qt.transparent)
+    default_size = renderer.defaultSize()
+    if default_size.isEmpty() or size.isEmpty():
+        return pixmap
+    target = QRectF(QPointF(0, 0), QSize(default_size).scaled(size, Qt.KeepAspectRatio))
+    target.moveCenter(QPointF(0.5 * size.width(), 0.5 * size.height()))
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    renderer.render(painter, target)
+    painter.end()
+    return pixmap
+
+
+class RendererIconEngine(TransparentIconEngine):
+    """Specialization of QIconEngine that draws pre-rendered pixmaps from SpineDBIconManager."""
+
+    def __init__(self, icon_mngr, renderer):
+        """
+        Args:
+            icon_mngr (SpineDBIconManager): icon manager that owns the pixmaps
+            renderer (QSvgRenderer): icon's renderer
+        """
         super().__init__()
-        self.scene = scene
+        self._icon_mngr = icon_mngr
+        self._renderer = renderer
 
     def paint(self, painter, rect, mode=None, state=None):
-        painter.save()
-        self.scene.render(painter, rect, self.scene.sceneRect())
-        painter.restore()
+        pixmap = self._icon_mngr.renderer_pixmap(self._renderer, rect.size(), painter.device().devicePixelRatioF())
+        painter.drawPixmap(rect.topLeft(), pixmap)
+
+    def pixmap(self, size=QSize(512, 512), mode=None, state=None):
+        return QPixmap(self._icon_mngr.renderer_pixmap(self._renderer, size))
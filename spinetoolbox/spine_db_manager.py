@@ -17,7 +17,8 @@ The SpineDBManager class
 """
 
 import itertools
-from PySide2.QtCore import Qt, QObject, Signal, Slot, QThread
+import os
+from PySide2.QtCore import Qt, QObject, Signal, Slot, QThread, QStandardPaths
 from PySide2.QtWidgets import QMessageBox, QDialog, QCheckBox, QWidget
 from PySide2.QtGui import QFontMetrics, QFont
 from spinedb_api import (
@@ -38,9 +39,11 @@ from spinedb_api import (
     TimePattern,
     Map,
 )
+from .spine_db_cache import SpineDBCache, CacheItem
 from .spine_db_icon_manager import SpineDBIconManager
 from .helpers import busy_effect, SignalWaiter
 from .spine_db_signaller import SpineDBSignaller
+from .spine_db_snapshot import latest_commit
 from .spine_db_fetcher import SpineDBFetcher
 from .spine_db_worker import SpineDBWorker
 from .spine_db_commands import (
@@ -55,6 +58,9 @@ from .widgets.commit_dialog import CommitDialog
 from .mvcmodels.shared import PARSED_ROLE
 from .spine_db_editor.widgets.multi_spine_db_editor import MultiSpineDBEditor
 
+_DB_TO_CACHE_PARAMETER_VALUE_KEYS = {"parameter_definition_id": "parameter_id"}
+"""Maps parameter value keys that are named differently in the database and in the cache."""
+
 
 @busy_effect
 def do_create_new_spine_database(url):
@@ -193,8 +199,7 @@ class SpineDBManagerBase(QObject):
             db_map_data (dict): lists of dictionary items keyed by DiffDatabaseMapping
         """
         for db_map, items in db_map_data.items():
-            for item in items:
-                self._cache.setdefault(db_map, {}).setdefault(item_type, {})[item["id"]] = item
+            self._cache.add_items(db_map, item_type, items)
 
     def get_icon_mngr(self, db_map):
         """Returns an icon manager for given db_map.
@@ -233,12 +238,13 @@ class SpineDBManager(SpineDBManagerBase):
             settings (QSettings): Toolbox settings
             parent (QObject, optional): parent object
         """
-        super().__init__(parent, cache={}, icon_mngr={})
+        super().__init__(parent, cache=SpineDBCache(), icon_mngr={})
         self.qsettings = settings
         self._db_maps = {}
         self._thread = QThread()
         self._worker = SpineDBWorker(self)
         self._fetchers = []
+        self._parameter_value_columns = {}
         self.undo_stack = {}
         self.undo_action = {}
         self.redo_action = {}
@@ -253,6 +259,26 @@ class SpineDBManager(SpineDBManagerBase):
     def db_maps(self):
         return set(self._db_maps.values())
 
+    @property
+    def worker_waited_on(self):
+        """True while the calling thread is blocked waiting for the worker in the database thread.
+
+        Returns:
+            bool
+        """
+        return self._worker.waited_on
+
+    @property
+    def snapshot_dir(self):
+        """Directory for on-disk cache snapshots, or None if snapshots are disabled in settings.
+
+        Returns:
+            str or NoneType
+        """
+        if self.qsettings.value("appSettings/useDbSnapshots", defaultValue="false") != "true":
+            return None
+        return os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "db_snapshots")
+
     def db_map(self, url):
         """
         Returns a database mapping for given URL.
@@ -310,6 +336,7 @@ class SpineDBManager(SpineDBManagerBase):
         del self.undo_stack[db_map]
         del self.undo_action[db_map]
         del self.redo_action[db_map]
+        self._parameter_value_columns.pop(db_map, None)
 
     def close_all_sessions(self):
         """Closes connections to all database mappings."""
@@ -525,13 +552,57 @@ class SpineDBManager(SpineDBManagerBase):
         self.deleteLater()
 
     def refresh_session(self, *db_maps):
+        """Brings the cache up to date with the databases.
+
+        Databases that were fetched in full are refreshed incrementally from the commits made since,
+        the rest have their cache dropped so listeners fetch them again.
+
+        Args:
+            *db_maps: database maps to refresh
+        """
+        incremental_db_maps = [db_map for db_map in db_maps if self._cache.commit_id(db_map) is not None]
+        if incremental_db_maps:
+            self._worker.refresh_session(incremental_db_maps)
         refreshed_db_maps = set()
         for db_map in db_maps:
-            if self._cache.pop(db_map, None) is not None:
+            if db_map not in incremental_db_maps and self._cache.pop_db_map(db_map):
                 refreshed_db_maps.add(db_map)
         if refreshed_db_maps:
             self.session_refreshed.emit(refreshed_db_maps)
 
+    def cached_commit_id(self, db_map):
+        """Returns the id of the latest commit whose changes are known to be cached.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            int or NoneType
+        """
+        return self._cache.commit_id(db_map)
+
+    def set_cached_commit_id(self, db_map, commit_id):
+        """Records that all changes up to given commit are cached.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            commit_id (int, optional)
+        """
+        self._cache.set_commit_id(db_map, commit_id)
+
+    @staticmethod
+    def get_latest_commit_id(db_map):
+        """Returns the id of the latest commit in the database.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            int or NoneType: commit id, or None if there are no commits or they cannot be read
+        """
+        commit = latest_commit(db_map)
+        return commit.id if commit is not None else None
+
     def commit_session(self, *db_maps, cookie=None):
         """
         Commits the current session.
@@ -622,7 +693,18 @@ class SpineDBManager(SpineDBManagerBase):
             QIcon: requested icon or None if no entity class was found
         """
         renderer = self.entity_class_renderer(db_map, entity_type, entity_class_id, for_group=for_group)
-        return SpineDBIconManager.icon_from_renderer(renderer) if renderer is not None else None
+        if renderer is None:
+            return None
+        return self.get_icon_mngr(db_map).icon_from_renderer(renderer)
+
+    @property
+    def parsed_value_cache(self):
+        """The cache holding parsed parameter values. Exposes the size bound and hit/miss counters.
+
+        Returns:
+            ParsedValueCache
+        """
+        return self._cache.parsed_values
 
     def get_item(self, db_map, item_type, id_):
         """Returns the item of the given type in the given db map that has the given id,
@@ -636,7 +718,7 @@ class SpineDBManager(SpineDBManagerBase):
         Returns:
             dict
         """
-        return self._cache.get(db_map, {}).get(item_type, {}).get(id_, {})
+        return self._cache.get_item(db_map, item_type, id_)
 
     def get_item_by_field(self, db_map, item_type, field, value):
         """Returns the first item of the given type in the given db map
@@ -667,7 +749,7 @@ class SpineDBManager(SpineDBManagerBase):
         Returns:
             list
         """
-        return [x for x in self.get_items(db_map, item_type) if x.get(field) == value]
+        return self._cache.find_items_by_field(db_map, item_type, field, value)
 
     def get_items(self, db_map, item_type):
         """Returns all the items of the given type in the given db map,
@@ -680,7 +762,7 @@ class SpineDBManager(SpineDBManagerBase):
         Returns:
             list
         """
-        return list(self._cache.get(db_map, {}).get(item_type, {}).values())
+        return list(self._cache.table(db_map, item_type).values())
 
     def get_field(self, db_map, item_type, id_, field):
         return self.get_item(db_map, item_type, id_).get(field)
@@ -744,10 +826,8 @@ class SpineDBManager(SpineDBManagerBase):
         field = {"parameter_value": "value", "parameter_definition": "default_value"}[item_type]
         if role == Qt.EditRole:
             return item[field]
-        key = "parsed_value"
-        if key not in item:
-            item[key] = self.parse_value(item[field])
-        return self.format_value(item[key], role)
+        parsed_value = self._cache.parsed_values.get((db_map, item_type, id_), lambda: self.parse_value(item[field]))
+        return self.format_value(parsed_value, role)
 
     @staticmethod
     def parse_value(db_value):
@@ -863,9 +943,9 @@ class SpineDBManager(SpineDBManagerBase):
         """Runs the given query and yields results by chunks of given size.
 
         Yields:
-            generator(list)
+            generator(list): lists of CacheItem
         """
-        it = (x._asdict() for x in query.yield_per(chunk_size).enable_eagerloads(False))
+        it = (CacheItem.from_row(x) for x in query.yield_per(chunk_size).enable_eagerloads(False))
         while True:
             chunk = list(itertools.islice(it, chunk_size))
             if not chunk:
@@ -873,13 +953,14 @@ class SpineDBManager(SpineDBManagerBase):
             yield chunk
 
     @staticmethod
-    def _make_query(db_map, sq_name, ids=(), key=("id",)):
+    def _make_query(db_map, sq_name, ids=(), key=("id",), entity_class_ids=()):
         """Makes a database query
 
         Args:
             db_map (DatabaseMappingBase): database map
             sq_name (str): name of the subquery
             ids (Iterable of int): ids by which the query should be filtered
+            entity_class_ids (Iterable of int): entity class ids by which the query should be filtered
 
         Returns:
             Alias: database subquery
@@ -888,6 +969,13 @@ class SpineDBManager(SpineDBManagerBase):
         query = db_map.query(sq).order_by(*[getattr(sq.c, k) for k in key])
         if ids:
             query = query.filter(db_map.in_(sq.c.id, ids))
+        if entity_class_ids:
+            entity_class_ids = set(entity_class_ids)
+            if len(entity_class_ids) == 1:
+                # A plain comparison keeps the per class fetch queries from creating a temporary table each time.
+                query = query.filter(sq.c.entity_class_id == next(iter(entity_class_ids)))
+            else:
+                query = query.filter(db_map.in_(sq.c.entity_class_id, entity_class_ids))
         return query
 
     def get_alternatives(self, db_map, ids=()):
@@ -1037,26 +1125,34 @@ class SpineDBManager(SpineDBManagerBase):
         """
         yield from self.get_db_items(self._make_query(db_map, "parameter_definition_tag_sq", ids=ids))
 
-    def get_object_parameter_values(self, db_map, ids=()):
+    def get_object_parameter_values(self, db_map, ids=(), entity_class_ids=()):
         """Returns object parameter values from database.
 
         Args:
             db_map (DiffDatabaseMapping)
+            ids (Iterable of int): ids by which the values should be filtered
+            entity_class_ids (Iterable of int): object class ids by which the values should be filtered
 
         Yields:
             list: dictionary items
         """
         yield from self.get_db_items(
             self._make_query(
-                db_map, "object_parameter_value_sq", ids=ids, key=["object_class_name", "object_name", "parameter_name"]
+                db_map,
+                "object_parameter_value_sq",
+                ids=ids,
+                key=["object_class_name", "object_name", "parameter_name"],
+                entity_class_ids=entity_class_ids,
             )
         )
 
-    def get_relationship_parameter_values(self, db_map, ids=()):
+    def get_relationship_parameter_values(self, db_map, ids=(), entity_class_ids=()):
         """Returns relationship parameter values from database.
 
         Args:
             db_map (DiffDatabaseMapping)
+            ids (Iterable of int): ids by which the values should be filtered
+            entity_class_ids (Iterable of int): relationship class ids by which the values should be filtered
 
         Yields:
             list: dictionary items
@@ -1067,20 +1163,120 @@ class SpineDBManager(SpineDBManagerBase):
                 "relationship_parameter_value_sq",
                 ids=ids,
                 key=["relationship_class_name", "object_name_list", "parameter_name"],
+                entity_class_ids=entity_class_ids,
             )
         )
 
-    def get_parameter_values(self, db_map, ids=()):
+    def get_parameter_values(self, db_map, ids=(), entity_class_ids=()):
         """Returns both object and relationship parameter values.
 
         Args:
             db_map (DiffDatabaseMapping)
+            ids (Iterable of int): ids by which the values should be filtered
+            entity_class_ids (Iterable of int): entity class ids by which the values should be filtered
 
         Yields:
             list: dictionary items
         """
-        yield from self.get_object_parameter_values(db_map, ids=ids)
-        yield from self.get_relationship_parameter_values(db_map, ids=ids)
+        yield from self.get_object_parameter_values(db_map, ids=ids, entity_class_ids=entity_class_ids)
+        yield from self.get_relationship_parameter_values(db_map, ids=ids, entity_class_ids=entity_class_ids)
+
+    def make_written_parameter_values(self, db_map, items):
+        """Builds the cache items of parameter values that have just been added or updated in the database
+        from the written items and the cached classes, entities, definitions and alternatives,
+        so that they need not be queried back.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            items (list of dict): written database items; must include the id
+
+        Returns:
+            list of CacheItem: cache items, or None if some referenced item is not cached
+        """
+        class_types = {}
+        merged_items = []
+        for item in items:
+            merged = self.get_item(db_map, "parameter_value", item["id"]).copy()
+            for key, value in item.items():
+                merged[_DB_TO_CACHE_PARAMETER_VALUE_KEYS.get(key, key)] = value
+            class_id = merged.get("entity_class_id")
+            class_type = class_types.get(class_id)
+            if class_type is None:
+                for class_type in ("object_class", "relationship_class"):
+                    if self.get_item(db_map, class_type, class_id):
+                        break
+                else:
+                    return None
+                class_types[class_id] = class_type
+            merged_items.append((class_type, merged))
+        cache_items = []
+        for class_type, merged in merged_items:
+            keys = self._parameter_value_column_names(db_map, class_type)
+            values = self._written_parameter_value_columns(db_map, class_type, merged, keys)
+            if values is None:
+                return None
+            cache_items.append(CacheItem(keys, values))
+        return cache_items
+
+    def _parameter_value_column_names(self, db_map, class_type):
+        """Returns the columns of the parameter value rows that the getters yield for given entity class type.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            class_type (str): 'object_class' or 'relationship_class'
+
+        Returns:
+            tuple of str: column names
+        """
+        columns = self._parameter_value_columns.setdefault(db_map, {})
+        keys = columns.get(class_type)
+        if keys is None:
+            sq = getattr(db_map, class_type[: -len("_class")] + "_parameter_value_sq")
+            keys = columns[class_type] = tuple(sq.c.keys())
+        return keys
+
+    def _written_parameter_value_columns(self, db_map, class_type, item, keys):
+        """Resolves the column values of a written parameter value.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            class_type (str): 'object_class' or 'relationship_class'
+            item (dict): written item with cache keys
+            keys (tuple of str): column names
+
+        Returns:
+            tuple: column values, or None if some referenced item is not cached
+        """
+        entity_type = class_type[: -len("_class")]
+        entity_class = self.get_item(db_map, class_type, item["entity_class_id"])
+        entity = self.get_item(db_map, entity_type, item["entity_id"])
+        definition = self.get_item(db_map, "parameter_definition", item["parameter_id"])
+        alternative = self.get_item(db_map, "alternative", item["alternative_id"])
+        if not entity_class or not entity or not definition or not alternative:
+            return None
+        derived = {
+            f"{class_type}_id": entity_class["id"],
+            f"{class_type}_name": entity_class["name"],
+            f"{entity_type}_id": entity["id"],
+            "parameter_name": definition["parameter_name"],
+            "alternative_name": alternative["name"],
+        }
+        if entity_type == "object":
+            derived["object_name"] = entity["name"]
+        else:
+            derived["object_class_id_list"] = entity_class["object_class_id_list"]
+            derived["object_class_name_list"] = entity_class["object_class_name_list"]
+            derived["object_id_list"] = entity["object_id_list"]
+            derived["object_name_list"] = entity["object_name_list"]
+        values = []
+        for key in keys:
+            if key in derived:
+                values.append(derived[key])
+            elif key in item:
+                values.append(item[key])
+            else:
+                return None
+        return tuple(values)
 
     def get_parameter_value_lists(self, db_map, ids=()):
         """Returns parameter_value lists from database.
@@ -1150,7 +1346,7 @@ class SpineDBManager(SpineDBManagerBase):
         """
         yield from self.get_db_items(self._make_query(db_map, "tool_feature_method_sq", ids=ids))
 
-    def import_data(self, db_map_data, command_text="Import data"):
+    def import_data(self, db_map_data, command_text="Import data", bulk=False):
         """Imports the given data into given db maps using the dedicated import functions from spinedb_api.
         Condenses all in a single command for undo/redo.
 
@@ -1158,8 +1354,10 @@ class SpineDBManager(SpineDBManagerBase):
             db_map_data (dict(DiffDatabaseMapping, dict())): Maps dbs to data to be passed as keyword arguments
                 to `get_data_for_import`
             command_text (str, optional): What to call the command that condenses the operation.
+            bulk (bool): if True, imports the data in batches and keeps only a compact undo record;
+                meant for importing whole files
         """
-        self._worker.import_data(db_map_data, command_text)
+        self._worker.import_data(db_map_data, command_text, bulk)
 
     def add_or_update_items(self, db_map_data, method_name, get_method_name, signal_name):
         self._worker.add_or_update_items(db_map_data, method_name, get_method_name, signal_name)
@@ -1505,7 +1703,7 @@ class SpineDBManager(SpineDBManagerBase):
         self._worker.remove_items(db_map_typed_ids)
 
     def _pop_item(self, db_map, item_type, id_):
-        return self._cache.get(db_map, {}).get(item_type, {}).pop(id_, {})
+        return self._cache.pop_item(db_map, item_type, id_)
 
     def uncache_items(self, db_map_typed_ids):
         """Removes data from cache.
@@ -1558,160 +1756,83 @@ class SpineDBManager(SpineDBManagerBase):
                 d.setdefault((db_map, item["class_id"]), set()).add(item["id"])
         return d
 
+    def _find_items(self, db_map_ids, item_type, field):
+        """Finds cached items of given type whose given field references any of the given ids.
+
+        Args:
+            db_map_ids (dict): sets of ids keyed by DiffDatabaseMapping
+            item_type (str)
+            field (str)
+
+        Returns:
+            dict: lists of dictionary items keyed by DiffDatabaseMapping
+        """
+        return {db_map: self._cache.find_items(db_map, item_type, field, ids) for db_map, ids in db_map_ids.items()}
+
     def find_cascading_relationship_classes(self, db_map_ids):
         """Finds and returns cascading relationship classes for the given object_class ids."""
-        db_map_cascading_data = dict()
-        for db_map, object_class_ids in db_map_ids.items():
-            object_class_ids = {str(id_) for id_ in object_class_ids}
-            db_map_cascading_data[db_map] = [
-                item
-                for item in self.get_items(db_map, "relationship_class")
-                if object_class_ids.intersection(item["object_class_id_list"].split(","))
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "relationship_class", "object_class_id_list")
 
     def find_cascading_entities(self, db_map_ids, item_type):
         """Finds and returns cascading entities for the given entity_class ids."""
-        db_map_cascading_data = dict()
-        for db_map, class_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, item_type) if item["class_id"] in class_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, item_type, "class_id")
 
     def find_cascading_relationships(self, db_map_ids):
         """Finds and returns cascading relationships for the given object ids."""
-        db_map_cascading_data = dict()
-        for db_map, object_ids in db_map_ids.items():
-            object_ids = {str(id_) for id_ in object_ids}
-            db_map_cascading_data[db_map] = [
-                item
-                for item in self.get_items(db_map, "relationship")
-                if object_ids.intersection(item["object_id_list"].split(","))
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "relationship", "object_id_list")
 
     def find_cascading_parameter_data(self, db_map_ids, item_type):
         """Finds and returns cascading parameter definitions or values for the given entity_class ids."""
-        db_map_cascading_data = dict()
-        for db_map, entity_class_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, item_type) if item["entity_class_id"] in entity_class_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, item_type, "entity_class_id")
 
     def find_cascading_parameter_definitions_by_value_list(self, db_map_ids):
         """Finds and returns cascading parameter definitions for the given parameter_value_list ids."""
-        db_map_cascading_data = dict()
-        for db_map, value_list_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item
-                for item in self.get_items(db_map, "parameter_definition")
-                if item["value_list_id"] in value_list_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "parameter_definition", "value_list_id")
 
     def find_cascading_parameter_definitions_by_tag(self, db_map_ids):
         """Finds and returns cascading parameter definitions for the given parameter_tag ids."""
-        db_map_cascading_data = dict()
-        for db_map, tag_ids in db_map_ids.items():
-            tag_ids = {str(id_) for id_ in tag_ids}
-            db_map_cascading_data[db_map] = [
-                item
-                for item in self.get_items(db_map, "parameter_definition")
-                if tag_ids.intersection((item["parameter_tag_id_list"] or "0").split(","))
-            ]  # NOTE: 0 is 'untagged'
-        return db_map_cascading_data
+        # NOTE: 0 is 'untagged'
+        return self._find_items(db_map_ids, "parameter_definition", "parameter_tag_id_list")
 
     def find_cascading_parameter_values_by_entity(self, db_map_ids):
         """Finds and returns cascading parameter values for the given entity ids."""
-        db_map_cascading_data = dict()
-        for db_map, entity_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "parameter_value") if item["entity_id"] in entity_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "parameter_value", "entity_id")
 
     def find_cascading_parameter_values_by_definition(self, db_map_ids):
         """Finds and returns cascading parameter values for the given parameter_definition ids."""
-        db_map_cascading_data = dict()
-        for db_map, definition_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "parameter_value") if item["parameter_id"] in definition_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "parameter_value", "parameter_id")
 
     def find_groups_by_entity(self, db_map_ids):
         """Finds and returns groups for the given entity ids."""
-        db_map_group_data = dict()
-        for db_map, entity_ids in db_map_ids.items():
-            db_map_group_data[db_map] = [
-                item for item in self.get_items(db_map, "entity_group") if item["entity_id"] in entity_ids
-            ]
-        return db_map_group_data
+        return self._find_items(db_map_ids, "entity_group", "entity_id")
 
     def find_groups_by_member(self, db_map_ids):
         """Finds and returns groups for the given entity ids."""
-        db_map_group_data = dict()
-        for db_map, member_ids in db_map_ids.items():
-            db_map_group_data[db_map] = [
-                item for item in self.get_items(db_map, "entity_group") if item["member_id"] in member_ids
-            ]
-        return db_map_group_data
+        return self._find_items(db_map_ids, "entity_group", "member_id")
 
     def find_cascading_parameter_values_by_alternative(self, db_map_ids):
         """Finds and returns cascading parameter values for the given alternative ids."""
-        db_map_cascading_data = dict()
-        for db_map, alt_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "parameter_value") if item["alternative_id"] in alt_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "parameter_value", "alternative_id")
 
     def find_cascading_scenario_alternatives_by_alternative(self, db_map_ids):
         """Finds and returns cascading scenario_alternatives for the given alternative ids."""
-        db_map_cascading_data = dict()
-        for db_map, alt_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "scenario_alternative") if item["alternative_id"] in alt_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "scenario_alternative", "alternative_id")
 
     def find_cascading_scenario_alternatives_by_scenario(self, db_map_ids):
         """Finds and returns cascading scenario_alternatives for the given scenario ids."""
-        db_map_cascading_data = dict()
-        for db_map, scen_ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "scenario_alternative") if item["scenario_id"] in scen_ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "scenario_alternative", "scenario_id")
 
     def find_cascading_features_by_parameter_definition(self, db_map_ids):
         """Finds and returns cascading features for the given parameter definition ids."""
-        db_map_cascading_data = dict()
-        for db_map, ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "feature") if item["parameter_definition_id"] in ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "feature", "parameter_definition_id")
 
     def find_cascading_features_by_parameter_value_list(self, db_map_ids):
         """Finds and returns cascading features for the given parameter value list ids."""
-        db_map_cascading_data = dict()
-        for db_map, ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "feature") if item["parameter_value_list_id"] in ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "feature", "parameter_value_list_id")
 
     def find_cascading_tool_features_by_feature(self, db_map_ids):
         """Finds and returns cascading tool features for the given feature ids."""
-        db_map_cascading_data = dict()
-        for db_map, ids in db_map_ids.items():
-            db_map_cascading_data[db_map] = [
-                item for item in self.get_items(db_map, "tool_feature") if item["feature_id"] in ids
-            ]
-        return db_map_cascading_data
+        return self._find_items(db_map_ids, "tool_feature", "feature_id")
 
     def export_data(self, caller, db_map_item_ids, file_path, file_filter):
         self._worker.export_data(caller, db_map_item_ids, file_path, file_filter)
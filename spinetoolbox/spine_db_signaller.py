@@ -16,6 +16,7 @@ Spine DB Signaller class.
 :date:   31.10.2019
 """
 
+import time
 from PySide2.QtCore import Slot, QObject
 
 
@@ -31,6 +32,7 @@ class SpineDBSignaller(QObject):
         super().__init__()
         self.db_mngr = db_mngr
         self.listeners = dict()
+        self.pacer = None
 
     def add_db_map_listener(self, db_map, listener):
         """Adds listener for given db_map."""
@@ -291,6 +293,7 @@ class SpineDBSignaller(QObject):
         return {db_map: data for db_map, data in db_map_data.items() if db_map in db_maps}
 
     def _call_in_listeners(self, callback, db_map_data):
+        start = time.perf_counter()
         for listener, db_maps in self.listeners.items():
             shared_db_map_data = self._shared_db_map_data(db_map_data, db_maps)
             if shared_db_map_data:
@@ -298,6 +301,8 @@ class SpineDBSignaller(QObject):
                     getattr(listener, callback)(shared_db_map_data)
                 except AttributeError:
                     pass
+        if self.pacer is not None:
+            self.pacer.record(sum(len(data) for data in db_map_data.values()), time.perf_counter() - start)
 
     @Slot(set)
     def receive_session_refreshed(self, db_maps):
@@ -0,0 +1,188 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Functions to store the cached contents of a Spine database on disk and to load them back.
+
+A snapshot is keyed by database URL and tagged with a fingerprint of the database's schema revision
+and latest commit, and with the version of spinedb_api that produced the rows.
+It is only loaded if all of them still match, i.e. nothing has been committed since the snapshot was taken
+and the rows would still come out of the database the same way.
+Snapshots store only a digest of the URL, so credentials in it never end up on disk.
+
+:date:   18.10.2026
+"""
+
+import hashlib
+import os
+import pickle
+from sqlalchemy import column, select, table, text
+from spinedb_api.version import __version__ as spinedb_api_version
+from .spine_db_cache import CacheItem
+
+SNAPSHOT_VERSION = 3
+_COMMIT_TABLE = table("commit", column("id"), column("date"))
+
+
+def snapshot_path(directory, url):
+    """Returns the path of the snapshot file for given database URL.
+
+    Args:
+        directory (str): snapshot directory
+        url (str): database URL
+
+    Returns:
+        str: path to snapshot file
+    """
+    return os.path.join(directory, url_digest(url) + ".snapshot")
+
+
+def url_digest(url):
+    """Returns a digest that identifies a database URL without revealing it.
+
+    Args:
+        url (str): database URL
+
+    Returns:
+        str: SHA-1 digest of the URL
+    """
+    return hashlib.sha1(str(url).encode("utf-8")).hexdigest()
+
+
+def db_fingerprint(db_map):
+    """Returns a fingerprint of the database's committed contents.
+
+    Args:
+        db_map (DiffDatabaseMapping): database map
+
+    Returns:
+        tuple: schema revision, latest commit id and date, or None if the database cannot be fingerprinted
+    """
+    if db_map.has_pending_changes():
+        return None
+    try:
+        revision = db_map.connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception:  # pylint: disable=broad-except
+        return None
+    commit = latest_commit(db_map)
+    if revision is None or commit is None:
+        return None
+    return revision, commit.id, str(commit.date)
+
+
+def latest_commit(db_map):
+    """Returns the latest commit in the database.
+
+    The commit table is read straight through db_map's connection,
+    since not all supported spinedb_api versions provide a subquery for it.
+
+    Args:
+        db_map (DatabaseMappingBase): database map
+
+    Returns:
+        RowProxy: the commit's id and date, or None if there are no commits or they cannot be read
+    """
+    try:
+        query = select([_COMMIT_TABLE.c.id, _COMMIT_TABLE.c.date]).order_by(_COMMIT_TABLE.c.id.desc()).limit(1)
+        return db_map.connection.execute(query).first()
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def make_snapshot(items_per_type):
+    """Packs cache items into a compact, picklable form.
+
+    Items with the same columns are stored as a single column tuple and a list of value tuples.
+
+    Args:
+        items_per_type (dict): mapping item type to Iterable of CacheItem or dict
+
+    Returns:
+        dict: mapping item type to list of (column names, list of value tuples)
+    """
+    tables = {}
+    for item_type, items in items_per_type.items():
+        groups = {}
+        for item in items:
+            if isinstance(item, CacheItem):
+                keys, values = item.column_record()
+            else:
+                keys, values = tuple(item), tuple(item.values())
+            groups.setdefault(keys, []).append(values)
+        tables[item_type] = list(groups.items())
+    return tables
+
+
+def save_snapshot(directory, url, fingerprint, tables):
+    """Writes a snapshot file.
+
+    Args:
+        directory (str): snapshot directory
+        url (str): database URL
+        fingerprint (tuple): database fingerprint from :func:`db_fingerprint`
+        tables (dict): snapshot from :func:`make_snapshot`
+
+    Returns:
+        bool: True if the snapshot was written, False otherwise
+    """
+    path = snapshot_path(directory, url)
+    temp_path = path + ".tmp"
+    content = {
+        "version": SNAPSHOT_VERSION,
+        "spinedb_api_version": spinedb_api_version,
+        "url_digest": url_digest(url),
+        "fingerprint": fingerprint,
+        "tables": tables,
+    }
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(temp_path, "wb") as snapshot_file:
+            pickle.dump(content, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except (OSError, pickle.PicklingError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def load_snapshot(directory, url, fingerprint):
+    """Reads a snapshot file.
+
+    Args:
+        directory (str): snapshot directory
+        url (str): database URL
+        fingerprint (tuple): current database fingerprint from :func:`db_fingerprint`
+
+    Returns:
+        dict: mapping item type to list of CacheItem, or None if there is no up to date snapshot
+    """
+    if fingerprint is None:
+        return None
+    try:
+        with open(snapshot_path(directory, url), "rb") as snapshot_file:
+            content = pickle.load(snapshot_file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if (
+        not isinstance(content, dict)
+        or content.get("version") != SNAPSHOT_VERSION
+        or content.get("spinedb_api_version") != spinedb_api_version
+        or content.get("url_digest") != url_digest(url)
+        or content.get("fingerprint") != fingerprint
+    ):
+        return None
+    return {
+        item_type: [CacheItem(keys, values) for keys, rows in groups for values in rows]
+        for item_type, groups in content["tables"].items()
+    }
@@ -16,10 +16,16 @@ The SpineDBWorker class
 :date:   2.10.2019
 """
 
+from contextlib import closing
+import itertools
 import json
 import os
+from pathlib import Path
+import sqlite3
+from tempfile import TemporaryDirectory
 from PySide2.QtCore import Qt, QObject, Signal, Slot
-from sqlalchemy.engine.url import URL
+from sqlalchemy import func
+from sqlalchemy.engine.url import URL, make_url
 from spinedb_api import (
     DiffDatabaseMapping,
     DatabaseMapping,
@@ -29,10 +35,237 @@ from spinedb_api import (
     get_data_for_import,
     import_data,
     export_data,
+    export_functions,
     create_new_spine_database,
+    from_database,
+    Asterisk,
 )
 from spinedb_api.spine_io.exporters.excel import export_spine_database_to_xlsx
-from .spine_db_commands import AgedUndoCommand, AddItemsCommand, UpdateItemsCommand, RemoveItemsCommand
+from .spine_db_commands import (
+    AgedUndoCommand,
+    AddItemsCommand,
+    UpdateItemsCommand,
+    RemoveItemsCommand,
+    BulkImportCommand,
+    SpineDBCommand,
+)
+
+_REFRESH_SOURCES = {
+    "alternative": "alternative_sq",
+    "scenario": "scenario_sq",
+    "scenario_alternative": "scenario_alternative_sq",
+    "object_class": "entity_class_sq",
+    "relationship_class": "entity_class_sq",
+    "object": "entity_sq",
+    "relationship": "entity_sq",
+    "entity_group": "entity_group_sq",
+    "parameter_value_list": "parameter_value_list_sq",
+    "parameter_tag": "parameter_tag_sq",
+    "parameter_definition": "parameter_definition_sq",
+    "parameter_definition_tag": "parameter_definition_tag_sq",
+    "parameter_value": "parameter_value_sq",
+    "feature": "feature_sq",
+    "tool": "tool_sq",
+    "tool_feature": "tool_feature_sq",
+    "tool_feature_method": "tool_feature_method_sq",
+}
+"""Maps item type to the subquery of the table its rows come from, in the order items are added."""
+
+_BULK_IMPORT_ORDER = (
+    "alternatives",
+    "scenarios",
+    "scenario_alternatives",
+    "object_classes",
+    "relationship_classes",
+    "parameter_value_lists",
+    "object_parameters",
+    "relationship_parameters",
+    "objects",
+    "relationships",
+    "object_groups",
+    "object_parameter_values",
+    "relationship_parameter_values",
+    "features",
+    "tools",
+    "tool_features",
+    "tool_feature_methods",
+)
+"""Keyword arguments of get_data_for_import in an order where everything an item refers to is imported before it."""
+
+_BULK_IMPORT_BATCH_SIZE = 10000
+"""Maximum number of entries of one kind imported at a time."""
+
+_EXPORT_ID_ARGUMENTS = {
+    "alternatives": "alternative_ids",
+    "scenarios": "scenario_ids",
+    "scenario_alternatives": "scenario_alternative_ids",
+    "object_classes": "object_class_ids",
+    "relationship_classes": "relationship_class_ids",
+    "parameter_value_lists": "parameter_value_list_ids",
+    "object_parameters": "object_parameter_ids",
+    "relationship_parameters": "relationship_parameter_ids",
+    "objects": "object_ids",
+    "relationships": "relationship_ids",
+    "object_groups": "object_group_ids",
+    "object_parameter_values": "object_parameter_value_ids",
+    "relationship_parameter_values": "relationship_parameter_value_ids",
+    "features": "feature_ids",
+    "tools": "tool_ids",
+    "tool_features": "tool_feature_ids",
+    "tool_feature_methods": "tool_feature_method_ids",
+}
+"""Maps export_data keys to the export_data keyword arguments that select their items."""
+
+_OBJECT_CLASSES = "(SELECT entity_class_id FROM source.object_class)"
+_RELATIONSHIP_CLASSES = "(SELECT entity_class_id FROM source.relationship_class)"
+_SQLITE_EXPORT_TABLES = (
+    ("alternative", (("alternative_ids", "id", None),)),
+    ("scenario", (("scenario_ids", "id", None),)),
+    ("scenario_alternative", (("scenario_alternative_ids", "id", None),)),
+    (
+        "entity_class",
+        (
+            ("object_class_ids", "id", "id IN " + _OBJECT_CLASSES),
+            ("relationship_class_ids", "id", "id IN " + _RELATIONSHIP_CLASSES),
+        ),
+    ),
+    ("object_class", (("object_class_ids", "entity_class_id", None),)),
+    ("relationship_class", (("relationship_class_ids", "entity_class_id", None),)),
+    ("relationship_entity_class", (("relationship_class_ids", "entity_class_id", None),)),
+    ("parameter_value_list", (("parameter_value_list_ids", "id", None),)),
+    (
+        "parameter_definition",
+        (
+            ("object_parameter_ids", "id", "entity_class_id IN " + _OBJECT_CLASSES),
+            ("relationship_parameter_ids", "id", "entity_class_id IN " + _RELATIONSHIP_CLASSES),
+        ),
+    ),
+    (
+        "entity",
+        (
+            ("object_ids", "id", "id IN (SELECT entity_id FROM source.object)"),
+            ("relationship_ids", "id", "id IN (SELECT entity_id FROM source.relationship)"),
+        ),
+    ),
+    ("object", (("object_ids", "entity_id", None),)),
+    ("relationship", (("relationship_ids", "entity_id", None),)),
+    ("relationship_entity", (("relationship_ids", "entity_id", None),)),
+    ("entity_group", (("object_group_ids", "id", None),)),
+    (
+        "parameter_value",
+        (
+            ("object_parameter_value_ids", "id", "entity_class_id IN " + _OBJECT_CLASSES),
+            ("relationship_parameter_value_ids", "id", "entity_class_id IN " + _RELATIONSHIP_CLASSES),
+        ),
+    ),
+    ("feature", (("feature_ids", "id", None),)),
+    ("tool", (("tool_ids", "id", None),)),
+    ("tool_feature", (("tool_feature_ids", "id", None),)),
+    ("tool_feature_method", (("tool_feature_method_ids", "id", None),)),
+)
+"""Tables copied when exporting a selection from one SQLite database to another,
+with the export_data keyword argument that selects their rows, the column holding the selected ids
+and the condition that picks all rows of that kind when everything is selected."""
+
+_JSON_EXPORT_ORDER = (
+    "object_classes",
+    "relationship_classes",
+    "parameter_value_lists",
+    "object_parameters",
+    "relationship_parameters",
+    "objects",
+    "relationships",
+    "object_groups",
+    "object_parameter_values",
+    "relationship_parameter_values",
+    "alternatives",
+    "scenarios",
+    "scenario_alternatives",
+    "tools",
+    "features",
+    "tool_features",
+    "tool_feature_methods",
+)
+"""export_data keys in the order export_data returns them, which is the order of tables in exported JSON files."""
+
+_JSON_EXPORT_BATCH_SIZE = 1000
+"""Maximum number of items encoded into one write when exporting to JSON."""
+
+_EXPORT_YIELD_PER = 1000
+"""Number of rows fetched from the database at a time when streaming parameter values for export."""
+
+_WRITE_THROUGH_BUILDERS = {
+    "get_parameter_values": (
+        "make_written_parameter_values",
+        "parameter_value_sq",
+        ("entity_id", "parameter_definition_id", "alternative_id"),
+    )
+}
+"""Maps SpineDBManager getters to methods that build the same cache items from written items without querying,
+the subquery of the written table and the columns that identify a written item in it."""
+
+
+def _export_object_parameter_values(db_map, ids=Asterisk):
+    """Streams the items of export_functions.export_object_parameter_values.
+
+    The database sorts the rows, so they can be fetched and parsed a chunk at a time.
+    With SQLite's default collation, the order is the same as export_functions' sorted().
+
+    Args:
+        db_map (DiffDatabaseMapping): database map
+        ids (Iterable or Asterisk): ids of parameter values to export
+
+    Yields:
+        tuple: object class name, object name, parameter name, parsed value and alternative name
+    """
+    sq = db_map.object_parameter_value_sq
+    query = db_map.query(sq)
+    if ids is not Asterisk:
+        query = query.filter(db_map.in_(sq.c.id, ids))
+    query = query.order_by(sq.c.object_class_name, sq.c.object_name, sq.c.parameter_name, sq.c.alternative_name)
+    for x in query.yield_per(_EXPORT_YIELD_PER):
+        yield x.object_class_name, x.object_name, x.parameter_name, from_database(x.value, x.type), x.alternative_name
+
+
+def _export_relationship_parameter_values(db_map, ids=Asterisk):
+    """Streams the items of export_functions.export_relationship_parameter_values.
+
+    Like :func:`_export_object_parameter_values`. Object name lists are compared name by name,
+    as lists are by sorted(), by sorting on them with the commas replaced by a character
+    that comes before any character of a name.
+
+    Args:
+        db_map (DiffDatabaseMapping): database map
+        ids (Iterable or Asterisk): ids of parameter values to export
+
+    Yields:
+        tuple: relationship class name, object name list, parameter name, parsed value and alternative name
+    """
+    sq = db_map.relationship_parameter_value_sq
+    query = db_map.query(sq)
+    if ids is not Asterisk:
+        query = query.filter(db_map.in_(sq.c.id, ids))
+    query = query.order_by(
+        sq.c.relationship_class_name,
+        func.replace(sq.c.object_name_list, ",", "\x01"),
+        sq.c.parameter_name,
+        sq.c.alternative_name,
+    )
+    for x in query.yield_per(_EXPORT_YIELD_PER):
+        yield (
+            x.relationship_class_name,
+            x.object_name_list.split(","),
+            x.parameter_name,
+            from_database(x.value, x.type),
+            x.alternative_name,
+        )
+
+
+_STREAMED_EXPORTS = {
+    "object_parameter_values": _export_object_parameter_values,
+    "relationship_parameter_values": _export_relationship_parameter_values,
+}
+"""Maps export_data keys to functions that stream their items instead of returning them all in one list."""
 
 
 class SpineDBWorker(QObject):
@@ -45,7 +278,8 @@ class SpineDBWorker(QObject):
     _remove_items_called = Signal(object)
     _commit_session_called = Signal(object, str, object)
     _rollback_session_called = Signal(object)
-    _import_data_called = Signal(object, str)
+    _refresh_session_called = Signal(object)
+    _import_data_called = Signal(object, str, bool)
     _set_scenario_alternatives_called = Signal(object)
     _set_parameter_definition_tags_called = Signal(bool)
     _export_data_called = Signal(object, object, str, str)
@@ -61,6 +295,16 @@ class SpineDBWorker(QObject):
         self._db_map_args = None
         self._db_map_kwargs = None
         self._err = None
+        self._blocking_calls = 0
+
+    @property
+    def waited_on(self):
+        """True while a thread is blocked waiting for this worker to finish a call.
+
+        Returns:
+            bool
+        """
+        return self._blocking_calls > 0
 
     def connect_signals(self):
         connection = Qt.BlockingQueuedConnection if self.thread() is not qApp.thread() else Qt.DirectConnection
@@ -70,6 +314,7 @@ class SpineDBWorker(QObject):
         self._remove_items_called.connect(self._remove_items)
         self._commit_session_called.connect(self._commit_session)
         self._rollback_session_called.connect(self._rollback_session)
+        self._refresh_session_called.connect(self._refresh_session)
         self._import_data_called.connect(self._import_data)
         self._set_scenario_alternatives_called.connect(self._set_scenario_alternatives)
         self._set_parameter_definition_tags_called.connect(self._set_parameter_definition_tags)
@@ -81,7 +326,11 @@ class SpineDBWorker(QObject):
         self._db_map_args = args
         self._db_map_kwargs = kwargs
         self._err = None
-        self._get_db_map_called.emit()
+        self._blocking_calls += 1
+        try:
+            self._get_db_map_called.emit()
+        finally:
+            self._blocking_calls -= 1
         return self._db_map, self._err
 
     @Slot()
@@ -126,12 +375,105 @@ class SpineDBWorker(QObject):
                 db_map_error_log[db_map] = errors
             if not ids:
                 continue
-            for chunk in getter(db_map, ids=ids):
+            written = self._make_written_items(db_map, items, ids, getter_name)
+            chunks = getter(db_map, ids=ids) if written is None else self._chunked(written)
+            for chunk in chunks:
                 signal.emit({db_map: chunk})
                 self._refresh(signal_name, {db_map: chunk})
         if any(db_map_error_log.values()):
             self._db_mngr.error_msg.emit(db_map_error_log)
 
+    def _make_written_items(self, db_map, items, ids, getter_name):
+        """Builds cache items for written items from the cache instead of querying the database.
+
+        Args:
+            db_map (DiffDatabaseMapping): database map
+            items (list of dict): items passed to the database method
+            ids (set of int): ids of the added or updated items
+            getter_name (str): attribute of SpineDBManager that would query the items
+
+        Returns:
+            list: cache items, or None if they must be queried
+        """
+        builder = _WRITE_THROUGH_BUILDERS.get(getter_name)
+        if builder is None:
+            return None
+        builder_name, sq_name, unique_key = builder
+        if all("id" in item for item in items):
+            written = [item for item in items if item["id"] in ids]
+        elif not any("id" in item for item in items):
+            written = self._number_added_items(items, ids)
+            if written is None:
+                written = self._match_added_items(db_map, items, ids, sq_name, unique_key)
+        else:
+            return None
+        if written is None or len(written) != len(ids):
+            return None
+        return getattr(self._db_mngr, builder_name)(db_map, written)
+
+    @staticmethod
+    def _number_added_items(items, ids):
+        """Gives added items their new ids by order.
+
+        The database map hands out consecutive ids to the items it adds, in the order the items were passed,
+        so the ids identify the items as long as none of them was rejected.
+
+        Args:
+            items (list of dict): items passed to the database method
+            ids (set of int): ids of the added items
+
+        Returns:
+            list of dict: added items with their ids, or None if the ids cannot be told apart by order
+        """
+        if not ids or len(ids) != len(items):
+            return None
+        sorted_ids = sorted(ids)
+        if sorted_ids[-1] - sorted_ids[0] != len(sorted_ids) - 1:
+            return None
+        return [{"id": id_, **item} for id_, item in zip(sorted_ids, items)]
+
+    @staticmethod
+    def _match_added_items(db_map, items, ids, sq_name, unique_key):
+        """Gives added items their new ids by matching them with the database rows on a unique key.
+        Used when some items were rejected.
+
+        Args:
+            db_map (DiffDatabaseMapping): database map
+            items (list of dict): items passed to the database method
+            ids (set of int): ids of the added items
+            sq_name (str): attribute of DiffDatabaseMapping holding the subquery of the written table
+            unique_key (tuple of str): columns that identify an item in the table
+
+        Returns:
+            list of dict: added items with their ids, or None if some item lacks a key column
+        """
+        if any(column not in item for item in items for column in unique_key):
+            return None
+        sq = getattr(db_map, sq_name)
+        key_columns = [getattr(sq.c, column) for column in unique_key]
+        query = db_map.query(sq.c.id, *key_columns).filter(db_map.in_(sq.c.id, ids))
+        ids_by_key = {tuple(row[1:]): row[0] for row in query}
+        written = []
+        for item in items:
+            id_ = ids_by_key.pop(tuple(item[column] for column in unique_key), None)
+            if id_ is not None:
+                written.append({"id": id_, **item})
+        return written
+
+    @staticmethod
+    def _chunked(items, chunk_size=1000):
+        """Splits items into chunks like SpineDBManager.get_db_items does.
+
+        Args:
+            items (list)
+            chunk_size (int)
+
+        Yields:
+            list: chunk of items
+        """
+        for start in range(0, len(items), chunk_size):
+            yield items[start : start + chunk_size]
+
     def remove_items(self, db_map_typed_ids):
         self._remove_items_called.emit(db_map_typed_ids)
 
@@ -187,7 +529,7 @@ class SpineDBWorker(QObject):
                 db_map.rollback_session()
                 rolled_db_maps.add(db_map)
                 self._db_mngr.undo_stack[db_map].clear()
-                del self._db_mngr._cache[db_map]
+                self._db_mngr._cache.pop_db_map(db_map)
             except SpineDBAPIError as e:
                 db_map_error_log[db_map] = e.msg
         if any(db_map_error_log.values()):
@@ -195,13 +537,127 @@ class SpineDBWorker(QObject):
         if rolled_db_maps:
             self._db_mngr.session_rolled_back.emit(rolled_db_maps)
 
-    def import_data(self, db_map_data, command_text="Import data"):
-        self._import_data_called.emit(db_map_data, command_text)
+    def refresh_session(self, db_maps):
+        self._refresh_session_called.emit(db_maps)
+
+    @Slot(object)
+    def _refresh_session(self, db_maps):
+        """Updates the cache with the changes committed since db_maps were last fetched or refreshed,
+        emitting added, updated and removed signals as appropriate.
+
+        Databases whose commits cannot be read are dropped from the cache and refetched in full instead.
+
+        Args:
+            db_maps (Iterable of DiffDatabaseMapping): database maps that have a cached commit id
+        """
+        db_map_error_log = {}
+        refetched_db_maps = set()
+        for db_map in db_maps:
+            commit_id = self._db_mngr.cached_commit_id(db_map)
+            latest_commit_id = self._db_mngr.get_latest_commit_id(db_map)
+            try:
+                changed_ids, removed_ids = self._committed_changes(db_map, commit_id)
+            except SpineDBAPIError as e:
+                db_map_error_log[db_map] = e.msg
+                latest_commit_id = None
+            except Exception:  # pylint: disable=broad-except
+                latest_commit_id = None
+            if latest_commit_id is None:
+                self._db_mngr._cache.pop_db_map(db_map)
+                refetched_db_maps.add(db_map)
+                continue
+            removed_data = {
+                item_type: [self._db_mngr.get_item(db_map, item_type, id_) for id_ in ids]
+                for item_type, ids in removed_ids.items()
+            }
+            self._db_mngr.uncache_items({db_map: removed_ids})
+            for item_type in ("scenario_alternative", "parameter_definition_tag", "parameter_value_list"):
+                if removed_data.get(item_type):
+                    self._refresh(item_type + "s_removed", {db_map: removed_data[item_type]})
+            for item_type, ids in changed_ids.items():
+                self._emit_refreshed_items(db_map, item_type, ids)
+            self._db_mngr.set_cached_commit_id(db_map, latest_commit_id)
+        if any(db_map_error_log.values()):
+            self._db_mngr.error_msg.emit(db_map_error_log)
+        if refetched_db_maps:
+            self._db_mngr.session_refreshed.emit(refetched_db_maps)
+
+    def _committed_changes(self, db_map, commit_id):
+        """Finds items that have been added, updated or removed after given commit.
+
+        Tables without a commit id column are compared in full.
 
-    @Slot(object, str)
-    def _import_data(self, db_map_data, command_text="Import data"):
+        Args:
+            db_map (DiffDatabaseMapping)
+            commit_id (int): latest commit whose changes are in the cache
+
+        Returns:
+            tuple: dict mapping item type to set of added or updated ids,
+                and dict mapping item type to set of removed ids
+        """
+        changed_ids = {}
+        removed_ids = {}
+        current_ids = {}
+        for item_type, sq_name in _REFRESH_SOURCES.items():
+            if sq_name not in current_ids:
+                sq = getattr(db_map, sq_name)
+                ids = current_ids[sq_name] = {x.id for x in db_map.query(sq.c.id)}
+                if "commit_id" in sq.c.keys():
+                    changed = {x.id for x in db_map.query(sq.c.id).filter(sq.c.commit_id > commit_id)}
+                else:
+                    changed = ids
+                changed_ids[sq_name] = changed
+            cached_ids = {x["id"] for x in self._db_mngr.get_items(db_map, item_type)}
+            removed = cached_ids - current_ids[sq_name]
+            if removed:
+                removed_ids[item_type] = removed
+        return {item_type: changed_ids[sq_name] for item_type, sq_name in _REFRESH_SOURCES.items()}, removed_ids
+
+    def _emit_refreshed_items(self, db_map, item_type, ids):
+        """Fetches items with given ids and emits added or updated signals for the ones that differ from the cache.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            ids (set of int): ids of items that may have been added or updated
+        """
+        if not ids:
+            return
+        getter = getattr(self._db_mngr, f"get_{item_type}s")
+        added_signal_name = item_type + "s_added"
+        updated_signal_name = item_type + "s_updated"
+        updated_signal = getattr(self._db_mngr, updated_signal_name, None)
+        for chunk in getter(db_map, ids=ids):
+            added = []
+            updated = []
+            for item in chunk:
+                cached_item = self._db_mngr.get_item(db_map, item_type, item["id"])
+                if not cached_item:
+                    added.append(item)
+                elif any(cached_item.get(key) != value for key, value in item.items()):
+                    updated.append(item)
+            if updated and updated_signal is None:
+                # No update signal for this type, so replace the items instead
+                self._db_mngr.uncache_items({db_map: {item_type: {item["id"] for item in updated}}})
+                added += updated
+                updated = []
+            if added:
+                getattr(self._db_mngr, added_signal_name).emit({db_map: added})
+                self._refresh(added_signal_name, {db_map: added})
+            if updated:
+                updated_signal.emit({db_map: updated})
+                self._refresh(updated_signal_name, {db_map: updated})
+
+    def import_data(self, db_map_data, command_text="Import data", bulk=False):
+        self._import_data_called.emit(db_map_data, command_text, bulk)
+
+    @Slot(object, str, bool)
+    def _import_data(self, db_map_data, command_text="Import data", bulk=False):
         db_map_error_log = dict()
         for db_map, data in db_map_data.items():
+            if bulk:
+                self._bulk_import_data(db_map, data, command_text, db_map_error_log.setdefault(db_map, []))
+                continue
             try:
                 data_for_import = get_data_for_import(db_map, **data)
             except (TypeError, ValueError) as err:
@@ -232,9 +688,193 @@ class SpineDBWorker(QObject):
             self._db_mngr.error_msg.emit(db_map_error_log)
         self._db_mngr.data_imported.emit()
 
+    def _bulk_import_data(self, db_map, data, command_text, error_log):
+        """Imports data in batches without an undo command per item type.
+
+        Each batch holds at most ``_BULK_IMPORT_BATCH_SIZE`` entries of a single kind.
+        The cache is refreshed once at the end, with one signal per item type.
+        Undoing removes the items whose ids are higher than before the import and restores the updated items.
+
+        Args:
+            db_map (DiffDatabaseMapping): database map
+            data (dict): keyword arguments to `get_data_for_import`
+            command_text (str): what to call the undo command
+            error_log (list): list where to append import errors
+        """
+        id_marks = self._highest_ids(db_map)
+        added_ids = {}
+        updated_ids = {}
+        updated_items = {}
+        for batch in self._import_batches(data):
+            try:
+                for item_type, (to_add, to_update, import_error_log) in get_data_for_import(db_map, **batch):
+                    error_log.extend([str(x) for x in import_error_log])
+                    if to_add:
+                        ids, errors = self._write_items(db_map, SpineDBCommand._add_method_name[item_type], to_add)
+                        added_ids.setdefault(item_type, set()).update(ids)
+                        error_log.extend(errors)
+                    if to_update:
+                        previously_updated = updated_ids.setdefault(item_type, set())
+                        preexisting_ids = {
+                            x["id"]
+                            for x in to_update
+                            if x["id"] not in previously_updated and x["id"] <= id_marks.get(item_type, 0)
+                        }
+                        updated_items.setdefault(item_type, []).extend(
+                            self._items_before_update(db_map, item_type, preexisting_ids)
+                        )
+                        method_name = SpineDBCommand._update_method_name[item_type]
+                        ids, errors = self._write_items(db_map, method_name, to_update)
+                        previously_updated.update(ids)
+                        error_log.extend(errors)
+            except (TypeError, ValueError) as err:
+                error_log.append(
+                    f"Failed to import data: {err}. Please check that your data source has the right format."
+                )
+                break
+        for item_type in id_marks:
+            added = added_ids.get(item_type, set())
+            self._emit_imported_items(db_map, item_type, added, SpineDBCommand._added_signal_name[item_type])
+            updated = updated_ids.get(item_type, set()) - added
+            if updated:
+                self._emit_imported_items(db_map, item_type, updated, SpineDBCommand._updated_signal_name[item_type])
+        command = BulkImportCommand(
+            self._db_mngr,
+            db_map,
+            command_text,
+            id_marks,
+            {item_type: len(ids) for item_type, ids in added_ids.items()},
+            updated_items,
+        )
+        if not command.isObsolete():
+            self._db_mngr.undo_stack[db_map].push(command)
+
+    def _items_before_update(self, db_map, item_type, ids):
+        """Returns copies of items that are about to be updated.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            ids (set of int): item ids
+
+        Returns:
+            list of dict: items
+        """
+        items = []
+        missing_ids = set()
+        for id_ in ids:
+            item = self._db_mngr.get_item(db_map, item_type, id_)
+            if item:
+                items.append(item.copy())
+            else:
+                missing_ids.add(id_)
+        if missing_ids:
+            getter = getattr(self._db_mngr, SpineDBCommand._get_method_name[item_type])
+            items += [item.copy() for chunk in getter(db_map, ids=missing_ids) for item in chunk]
+        return items
+
+    @staticmethod
+    def _highest_ids(db_map):
+        """Returns the highest id of each item type's table.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+
+        Returns:
+            dict: mapping item type to id, in the order items are added
+        """
+        highest_ids = {}
+        for item_type, sq_name in _REFRESH_SOURCES.items():
+            sq = getattr(db_map, sq_name)
+            row = db_map.query(sq.c.id).order_by(sq.c.id.desc()).first()
+            highest_ids[item_type] = row.id if row is not None else 0
+        return highest_ids
+
+    @staticmethod
+    def _import_batches(data):
+        """Splits import data into batches of bounded size.
+
+        Args:
+            data (dict): keyword arguments to `get_data_for_import`
+
+        Yields:
+            dict: keyword arguments for one batch
+        """
+        keys = [key for key in _BULK_IMPORT_ORDER if key in data]
+        keys += [key for key in data if key not in _BULK_IMPORT_ORDER]
+        for key in keys:
+            iterator = iter(data[key])
+            while True:
+                entries = list(itertools.islice(iterator, _BULK_IMPORT_BATCH_SIZE))
+                if not entries:
+                    break
+                yield {key: entries}
+
+    @staticmethod
+    def _write_items(db_map, method_name, items):
+        """Adds or updates items in the database.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            method_name (str): attribute of DiffDatabaseMapping to call
+            items (list of dict): items to write
+
+        Returns:
+            tuple: set of written ids and list of error messages
+        """
+        result = getattr(db_map, method_name)(*items)
+        if isinstance(result, tuple):
+            ids, errors = result
+        else:
+            ids, errors = result, ()
+        return set(ids), [str(x) for x in errors]
+
+    def _emit_imported_items(self, db_map, item_type, ids, signal_name):
+        """Caches imported items and notifies listeners with a single signal.
+
+        Args:
+            db_map (DiffDatabaseMapping)
+            item_type (str)
+            ids (set of int): imported ids
+            signal_name (str): signal attribute of SpineDBManager to emit
+        """
+        if not ids:
+            return
+        getter = getattr(self._db_mngr, SpineDBCommand._get_method_name[item_type])
+        items = [item for chunk in getter(db_map, ids=ids) for item in chunk]
+        if not items:
+            return
+        getattr(self._db_mngr, signal_name).emit({db_map: items})
+        self._refresh(signal_name, {db_map: items})
+
     def export_data(self, caller, db_map_item_ids, file_path, file_filter):
         self._export_data_called.emit(caller, db_map_item_ids, file_path, file_filter)
 
+    @staticmethod
+    def _export_tables(db_map_item_ids, order=_BULK_IMPORT_ORDER):
+        """Exports data one table at a time.
+
+        Parameter values are streamed from the database, so each table must be consumed before the next one.
+
+        Args:
+            db_map_item_ids (dict): mapping DiffDatabaseMapping to export_data keyword arguments
+            order (Iterable of str): export_data keys in the order the tables are exported
+
+        Yields:
+            tuple: export_data key and an iterable of exported items for that key; empty tables are skipped
+        """
+        for key in order:
+            export_table = _STREAMED_EXPORTS.get(key)
+            if export_table is None:
+                export_table = getattr(export_functions, "export_" + key)
+            items = itertools.chain.from_iterable(
+                export_table(db_map, item_ids.get(_EXPORT_ID_ARGUMENTS[key], Asterisk))
+                for db_map, item_ids in db_map_item_ids.items()
+            )
+            first_item = next(items, None)
+            if first_item is not None:
+                yield key, itertools.chain((first_item,), items)
+
     def _get_data_for_export(self, db_map_item_ids):
         data = {}
         for db_map, item_ids in db_map_item_ids.items():
@@ -245,16 +885,231 @@ class SpineDBWorker(QObject):
     # XXX: Don't decorate the slot, otherwise it executes in the wrong thread!
     # See bug report in https://bugreports.qt.io/projects/PYSIDE/issues/PYSIDE-1354?filter=allissues
     def _export_data(self, caller, db_map_item_ids, file_path, file_filter):
-        data = self._get_data_for_export(db_map_item_ids)
         if file_filter.startswith("JSON"):
-            self.export_to_json(file_path, data, caller)
+            self.export_to_json(file_path, self._export_tables(db_map_item_ids, _JSON_EXPORT_ORDER), caller)
         elif file_filter.startswith("SQLite"):
-            self.export_to_sqlite(file_path, data, caller)
+            source = self._committed_sqlite_database(db_map_item_ids)
+            if source is None:
+                self.export_to_sqlite(file_path, self._get_data_for_export(db_map_item_ids), caller)
+                return
+            source_path, item_ids = source
+            if all(ids is Asterisk for ids in item_ids.values()):
+                self.copy_sqlite_database(source_path, file_path, caller)
+            elif not self.copy_sqlite_selection(source_path, item_ids, file_path, caller):
+                self.export_to_sqlite(file_path, self._get_data_for_export(db_map_item_ids), caller)
         elif file_filter.startswith("Excel"):
-            self.export_to_excel(file_path, data, caller)
+            db_map = self._whole_database(db_map_item_ids)
+            if db_map is not None:
+                self.export_to_excel(file_path, db_map, caller)
+                return
+            with TemporaryDirectory() as temp_dir:
+                staging_path = os.path.join(temp_dir, "export.sqlite")
+                db_map = self._make_staging_database(staging_path, self._export_tables(db_map_item_ids))
+                try:
+                    self.export_to_excel(file_path, db_map, caller)
+                finally:
+                    db_map.connection.close()
         else:
             raise ValueError()
 
+    @staticmethod
+    def _whole_database(db_map_item_ids):
+        """Checks if an export covers everything in a single database.
+
+        Args:
+            db_map_item_ids (dict): mapping DiffDatabaseMapping to export_data keyword arguments
+
+        Returns:
+            DiffDatabaseMapping: the database to export, or None if only some items are exported
+        """
+        if len(db_map_item_ids) != 1:
+            return None
+        ((db_map, item_ids),) = db_map_item_ids.items()
+        if any(ids is not Asterisk for ids in item_ids.values()):
+            return None
+        return db_map
+
+    @staticmethod
+    def _committed_sqlite_database(db_map_item_ids):
+        """Checks if an export is from a single SQLite database file that has no uncommitted changes.
+
+        Args:
+            db_map_item_ids (dict): mapping DiffDatabaseMapping to export_data keyword arguments
+
+        Returns:
+            tuple: path to the database file and export_data keyword arguments,
+                or None if the export cannot be done by copying rows from the file
+        """
+        if len(db_map_item_ids) != 1:
+            return None
+        ((db_map, item_ids),) = db_map_item_ids.items()
+        url = make_url(db_map.db_url)
+        if not url.drivername.startswith("sqlite") or url.database in (None, "", ":memory:"):
+            return None
+        if db_map.has_pending_changes():
+            return None
+        return url.database, item_ids
+
+    @classmethod
+    def _whole_sqlite_database(cls, db_map_item_ids):
+        """Checks if an export covers everything in a single SQLite database that has no uncommitted changes.
+
+        Args:
+            db_map_item_ids (dict): mapping DiffDatabaseMapping to export_data keyword arguments
+
+        Returns:
+            str: path to the database file, or None if the export cannot be done by copying the file
+        """
+        if cls._whole_database(db_map_item_ids) is None:
+            return None
+        source = cls._committed_sqlite_database(db_map_item_ids)
+        return source[0] if source is not None else None
+
+    def copy_sqlite_database(self, source_path, file_path, caller):
+        """Exports a whole SQLite database into SQLite file using SQLite's backup API.
+
+        Pages are copied as they are so no row is decoded on the way.
+
+        Args:
+            source_path (str): path to the database file to export
+            file_path (str): path to the output file
+            caller (QObject): the object that requested the export
+        """
+        url = URL("sqlite", database=file_path)
+        if not self._db_mngr.is_url_available(url, caller):
+            return
+        source_uri = Path(source_path).resolve().as_uri() + "?mode=ro"
+        try:
+            with closing(sqlite3.connect(source_uri, uri=True)) as source:
+                with closing(sqlite3.connect(file_path)) as target:
+                    source.backup(target)
+        except sqlite3.Error as err:
+            file_name = os.path.split(file_path)[1]
+            error_msg = {None: [f"[sqlite3.Error] Unable to export file <b>{file_name}</b>: {err}"]}
+            caller.msg_error.emit(error_msg)
+        else:
+            caller.sqlite_file_exported.emit(file_path)
+
+    def copy_sqlite_selection(self, source_path, item_ids, file_path, caller):
+        """Exports selected items of a SQLite database into SQLite file without decoding them.
+
+        A new Spine database is created, the source is attached to it and the selected rows of each table
+        are copied over with INSERT ... SELECT. Rows that refer to rows left out of the export are then dropped,
+        just like importing them would fail.
+
+        Args:
+            source_path (str): path to the database file to export from
+            item_ids (dict): export_data keyword arguments that select the exported items
+            file_path (str): path to the output file
+            caller (QObject): the object that requested the export
+
+        Returns:
+            bool: False if the databases have different schemas so the rows cannot be copied, True otherwise
+        """
+        url = URL("sqlite", database=file_path)
+        if not self._db_mngr.is_url_available(url, caller):
+            return True
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        try:
+            with TemporaryDirectory(dir=directory) as temp_dir:
+                temp_path = os.path.join(temp_dir, file_name)
+                create_new_spine_database(URL("sqlite", database=temp_path)).dispose()
+                with closing(sqlite3.connect(Path(temp_path).as_uri(), uri=True)) as connection:
+                    if not self._copy_selected_rows(connection, source_path, item_ids):
+                        return False
+                os.replace(temp_path, file_path)
+        except (sqlite3.Error, OSError, SpineDBAPIError) as err:
+            error_msg = {None: [f"Unable to export file <b>{file_name}</b>: {err}"]}
+            caller.msg_error.emit(error_msg)
+        else:
+            caller.sqlite_file_exported.emit(file_path)
+        return True
+
+    @classmethod
+    def _copy_selected_rows(cls, connection, source_path, item_ids):
+        """Copies selected rows from source database to a new Spine database.
+
+        Args:
+            connection (sqlite3.Connection): connection to the new database
+            source_path (str): path to the database file to copy from
+            item_ids (dict): export_data keyword arguments that select the copied items
+
+        Returns:
+            bool: True if the rows were copied, False if the databases have different schemas
+        """
+        connection.execute("ATTACH DATABASE ? AS source", (Path(source_path).resolve().as_uri() + "?mode=ro",))
+        revision_query = "SELECT version_num FROM {}.alembic_version"
+        if (
+            connection.execute(revision_query.format("main")).fetchall()
+            != connection.execute(revision_query.format("source")).fetchall()
+        ):
+            return False
+        table_columns = {}
+        for table, _ in _SQLITE_EXPORT_TABLES:
+            columns = [row[1] for row in connection.execute(f'PRAGMA main.table_info("{table}")')]
+            source_columns = {row[1] for row in connection.execute(f'PRAGMA source.table_info("{table}")')}
+            if not columns or set(columns) != source_columns:
+                return False
+            table_columns[table] = columns
+        (commit_id,) = connection.execute('SELECT MAX(id) FROM main."commit"').fetchone()
+        connection.execute("CREATE TEMP TABLE export_ids (key TEXT, id INTEGER)")
+        with connection:
+            connection.executemany(
+                "INSERT INTO temp.export_ids VALUES (?, ?)",
+                ((key, id_) for key, ids in item_ids.items() if ids is not Asterisk for id_ in ids),
+            )
+            for table, selections in _SQLITE_EXPORT_TABLES:
+                columns = table_columns[table]
+                column_list = ", ".join(f'"{column}"' for column in columns)
+                select_list = ", ".join("?" if column == "commit_id" else f'"{column}"' for column in columns)
+                parameters = [commit_id] if "commit_id" in columns else []
+                conditions = []
+                for key, id_column, everything in selections:
+                    if item_ids.get(key, Asterisk) is Asterisk:
+                        conditions.append(everything or "1")
+                    else:
+                        conditions.append(f'"{id_column}" IN (SELECT id FROM temp.export_ids WHERE key = ?)')
+                        parameters.append(key)
+                connection.execute(
+                    f'INSERT OR REPLACE INTO main."{table}" ({column_list}) '
+                    f'SELECT {select_list} FROM source."{table}" WHERE {" OR ".join(conditions)}',
+                    parameters,
+                )
+            cls._drop_dangling_rows(connection, [table for table, _ in _SQLITE_EXPORT_TABLES])
+        connection.execute("DETACH DATABASE source")
+        return True
+
+    @staticmethod
+    def _drop_dangling_rows(connection, tables):
+        """Deletes rows whose foreign keys point to rows that do not exist, until no such rows are left.
+
+        SQLite's foreign_key_check cannot be used as some foreign keys of the Spine schema
+        refer to columns that are not unique on their own.
+
+        Args:
+            connection (sqlite3.Connection): database connection
+            tables (list of str): tables to clean up
+        """
+        deletes = []
+        for table in tables:
+            foreign_keys = {}
+            for key_id, _, parent, column, parent_column, *_ in connection.execute(
+                f'PRAGMA main.foreign_key_list("{table}")'
+            ):
+                if parent != "commit":
+                    foreign_keys.setdefault((key_id, parent), []).append((column, parent_column or "id"))
+            for (_, parent), column_pairs in foreign_keys.items():
+                not_null = " AND ".join(f'"{table}"."{column}" IS NOT NULL' for column, _ in column_pairs)
+                match = " AND ".join(
+                    f'p."{parent_column}" = "{table}"."{column}"' for column, parent_column in column_pairs
+                )
+                deletes.append(
+                    f'DELETE FROM main."{table}" WHERE {not_null} '
+                    f'AND NOT EXISTS (SELECT 1 FROM main."{parent}" AS p WHERE {match})'
+                )
+        while sum(connection.execute(delete).rowcount for delete in deletes):
+            pass
+
     def export_to_sqlite(self, file_path, data_for_export, caller):
         """Exports given data into SQLite file."""
         url = URL("sqlite", database=file_path)
@@ -271,35 +1126,65 @@ class SpineDBWorker(QObject):
         else:
             caller.sqlite_file_exported.emit(file_path)
 
-    def export_to_json(self, file_path, data_for_export, caller):  # pylint: disable=no-self-use
-        """Exports given data into JSON file."""
+    def export_to_json(self, file_path, tables, caller):  # pylint: disable=no-self-use
+        """Exports given data into JSON file.
+
+        Tables are written as they arrive, a batch of items at a time,
+        so the document is never held in memory as a whole.
+
+        Args:
+            file_path (str): path to the output file
+            tables (Iterable): pairs of export_data key and iterable of exported items
+            caller (QObject): the object that requested the export
+        """
         indent = 4 * " "
-        json_data = "{{{0}{1}{0}}}".format(
-            "\n" if data_for_export else "",
-            ",\n".join(
-                [
-                    indent
-                    + json.dumps(key)
-                    + ": [{0}{1}{0}]".format(
-                        "\n" + indent if values else "",
-                        (",\n" + indent).join(
-                            [indent + json.dumps(value, cls=ParameterValueEncoder) for value in values]
-                        ),
-                    )
-                    for key, values in data_for_export.items()
-                ]
-            ),
-        )
+        item_separator = ",\n" + 2 * indent
+        encoder = ParameterValueEncoder()
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(json_data)
+            f.write("{")
+            table_separator = "\n"
+            for key, values in tables:
+                f.write(table_separator + indent + json.dumps(key) + ": [")
+                table_separator = ",\n"
+                iterator = iter(values)
+                separator = "\n" + 2 * indent
+                while True:
+                    batch = list(itertools.islice(iterator, _JSON_EXPORT_BATCH_SIZE))
+                    if not batch:
+                        break
+                    f.write(separator + item_separator.join([encoder.encode(value) for value in batch]))
+                    separator = item_separator
+                if separator == item_separator:
+                    f.write("\n" + indent)
+                f.write("]")
+            f.write("}" if table_separator == "\n" else "\n}")
         caller.file_exported.emit(file_path)
 
-    def export_to_excel(self, file_path, data_for_export, caller):  # pylint: disable=no-self-use
-        """Exports given data into Excel file."""
-        # NOTE: We import data into an in-memory Spine db and then export that to excel.
-        url = URL("sqlite", database="")
-        db_map = DatabaseMapping(url, create=True)
-        import_data(db_map, **data_for_export)
+    @staticmethod
+    def _make_staging_database(file_path, tables):
+        """Imports exported tables into a new SQLite database, a batch of items at a time.
+
+        Args:
+            file_path (str): path to the database file
+            tables (Iterable): pairs of export_data key and iterable of exported items, in dependency order
+
+        Returns:
+            DatabaseMapping: mapping to the new database
+        """
+        db_map = DatabaseMapping(URL("sqlite", database=file_path), create=True)
+        for key, items in tables:
+            for batch in SpineDBWorker._import_batches({key: items}):
+                import_data(db_map, **batch)
+        return db_map
+
+    def export_to_excel(self, file_path, db_map, caller):  # pylint: disable=no-self-use
+        """Exports given database into Excel file.
+
+        Args:
+            file_path (str): path to the output file
+            db_map (DatabaseMappingBase): database to export
+            caller (QObject): the object that requested the export
+        """
         file_name = os.path.split(file_path)[1]
         try:
             os.remove(file_path)
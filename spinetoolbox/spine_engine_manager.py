@@ -16,8 +16,19 @@ Contains SpineEngineManagerBase.
 :date:   14.10.2020
 """
 
-import socket
+from collections import deque
 import json
+import socket
+import struct
+from threading import Lock
+
+_FRAME_HEADER = struct.Struct(">I")
+LEGACY_PROTOCOL_VERSION = 1
+"""Unframed requests over one connection each, with polled engine events."""
+FRAMED_PROTOCOL_VERSION = 2
+"""Length-prefixed frames over persistent connections, with pushed engine events."""
+_PROTOCOL_VERSION_TIMEOUT = 5.0
+"""Seconds to wait for the server to tell its protocol version before falling back to the legacy protocol."""
 
 
 class SpineEngineManagerBase:
@@ -57,63 +68,192 @@ class SpineEngineManagerBase:
         """
         raise NotImplementedError()
 
+    def close(self):
+        """Releases the resources held by the manager."""
+
 
 class RemoteSpineEngineManager(SpineEngineManagerBase):
-    _ENCODING = "ascii"
+    """Talks to an engine server, over persistent length-prefixed connections if the server supports them.
+
+    The first request asks the server for its protocol version with a legacy request.
+    Servers that predate framing do not know the request; they, as well as any failure or
+    a slow answer, make the manager stick to the legacy protocol.
+
+    In the legacy protocol, every request opens a new connection, sends ``[request, args]``
+    as ASCII JSON without framing and reads the response until the server closes the connection.
+    Engine events are polled one by one with ``get_engine_event`` requests.
+
+    In the framed protocol, every message is a frame made of a 4-byte big-endian payload length followed by
+    the UTF-8 encoded JSON payload. Requests are sent over a single control connection as ``[request, args]`` frames;
+    the server answers each of them with one response frame. Engine events are streamed over a separate connection:
+    after a ``subscribe_engine_events`` request, the server pushes frames holding lists of ``[event_type, data]``
+    pairs until ``dag_exec_finished``. The server tells frames from legacy requests by their first byte.
+    """
+
+    _ENCODING = "utf-8"
+    _LEGACY_ENCODING = "ascii"
 
     def __init__(self, engine_server_address):
         """
         Args:
-            engine_server_address (str)
+            engine_server_address (tuple or str): engine server host and port as tuple or "host:port" string
         """
         super().__init__()
+        if isinstance(engine_server_address, str):
+            host, _, port = engine_server_address.rpartition(":")
+            engine_server_address = (host, int(port))
         self._engine_server_address = engine_server_address
-        self.request = None
+        self._protocol_version = None
+        self._protocol_lock = Lock()
+        self._connection = None
+        self._connection_lock = Lock()
+        self._event_connection = None
+        self._events = deque()
         self._engine_id = None
 
+    @property
+    def protocol_version(self):
+        """Protocol version agreed with the server, negotiated on first use.
+
+        Returns:
+            int: LEGACY_PROTOCOL_VERSION or FRAMED_PROTOCOL_VERSION
+        """
+        with self._protocol_lock:
+            if self._protocol_version is None:
+                self._protocol_version = self._negotiate_protocol_version()
+            return self._protocol_version
+
     def run_engine(self, engine_data):
         """See base class."""
-        self._engine_id = self._send("run_engine", engine_data)
+        self._events.clear()
+        self._engine_id = self._request("run_engine", engine_data)
 
     def get_engine_event(self):
         """See base class."""
-        return self._send("get_engine_event", self._engine_id)
+        if self.protocol_version < FRAMED_PROTOCOL_VERSION:
+            return tuple(self._send_legacy("get_engine_event", self._engine_id))
+        while not self._events:
+            if self._event_connection is None:
+                self._event_connection = self._connect()
+                send_frame(self._event_connection, self._encode("subscribe_engine_events", self._engine_id))
+            try:
+                batch = json.loads(recv_frame(self._event_connection).decode(self._ENCODING))
+            except OSError:
+                self._close_event_connection()
+                raise
+            self._events.extend(tuple(event) for event in batch)
+        event = self._events.popleft()
+        if event[0] == "dag_exec_finished":
+            self._close_event_connection()
+        return event
 
     def stop_engine(self):
         """See base class."""
-        self._send("stop_engine", self._engine_id, receive=False)
+        if self.protocol_version < FRAMED_PROTOCOL_VERSION:
+            self._send_legacy("stop_engine", self._engine_id, receive=False)
+            return
+        self._send("stop_engine", self._engine_id)
 
     def restart_kernel(self, connection_file):
         """See base class."""
-        self._send("restart_kernel", connection_file)
+        self._request("restart_kernel", connection_file)
 
     def shutdown_kernel(self, connection_file):
         """See base class."""
-        self._send("shutdown_kernel", connection_file)
+        self._request("shutdown_kernel", connection_file)
+
+    def close(self):
+        """See base class."""
+        self._close_event_connection()
+        with self._connection_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _negotiate_protocol_version(self):
+        """Asks the server for the newest protocol version it supports.
+
+        Returns:
+            int: protocol version to use
+        """
+        try:
+            version = self._send_legacy("get_protocol_version", timeout=_PROTOCOL_VERSION_TIMEOUT)
+        except ConnectionRefusedError:
+            raise
+        except (OSError, ValueError):
+            return LEGACY_PROTOCOL_VERSION
+        if isinstance(version, int) and version >= FRAMED_PROTOCOL_VERSION:
+            return FRAMED_PROTOCOL_VERSION
+        return LEGACY_PROTOCOL_VERSION
+
+    def _request(self, request, *args):
+        """Sends a request to the server using the agreed protocol and returns the response.
+
+        Args:
+            request (str): One of the supported engine server requests
+            args: Request arguments
+
+        Returns:
+            Any: response
+        """
+        if self.protocol_version < FRAMED_PROTOCOL_VERSION:
+            return self._send_legacy(request, *args)
+        return self._send(request, *args)
 
-    def _send(self, request, *args, receive=True):
+    def _connect(self):
+        """Opens a new connection to the server.
+
+        Returns:
+            socket.socket: connected socket
+        """
+        connection = socket.create_connection(self._engine_server_address)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def _close_event_connection(self):
+        """Closes the event stream connection."""
+        if self._event_connection is not None:
+            self._event_connection.close()
+            self._event_connection = None
+
+    def _encode(self, request, *args):
+        """Encodes a request as frame payload.
+
+        Args:
+            request (str): One of the supported engine server requests
+            args: Request arguments
+
+        Returns:
+            bytes: payload
+        """
+        return json.dumps((request, args)).encode(self._ENCODING)
+
+    def _send_legacy(self, request, *args, receive=True, timeout=None):
         """
-        Sends a request to the server with the given arguments.
+        Sends a request to the server over a new connection using the legacy protocol.
 
         Args:
             request (str): One of the supported engine server requests
             args: Request arguments
             receive (bool, optional): If True (the default) also receives the response and returns it.
+            timeout (float, optional): socket timeout in seconds
 
         Returns:
-            str or NoneType: response, or None if receive is False
+            Any: response, or None if receive is False
         """
         msg = json.dumps((request, args))
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as self.request:
-            self.request.connect(self._engine_server_address)
-            self.request.sendall(bytes(msg, "ascii"))
+        with socket.create_connection(self._engine_server_address, timeout=timeout) as connection:
+            connection.sendall(bytes(msg, self._LEGACY_ENCODING))
             if receive:
-                response = self._recvall()
-                return json.loads(response)
+                return json.loads(self._recvall(connection))
+        return None
 
-    def _recvall(self):
+    def _recvall(self, connection):
         """
-        Receives and returns all data in the current request.
+        Receives and returns all data of a legacy response.
+
+        Args:
+            connection (socket.socket): connected socket
 
         Returns:
             str
@@ -121,12 +261,96 @@ class RemoteSpineEngineManager(SpineEngineManagerBase):
         BUFF_SIZE = 4096
         fragments = []
         while True:
-            chunk = str(self.request.recv(BUFF_SIZE), self._ENCODING)
+            chunk = str(connection.recv(BUFF_SIZE), self._LEGACY_ENCODING)
             fragments.append(chunk)
             if len(chunk) < BUFF_SIZE:
                 break
         return "".join(fragments)
 
+    def _send(self, request, *args):
+        """
+        Sends a request to the server over the control connection and returns the response.
+
+        The connection is opened on first use and kept open. If sending fails, the connection is re-established once.
+
+        Args:
+            request (str): One of the supported engine server requests
+            args: Request arguments
+
+        Returns:
+            Any: response
+        """
+        payload = self._encode(request, *args)
+        with self._connection_lock:
+            for attempt in range(2):
+                if self._connection is None:
+                    self._connection = self._connect()
+                try:
+                    send_frame(self._connection, payload)
+                    break
+                except OSError:
+                    self._connection.close()
+                    self._connection = None
+                    if attempt:
+                        raise
+            try:
+                response = recv_frame(self._connection)
+            except OSError:
+                self._connection.close()
+                self._connection = None
+                raise
+        return json.loads(response.decode(self._ENCODING))
+
+
+def send_frame(connection, payload):
+    """Sends a length-prefixed frame.
+
+    Args:
+        connection (socket.socket): connected socket
+        payload (bytes): frame payload
+    """
+    connection.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(connection):
+    """Receives a length-prefixed frame.
+
+    Args:
+        connection (socket.socket): connected socket
+
+    Returns:
+        bytes: frame payload
+
+    Raises:
+        ConnectionError: if the connection is closed before the frame is complete
+    """
+    (length,) = _FRAME_HEADER.unpack(_recv_exactly(connection, _FRAME_HEADER.size))
+    return _recv_exactly(connection, length)
+
+
+def _recv_exactly(connection, size):
+    """Receives exactly given number of bytes.
+
+    Args:
+        connection (socket.socket): connected socket
+        size (int): number of bytes to receive
+
+    Returns:
+        bytes: received data
+
+    Raises:
+        ConnectionError: if the connection is closed before all data has been received
+    """
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = connection.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Engine server closed the connection.")
+        received += count
+    return bytes(buffer)
+
 
 class LocalSpineEngineManager(SpineEngineManagerBase):
     def __init__(self):
@@ -17,7 +17,10 @@ Contains SpineEngineWorker.
 """
 
 import copy
-from PySide2.QtCore import Signal, Slot, QObject, QThread
+from functools import partial
+from threading import Lock
+from PySide2.QtCore import Qt, Signal, Slot, QObject, QThread, QTimer
+from .helpers import format_log_message
 from .spine_engine_manager import make_engine_manager
 
 
@@ -47,14 +50,132 @@ def _handle_node_execution_finished(item, direction, state, success, skipped):
             icon.run_execution_leave_animation(skipped)
 
 
-@Slot(object, str, str)
-def _handle_event_message_arrived(item, filter_id, msg_type, msg_text):
-    item.add_event_message(filter_id, msg_type, msg_text)
+@Slot(list)
+def _handle_messages_arrived(messages):
+    log_messages = {}
+    for item, filter_id, is_process_message, msg_type, msg_text in messages:
+        message = format_log_message(msg_type, msg_text, show_datetime=not is_process_message)
+        log_messages.setdefault((item, filter_id), []).append(message)
+    for (item, filter_id), item_messages in log_messages.items():
+        item.add_log_messages(filter_id, item_messages)
+
+
+class _MessageBatcher(QObject):
+    """Collects log messages from the worker thread and delivers them to the GUI thread in batches.
+
+    A batch is delivered at the latest ``interval`` milliseconds after its first message,
+    or as soon as it holds ``max_size`` messages. Batches are delivered one per event loop iteration
+    so that the GUI stays responsive while a chatty process floods the log.
+    Signals that must not overtake the messages are queued in between them with :meth:`add_emission`.
+    """
+
+    messages_arrived = Signal(list)
+    """Emitted in the GUI thread with a list of (item, filter id, is process message, message type, text) tuples."""
+    _first_entry_added = Signal()
+    _batch_ready = Signal()
+
+    def __init__(self, interval, max_size):
+        """
+        Args:
+            interval (int): maximum time in milliseconds a message waits for delivery
+            max_size (int): maximum number of messages in a batch
+        """
+        super().__init__()
+        self._max_size = max_size
+        self._entries = []
+        self._delivery_scheduled = False
+        self._lock = Lock()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._deliver_batch)
+        self._first_entry_added.connect(self._timer.start)
+        self._batch_ready.connect(self._deliver_batch, Qt.QueuedConnection)
+
+    def add(self, message):
+        """Adds a message to current batch. Can be called from any thread.
+
+        Args:
+            message (tuple): item, filter id, is process message flag, message type and text
+        """
+        self._add_entry(message)
 
+    def add_emission(self, signal, *args):
+        """Queues a signal emission after the messages added so far. Can be called from any thread.
 
-@Slot(object, str, str)
-def _handle_process_message_arrived(item, filter_id, msg_type, msg_text):
-    item.add_process_message(filter_id, msg_type, msg_text)
+        Args:
+            signal (SignalInstance): signal to emit in the GUI thread
+            *args: signal arguments
+        """
+        self._add_entry(partial(signal.emit, *args))
+
+    def _add_entry(self, entry):
+        """Adds a message or an emission and schedules delivery.
+
+        Args:
+            entry (tuple or partial): message or emission
+        """
+        with self._lock:
+            self._entries.append(entry)
+            count = len(self._entries)
+            batch_full = count >= self._max_size or not isinstance(entry, tuple)
+            schedule_delivery = batch_full and not self._delivery_scheduled
+            if schedule_delivery:
+                self._delivery_scheduled = True
+        if schedule_delivery:
+            self._batch_ready.emit()
+        elif count == 1:
+            self._first_entry_added.emit()
+
+    def _take_batch(self):
+        """Removes the oldest batch from pending entries.
+
+        Returns:
+            tuple: batch and the number of entries still pending
+        """
+        with self._lock:
+            batch = self._entries[: self._max_size]
+            del self._entries[: self._max_size]
+            remaining = len(self._entries)
+            self._delivery_scheduled = remaining > 0
+            return batch, remaining
+
+    def _deliver(self, batch):
+        """Emits messages and queued signals in order.
+
+        Args:
+            batch (list): messages and emissions
+        """
+        messages = []
+        for entry in batch:
+            if isinstance(entry, tuple):
+                messages.append(entry)
+                continue
+            if messages:
+                self.messages_arrived.emit(messages)
+                messages = []
+            entry()
+        if messages:
+            self.messages_arrived.emit(messages)
+
+    @Slot()
+    def _deliver_batch(self):
+        """Delivers the oldest batch and schedules the next one."""
+        self._timer.stop()
+        batch, remaining = self._take_batch()
+        self._deliver(batch)
+        if remaining:
+            self._batch_ready.emit()
+
+    @Slot()
+    def flush(self):
+        """Delivers everything that is pending."""
+        self._timer.stop()
+        while True:
+            batch, remaining = self._take_batch()
+            self._deliver(batch)
+            if not remaining:
+                break
 
 
 class SpineEngineWorker(QObject):
@@ -63,8 +184,8 @@ class SpineEngineWorker(QObject):
     _dag_execution_started = Signal(list)
     _node_execution_started = Signal(object, object)
     _node_execution_finished = Signal(object, object, object, bool, bool)
-    _event_message_arrived = Signal(object, str, str, str)
-    _process_message_arrived = Signal(object, str, str, str)
+    _MESSAGE_BATCH_INTERVAL = 50
+    _MAX_MESSAGE_BATCH_SIZE = 1000
 
     def __init__(self, engine_server_address, engine_data, dag, dag_identifier, project_items):
         """
@@ -86,6 +207,7 @@ class SpineEngineWorker(QObject):
         self.event_messages = {}
         self.process_messages = {}
         self.successful_executions = []
+        self._message_batcher = _MessageBatcher(self._MESSAGE_BATCH_INTERVAL, self._MAX_MESSAGE_BATCH_SIZE)
         self._thread = QThread()
         self.moveToThread(self._thread)
         self._thread.started.connect(self.do_work)
@@ -112,13 +234,11 @@ class SpineEngineWorker(QObject):
         """
         self._engine_data = engine_data
 
-    @Slot(object, str, str)
-    def _handle_event_message_arrived(self, item, filter_id, msg_type, msg_text):
-        self.event_messages.setdefault(msg_type, []).append(msg_text)
-
-    @Slot(object, str, str)
-    def _handle_process_message_arrived(self, item, filter_id, msg_type, msg_text):
-        self.process_messages.setdefault(msg_type, []).append(msg_text)
+    @Slot(list)
+    def _handle_messages_arrived(self, messages):
+        for _item, _filter_id, is_process_message, msg_type, msg_text in messages:
+            messages_by_type = self.process_messages if is_process_message else self.event_messages
+            messages_by_type.setdefault(msg_type, []).append(msg_text)
 
     def stop_engine(self):
         self._engine_mngr.stop_engine()
@@ -131,14 +251,12 @@ class SpineEngineWorker(QObject):
 
     def _connect_log_signals(self, silent):
         if silent:
-            self._event_message_arrived.connect(self._handle_event_message_arrived)
-            self._process_message_arrived.connect(self._handle_process_message_arrived)
+            self._message_batcher.messages_arrived.connect(self._handle_messages_arrived)
             return
         self._dag_execution_started.connect(_handle_dag_execution_started)
         self._node_execution_started.connect(_handle_node_execution_started)
         self._node_execution_finished.connect(_handle_node_execution_finished)
-        self._event_message_arrived.connect(_handle_event_message_arrived)
-        self._process_message_arrived.connect(_handle_process_message_arrived)
+        self._message_batcher.messages_arrived.connect(_handle_messages_arrived)
 
     def start(self, silent=False):
         """Connects log signals.
@@ -161,7 +279,7 @@ class SpineEngineWorker(QObject):
             if event_type == "dag_exec_finished":
                 self._engine_final_state = data
                 break
-        self.finished.emit()
+        self._message_batcher.add_emission(self.finished)
 
     def _process_event(self, event_type, data):
         handler = {
@@ -180,13 +298,11 @@ class SpineEngineWorker(QObject):
         item = self._project_items[msg["item_name"]]
         if msg["type"] == "execution_failed_to_start":
             msg_text = f"Program <b>{msg['program']}</b> failed to start: {msg['error']}"
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "execution_started":
-            self._event_message_arrived.emit(
-                item, msg["filter_id"], "msg", f"\tStarting program <b>{msg['program']}</b>"
-            )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg", f"\tArguments: <b>{msg['args']}</b>")
-            self._event_message_arrived.emit(
+            self._add_event_message(item, msg["filter_id"], "msg", f"\tStarting program <b>{msg['program']}</b>")
+            self._add_event_message(item, msg["filter_id"], "msg", f"\tArguments: <b>{msg['args']}</b>")
+            self._add_event_message(
                 item, msg["filter_id"], "msg_warning", "\tExecution is in progress. See messages below (stdout&stderr)"
             )
 
@@ -205,31 +321,32 @@ class SpineEngineWorker(QObject):
                 f"\tUnable to find specification for {language} kernel <b>{msg['kernel_name']}</b>. "
                 f"Go to Settings->Tools to select a valid {language} kernel."
             )
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "execution_failed_to_start":
             msg_text = f"\tExecution on {language} kernel <b>{msg['kernel_name']}</b> failed to start: {msg['error']}"
-            self._event_message_arrived.emit(item, msg["filter_id"], "msg_error", msg_text)
+            self._add_event_message(item, msg["filter_id"], "msg_error", msg_text)
         elif msg["type"] == "execution_started":
-            self._event_message_arrived.emit(
+            self._add_event_message(
                 item, msg["filter_id"], "msg", f"\tStarting program on {language} kernel <b>{msg['kernel_name']}</b>"
             )
-            self._event_message_arrived.emit(
-                item, msg["filter_id"], "msg_warning", f"See {language} Console for messages."
-            )
+            self._add_event_message(item, msg["filter_id"], "msg_warning", f"See {language} Console for messages.")
+
+    def _add_event_message(self, item, filter_id, msg_type, msg_text):
+        self._message_batcher.add((item, filter_id, False, msg_type, msg_text))
 
     def _handle_process_msg(self, data):
         self._do_handle_process_msg(**data)
 
     def _do_handle_process_msg(self, item_name, filter_id, msg_type, msg_text):
         item = self._project_items[item_name]
-        self._process_message_arrived.emit(item, filter_id, msg_type, msg_text)
+        self._message_batcher.add((item, filter_id, True, msg_type, msg_text))
 
     def _handle_event_msg(self, data):
         self._do_handle_event_msg(**data)
 
     def _do_handle_event_msg(self, item_name, filter_id, msg_type, msg_text):
         item = self._project_items[item_name]
-        self._event_message_arrived.emit(item, filter_id, msg_type, msg_text)
+        self._add_event_message(item, filter_id, msg_type, msg_text)
 
     def _handle_node_execution_started(self, data):
         self._do_handle_node_execution_started(**data)
@@ -238,7 +355,7 @@ class SpineEngineWorker(QObject):
         """Starts item icon animation when executing forward."""
         item = self._project_items[item_name]
         self._executing_items.append(item)
-        self._node_execution_started.emit(item, direction)
+        self._message_batcher.add_emission(self._node_execution_started, item, direction)
 
     def _handle_node_execution_finished(self, data):
         self._do_handle_node_execution_finished(**data)
@@ -248,12 +365,15 @@ class SpineEngineWorker(QObject):
         if success and not skipped:
             self.successful_executions.append((item, direction, state))
         self._executing_items.remove(item)
-        self._node_execution_finished.emit(item, direction, state, success, skipped)
+        self._message_batcher.add_emission(self._node_execution_finished, item, direction, state, success, skipped)
 
     def clean_up(self):
+        self._message_batcher.flush()
         for item in self._executing_items:
             self._node_execution_finished.emit(item, None, None, False, False)
         self._thread.quit()
         self._thread.wait()
+        self._engine_mngr.close()
+        self._message_batcher.deleteLater()
         self._thread.deleteLater()
         self.deleteLater()
@@ -606,6 +606,11 @@ class Ui_SettingsForm(object):
 
         self.verticalLayout_4.addWidget(self.checkBox_auto_expand_objects)
 
+        self.checkBox_use_db_snapshots = QCheckBox(self.groupBox_data_store)
+        self.checkBox_use_db_snapshots.setObjectName(u"checkBox_use_db_snapshots")
+
+        self.verticalLayout_4.addWidget(self.checkBox_use_db_snapshots)
+
 
         self.verticalLayout_9.addWidget(self.groupBox_data_store)
 
@@ -666,7 +671,8 @@ class Ui_SettingsForm(object):
         QWidget.setTabOrder(self.checkBox_relationship_items_follow, self.checkBox_smooth_entity_graph_zoom)
         QWidget.setTabOrder(self.checkBox_smooth_entity_graph_zoom, self.checkBox_smooth_entity_graph_rotation)
         QWidget.setTabOrder(self.checkBox_smooth_entity_graph_rotation, self.checkBox_auto_expand_objects)
-        QWidget.setTabOrder(self.checkBox_auto_expand_objects, self.listWidget)
+        QWidget.setTabOrder(self.checkBox_auto_expand_objects, self.checkBox_use_db_snapshots)
+        QWidget.setTabOrder(self.checkBox_use_db_snapshots, self.listWidget)
 
         self.retranslateUi(SettingsForm)
         self.listWidget.currentRowChanged.connect(self.stackedWidget.setCurrentIndex)
@@ -843,5 +849,9 @@ class Ui_SettingsForm(object):
         self.checkBox_auto_expand_objects.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p><span style=\" font-weight:600;\">Checked</span>: Whenever an object is included in the Entity graph, the graph automatically includes <span style=\" font-style:italic;\">all</span> its relationships.</p><p><span style=\" font-weight:600;\">Unchecked</span>: Whenever <span style=\" font-style:italic;\">all</span> the objects in a relationship are included in the Entity graph, the graph automatically includes the relationship.</p><p>Note: This setting is a global default, but can be locally overriden in every Spine DB editor session.</p></body></html>", None))
 #endif // QT_CONFIG(tooltip)
         self.checkBox_auto_expand_objects.setText(QCoreApplication.translate("SettingsForm", u"Auto-expand objects by default in Entity graph", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_use_db_snapshots.setToolTip(QCoreApplication.translate("SettingsForm", u"<html><head/><body><p>When checked, the contents of databases are stored on disk after fetching them in full, and loaded from there the next time if the database has not changed since.</p></body></html>", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_use_db_snapshots.setText(QCoreApplication.translate("SettingsForm", u"Keep database snapshots on disk for faster loading", None))
     # retranslateUi
 
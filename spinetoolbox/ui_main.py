@@ -2312,7 +2312,10 @@ class ToolboxUI(QMainWindow):
         """Shuts down all kernels managed by Spine Engine."""
         engine_server_address = self.qsettings().value("appSettings/engineServerAddress", defaultValue="")
         engine_mngr = make_engine_manager(engine_server_address)
-        while self._extra_consoles:
-            connection_file, console = self._extra_consoles.popitem()
-            engine_mngr.shutdown_kernel(connection_file)
-            console.deleteLater()
+        try:
+            while self._extra_consoles:
+                connection_file, console = self._extra_consoles.popitem()
+                engine_mngr.shutdown_kernel(connection_file)
+                console.deleteLater()
+        finally:
+            engine_mngr.close()
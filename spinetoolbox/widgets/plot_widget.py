@@ -36,6 +36,9 @@ class PlotWidget(QWidget):
     plot_windows = dict()
     """A global list of plot windows."""
 
+    _MIN_DECIMATION_BUCKET_COUNT = 100
+    """Minimum number of buckets lines are decimated to, regardless of the plot's width."""
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.plot_type = None
@@ -44,8 +47,55 @@ class PlotWidget(QWidget):
         self._toolbar = NavigationToolBar(self.canvas, self)
         self._layout.addWidget(self._toolbar)
         self._layout.addWidget(self.canvas)
+        self._decimated_lines = list()
+        self._decimation_callbacks = None
+        self.canvas.mpl_connect("resize_event", self._update_decimated_lines_on_resize)
         QMetaObject.connectSlotsByName(self)
 
+    def decimation_bucket_count(self):
+        """Returns the number of buckets to decimate lines to.
+
+        Returns:
+            int: bucket count
+        """
+        return max(self._MIN_DECIMATION_BUCKET_COUNT, round(self.canvas.axes.bbox.width))
+
+    def add_decimated_line(self, decimated_line):
+        """Registers a decimated line so it gets redecimated to the visible range when the plot is zoomed or panned.
+
+        Args:
+            decimated_line (DecimatedLine): a line and its full resolution data
+        """
+        axes = self.canvas.axes
+        lines = axes.get_lines()
+        self._decimated_lines = [line for line in self._decimated_lines if line.line in lines]
+        if axes.callbacks is not self._decimation_callbacks:
+            # Clearing the axes replaces the callback registry.
+            axes.callbacks.connect("xlim_changed", self._update_decimated_lines)
+            self._decimation_callbacks = axes.callbacks
+        self._decimated_lines.append(decimated_line)
+
+    def _update_decimated_lines_on_resize(self, event):
+        """Redecimates lines to the new plot width.
+
+        Args:
+            event (ResizeEvent): resize event
+        """
+        self._update_decimated_lines(self.canvas.axes)
+
+    def _update_decimated_lines(self, axes):
+        """Redecimates lines to the visible x range.
+
+        Args:
+            axes (Axes): plot's axes
+        """
+        if not self._decimated_lines:
+            return
+        x_min, x_max = axes.get_xlim()
+        bucket_count = self.decimation_bucket_count()
+        for decimated_line in self._decimated_lines:
+            decimated_line.update(x_min, x_max, bucket_count)
+
     def closeEvent(self, event):
         """Removes the window from plot_windows and closes."""
         for name, widget in PlotWidget.plot_windows.items():
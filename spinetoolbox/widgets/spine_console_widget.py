@@ -99,7 +99,10 @@ class SpineConsoleWidget(RichJupyterWidget):
             self._kernel_starting = True  # This flag is unset when a correct msg is received from iopub_channel
             engine_server_address = self._toolbox.qsettings().value("appSettings/engineServerAddress", defaultValue="")
             engine_mngr = make_engine_manager(engine_server_address)
-            engine_mngr.restart_kernel(self._engine_connection_file)
+            try:
+                engine_mngr.restart_kernel(self._engine_connection_file)
+            finally:
+                engine_mngr.close()
             self._replace_client()
             return
         if self._name == "Python Console":
@@ -0,0 +1,97 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks refreshing the cache after pasting parameter values,
+by querying the written values back and by building them from the cache.
+
+:date:   18.10.2026
+"""
+
+import sys
+import time
+from PySide2.QtWidgets import QApplication
+from spinedb_api import DiffDatabaseMapping, import_functions, to_database
+from spinetoolbox.spine_db_manager import SpineDBManager
+
+
+def _make_db_map(object_count, parameter_count):
+    db_map = DiffDatabaseMapping("sqlite://", create=True)
+    import_functions.import_object_classes(db_map, ("unit",))
+    import_functions.import_objects(db_map, (("unit", f"unit_{i}") for i in range(object_count)))
+    import_functions.import_object_parameters(db_map, (("unit", f"parameter_{i}") for i in range(parameter_count)))
+    db_map.commit_session("Add test data.")
+    return db_map
+
+
+def _cache_lookups(db_mngr, db_map):
+    getters = {
+        "object_class": db_mngr.get_object_classes,
+        "object": db_mngr.get_objects,
+        "parameter_definition": db_mngr.get_parameter_definitions,
+        "alternative": db_mngr.get_alternatives,
+    }
+    for item_type, getter in getters.items():
+        for chunk in getter(db_map):
+            db_mngr.cache_items(item_type, {db_map: chunk})
+
+
+def _value_columns(value):
+    """Returns the value columns of a parameter value.
+    Newer spinedb_api versions store the value's type in a column of its own."""
+    db_value = to_database(value)
+    if isinstance(db_value, tuple):
+        value, value_type = db_value
+        return {"value": value, "type": value_type}
+    return {"value": db_value}
+
+
+def _pasted_values(db_mngr, db_map):
+    class_id = db_mngr.get_items(db_map, "object_class")[0]["id"]
+    alternative_id = db_mngr.get_items(db_map, "alternative")[0]["id"]
+    return [
+        {
+            "entity_class_id": class_id,
+            "entity_id": entity["id"],
+            "parameter_definition_id": definition["id"],
+            "alternative_id": alternative_id,
+            **_value_columns(float(entity["id"] * definition["id"])),
+        }
+        for entity in db_mngr.get_items(db_map, "object")
+        for definition in db_mngr.get_items(db_map, "parameter_definition")
+    ]
+
+
+def run(object_count=500, parameter_count=100):
+    app = QApplication.instance() or QApplication()
+    db_mngr = SpineDBManager(app, None)
+    db_map = _make_db_map(object_count, parameter_count)
+    _cache_lookups(db_mngr, db_map)
+    print(f"{object_count * parameter_count} pasted parameter values")
+    for write_through in (False, True):
+        items = _pasted_values(db_mngr, db_map)
+        ids, errors = db_map.add_checked_parameter_values(*items)
+        start = time.perf_counter()
+        if write_through:
+            written = db_mngr._worker._make_written_items(db_map, items, ids, "get_parameter_values")
+            if written is None:
+                raise RuntimeError("write-through fell back to querying")
+        else:
+            written = [item for chunk in db_mngr.get_parameter_values(db_map, ids=ids) for item in chunk]
+        elapsed = time.perf_counter() - start
+        print(f"  {'write-through' if write_through else 're-query':<14} {elapsed:6.2f} s for {len(written)} items")
+        db_map.rollback_session()
+    db_map.connection.close()
+    db_mngr.clean_up()
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,83 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks the memory taken by cached parameter values stored as dicts vs. CacheItems.
+
+:date:   18.10.2026
+"""
+
+import sys
+import tracemalloc
+from spinetoolbox.spine_db_cache import CacheItem
+
+_COLUMNS = (
+    "id",
+    "entity_class_id",
+    "object_class_id",
+    "object_class_name",
+    "entity_id",
+    "object_id",
+    "object_name",
+    "parameter_id",
+    "parameter_name",
+    "alternative_id",
+    "alternative_name",
+    "value",
+)
+
+
+def _rows(count):
+    """Yields rows resembling those of object_parameter_value_sq. Strings are shared, like in real query results
+    where class, parameter and alternative names repeat."""
+    class_names = [f"class_{k}" for k in range(10)]
+    parameter_names = [f"parameter_{k}" for k in range(50)]
+    alternative_names = ["Base", "alt"]
+    for id_ in range(1, count + 1):
+        class_id = id_ % 10
+        parameter_id = id_ % 50
+        alternative_id = id_ % 2
+        entity_id = id_ // 100
+        yield (
+            id_,
+            class_id,
+            class_id,
+            class_names[class_id],
+            entity_id,
+            entity_id,
+            "",
+            parameter_id,
+            parameter_names[parameter_id],
+            alternative_id,
+            alternative_names[alternative_id],
+            "",
+        )
+
+
+def _measure(count, make_item):
+    tracemalloc.start()
+    items = [make_item(row) for row in _rows(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return size
+
+
+def run(count=1000000):
+    dict_size = _measure(count, lambda row: dict(zip(_COLUMNS, row)))
+    item_size = _measure(count, lambda row: CacheItem(_COLUMNS, row))
+    print(f"{count} parameter values, {len(_COLUMNS)} columns, Python {sys.version.split()[0]}")
+    print(f"  dict:      {dict_size / count:7.1f} bytes per row")
+    print(f"  CacheItem: {item_size / count:7.1f} bytes per row ({100 * (1 - item_size / dict_size):.0f}% less)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,131 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks how fast SpineEngineWorker delivers engine log messages to an item's log, with and without batching.
+
+:date:   18.10.2026
+"""
+
+import time
+from unittest import mock
+from PySide2.QtCore import QEvent, Signal
+from PySide2.QtWidgets import QApplication, QTextBrowser
+from spinetoolbox.helpers import add_messages_to_document
+from spinetoolbox.spine_engine_manager import SpineEngineManagerBase
+from spinetoolbox.spine_engine_worker import SpineEngineWorker, _MessageBatcher
+
+
+class _FakeEngineManager(SpineEngineManagerBase):
+    """Emits process messages as fast as the worker asks for them."""
+
+    def __init__(self, message_count):
+        self._events = iter(
+            [("exec_started", {"item_name": "tool", "direction": "FORWARD"})]
+            + [
+                ("process_msg", {"item_name": "tool", "filter_id": "", "msg_type": "msg", "msg_text": f"line {i}"})
+                for i in range(message_count)
+            ]
+            + [
+                (
+                    "exec_finished",
+                    {"item_name": "tool", "direction": "FORWARD", "state": "RUNNING", "success": True, "skipped": True},
+                ),
+                ("dag_exec_finished", "COMPLETED"),
+            ]
+        )
+
+    def run_engine(self, engine_data):
+        pass
+
+    def get_engine_event(self):
+        return next(self._events)
+
+    def stop_engine(self):
+        pass
+
+
+class _UnbatchedRelay(_MessageBatcher):
+    """Delivers every message with its own queued signal, like the worker did before batching."""
+
+    _message_added = Signal(list)
+
+    def __init__(self, interval, max_size):
+        super().__init__(interval, max_size)
+        self._message_added.connect(self.messages_arrived)
+
+    def add(self, message):
+        self._message_added.emit([message])
+
+    def add_emission(self, signal, *args):
+        signal.emit(*args)
+
+
+class _FakeItem:
+    def __init__(self, log):
+        self._icon = mock.MagicMock()
+        self._log = log
+
+    def get_icon(self):
+        return self._icon
+
+    def add_log_messages(self, filter_id, messages):
+        add_messages_to_document(self._log.document(), messages)
+
+
+def _execute(message_count, batched):
+    """Runs a fake engine through the worker.
+
+    Returns:
+        tuple: time until all messages are in the log, and the longest event loop iteration
+    """
+    app = QApplication.instance()
+    log = QTextBrowser()
+    log.resize(800, 600)
+    log.show()
+    items = {"tool": _FakeItem(log)}
+    with mock.patch(
+        "spinetoolbox.spine_engine_worker.make_engine_manager", return_value=_FakeEngineManager(message_count)
+    ), mock.patch("spinetoolbox.spine_engine_worker._MessageBatcher", _MessageBatcher if batched else _UnbatchedRelay):
+        worker = SpineEngineWorker("", {}, None, "dag", items)
+    finished = []
+    worker.finished.connect(lambda: finished.append(True))
+    start = time.perf_counter()
+    worker.start()
+    worst_stall = 0.0
+    while not finished:
+        iteration_start = time.perf_counter()
+        app.processEvents()
+        worst_stall = max(worst_stall, time.perf_counter() - iteration_start)
+    worker.clean_up()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    block_count = log.document().blockCount()
+    log.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    if block_count < message_count:
+        raise RuntimeError(f"log has {block_count} lines, expected {message_count}")
+    return elapsed, worst_stall
+
+
+def run(message_counts=(10000, 50000, 100000)):
+    app = QApplication.instance() or QApplication()
+    print(f"{'messages':>10} {'one per signal (s)':>26} {'batched (s)':>26}")
+    for message_count in message_counts:
+        cells = []
+        for batched in (False, True):
+            elapsed, worst_stall = _execute(message_count, batched)
+            cells.append(f"{elapsed:7.2f} (worst stall {worst_stall:5.2f})")
+        print(f"{message_count:>10} " + " ".join(f"{cell:>26}" for cell in cells))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,53 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks field lookups in SpineDBCache against scanning the item table.
+
+:date:   18.10.2026
+"""
+
+import random
+import timeit
+from spinetoolbox.spine_db_cache import SpineDBCache
+
+
+def _make_cache(db_map, object_count, class_count):
+    cache = SpineDBCache()
+    objects = [
+        {"id": id_, "class_id": id_ % class_count + 1, "name": f"object_{id_}", "description": None}
+        for id_ in range(1, object_count + 1)
+    ]
+    cache.add_items(db_map, "object", objects)
+    return cache
+
+
+def _scan(cache, db_map, field, value):
+    """The lookup SpineDBManager.get_items_by_field used to do."""
+    return [x for x in list(cache.table(db_map, "object").values()) if x.get(field) == value]
+
+
+def run(object_count=100000, class_count=10, lookup_count=100):
+    db_map = object()
+    cache = _make_cache(db_map, object_count, class_count)
+    names = [f"object_{random.randint(1, object_count)}" for _ in range(lookup_count)]
+    build_time = timeit.timeit(lambda: cache.find_items_by_field(db_map, "object", "name", names[0]), number=1)
+    scan_time = timeit.timeit(lambda: [_scan(cache, db_map, "name", name) for name in names], number=1)
+    index_time = timeit.timeit(
+        lambda: [cache.find_items_by_field(db_map, "object", "name", name) for name in names], number=1
+    )
+    print(f"{object_count} objects, {lookup_count} name lookups")
+    print(f"  scan:  {scan_time / lookup_count * 1e6:10.1f} us per lookup")
+    print(f"  index: {index_time / lookup_count * 1e6:10.1f} us per lookup (built once in {build_time * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,75 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks graph layout time against vertex count for the dense, the sparse and the multi-level layout generators.
+
+:date:   18.10.2026
+"""
+
+import random
+import timeit
+from spinetoolbox.spine_db_editor.widgets.graph_layout_generator import (
+    GraphLayoutGenerator,
+    MultilevelGraphLayoutGenerator,
+    SparseGraphLayoutGenerator,
+)
+
+
+def make_graph(vertex_count, seed=0):
+    """Returns a synthetic entity graph where half of the vertices are objects and the other half
+    are two-dimensional relationships between random objects.
+
+    Args:
+        vertex_count (int): total number of vertices
+        seed (int): random seed
+
+    Returns:
+        tuple: source and destination vertex indices
+    """
+    rng = random.Random(seed)
+    object_count = vertex_count // 2
+    src_inds = []
+    dst_inds = []
+    for relationship_ind in range(object_count, vertex_count):
+        for object_ind in rng.sample(range(object_count), 2):
+            src_inds.append(relationship_ind)
+            dst_inds.append(object_ind)
+    return src_inds, dst_inds
+
+
+def _layout_time(generator_class, vertex_count):
+    src_inds, dst_inds = make_graph(vertex_count)
+    layout_gen = generator_class(None, vertex_count, src_inds, dst_inds, spread=3.0)
+    return timeit.timeit(layout_gen.run, number=1)
+
+
+def run(
+    dense_counts=(250, 500, 1000, 2000),
+    sparse_counts=(250, 500, 1000, 2000, 5000, 10000, 20000),
+    multilevel_counts=(5000, 10000, 20000, 50000),
+):
+    generators = (
+        ("dense", GraphLayoutGenerator, dense_counts),
+        ("sparse", SparseGraphLayoutGenerator, sparse_counts),
+        ("multilevel", MultilevelGraphLayoutGenerator, multilevel_counts),
+    )
+    print(f"{'vertices':>10}" + "".join(f" {name + ' (s)':>15}" for name, _, _ in generators))
+    for vertex_count in sorted(set(dense_counts) | set(sparse_counts) | set(multilevel_counts)):
+        times = (
+            f" {_layout_time(generator_class, vertex_count):15.2f}" if vertex_count in counts else " " * 16
+            for _, generator_class, counts in generators
+        )
+        print(f"{vertex_count:>10}" + "".join(times))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,135 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks frame times of the Entity graph view on a synthetic scene, with and without level-of-detail rendering.
+
+:date:   18.10.2026
+"""
+
+import os
+import random
+import time
+from unittest import mock
+from PySide2.QtCore import QPointF
+from PySide2.QtGui import QImage, QPainter
+from PySide2.QtSvg import QSvgRenderer
+from PySide2.QtWidgets import QApplication
+import spinetoolbox
+from spinetoolbox.spine_db_icon_manager import SpineDBIconManager
+from spinetoolbox.widgets.custom_qgraphicsscene import CustomGraphicsScene
+from spinetoolbox.spine_db_editor.graphics_items import ArcBatchItem, ArcItem, EntityItem, ObjectItem, RelationshipItem
+from spinetoolbox.spine_db_editor.widgets.custom_qgraphicsviews import EntityQGraphicsView
+from spinetoolbox.spine_db_editor.widgets.graph_view_mixin import GraphViewMixin
+from tests.benchmarks.graph_layout_benchmark import make_graph
+
+
+def _make_spine_db_editor():
+    renderer = QSvgRenderer(os.path.join(os.path.dirname(spinetoolbox.__file__), "ui", "resources", "database.svg"))
+    spine_db_editor = mock.MagicMock()
+    spine_db_editor.db_mngr.entity_class_renderer.return_value = renderer
+    spine_db_editor.db_mngr.get_icon_mngr.return_value = SpineDBIconManager()
+    spine_db_editor.db_mngr._GROUP_SEP = " ǀ "
+    spine_db_editor.db_mngr.get_item.side_effect = lambda db_map, item_type, id_: {
+        "name": f"{item_type}_{id_}",
+        "class_id": 1,
+        "class_name": f"{item_type}_class",
+        "object_name_list": "a,b",
+    }
+    return spine_db_editor
+
+
+def _make_scene(spine_db_editor, vertex_count, level_of_detail):
+    src_inds, dst_inds = make_graph(vertex_count)
+    object_count = vertex_count // 2
+    side = vertex_count ** 0.5 * GraphViewMixin._ARC_LENGTH_HINT
+    rng = random.Random(0)
+    db_map = mock.MagicMock()
+    scene = CustomGraphicsScene()
+    object_items = [
+        ObjectItem(spine_db_editor, rng.random() * side, rng.random() * side, GraphViewMixin.VERTEX_EXTENT, (db_map, i))
+        for i in range(object_count)
+    ]
+    relationship_items = [
+        RelationshipItem(
+            spine_db_editor, rng.random() * side, rng.random() * side, 0.5 * GraphViewMixin.VERTEX_EXTENT, (db_map, i)
+        )
+        for i in range(object_count, vertex_count)
+    ]
+    arc_items = [
+        ArcItem(relationship_items[rel_ind - object_count], object_items[obj_ind], GraphViewMixin._ARC_WIDTH)
+        for rel_ind, obj_ind in zip(src_inds, dst_inds)
+    ]
+    for item in object_items + relationship_items + arc_items:
+        scene.addItem(item)
+    if level_of_detail:
+        scene.addItem(ArcBatchItem(arc_items, GraphViewMixin._ARC_WIDTH))
+    else:
+        for item in object_items + relationship_items:
+            item.set_icon_cached(False)
+    return scene
+
+
+def _frame_times(view, zoom, frame_count):
+    """Pans the view across the scene at given zoom and returns the mean and the worst frame time."""
+    view.resetTransform()
+    view.scale(zoom, zoom)
+    view.apply_zoom()
+    image = QImage(view.viewport().size(), QImage.Format_ARGB32_Premultiplied)
+    scene_rect = view.scene().itemsBoundingRect()
+    # The first frame after zooming pays for updating the scene index, it is not a panning frame
+    painter = QPainter(image)
+    view.render(painter)
+    painter.end()
+    times = []
+    for frame in range(frame_count):
+        t = frame / max(1, frame_count - 1)
+        view.centerOn(QPointF(scene_rect.left() + t * scene_rect.width(), scene_rect.center().y()))
+        start = time.perf_counter()
+        painter = QPainter(image)
+        view.render(painter)
+        painter.end()
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times), max(times)
+
+
+def run(vertex_count=10000, zooms=(0.05, 0.1, 0.2, 0.5, 1.0), frame_count=20):
+    app = QApplication.instance() or QApplication()
+    spine_db_editor = _make_spine_db_editor()
+    default_thresholds = (EntityItem._DOT_MAX_EXTENT, ObjectItem._LABEL_MIN_EXTENT, ArcBatchItem._MAX_WIDTH)
+    print(f"{vertex_count} vertices, {frame_count} frames per zoom level")
+    print(f"{'zoom':>6} {'full detail (ms)':>24} {'level of detail (ms)':>24}")
+    results = {}
+    for level_of_detail in (False, True):
+        if level_of_detail:
+            EntityItem._DOT_MAX_EXTENT, ObjectItem._LABEL_MIN_EXTENT, ArcBatchItem._MAX_WIDTH = default_thresholds
+        else:
+            EntityItem._DOT_MAX_EXTENT, ObjectItem._LABEL_MIN_EXTENT, ArcBatchItem._MAX_WIDTH = 0, 0, 0
+        scene = _make_scene(spine_db_editor, vertex_count, level_of_detail)
+        view = EntityQGraphicsView(None)
+        view.setScene(scene)
+        view.resize(1280, 800)
+        for zoom in zooms:
+            results[level_of_detail, zoom] = _frame_times(view, zoom, frame_count)
+        view.deleteLater()
+        scene.deleteLater()
+        app.processEvents()
+    EntityItem._DOT_MAX_EXTENT, ObjectItem._LABEL_MIN_EXTENT, ArcBatchItem._MAX_WIDTH = default_thresholds
+    for zoom in zooms:
+        cells = []
+        for level_of_detail in (False, True):
+            mean, worst = results[level_of_detail, zoom]
+            cells.append(f"{mean * 1e3:9.1f} (worst {worst * 1e3:6.1f})")
+        print(f"{zoom:>6} " + " ".join(f"{cell:>24}" for cell in cells))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,88 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Benchmarks exporting a database to JSON,
+by building the document as one string and by streaming it table by table.
+
+:date:   18.10.2026
+"""
+
+import json
+import os.path
+import sys
+from tempfile import TemporaryDirectory
+import time
+import tracemalloc
+from unittest import mock
+from spinedb_api import DiffDatabaseMapping, ParameterValueEncoder, export_data, import_functions
+from spinetoolbox.spine_db_worker import SpineDBWorker, _JSON_EXPORT_ORDER
+
+
+def _make_db_map(file_path, object_count, parameter_count):
+    db_map = DiffDatabaseMapping("sqlite:///" + file_path, create=True)
+    import_functions.import_object_classes(db_map, ("unit",))
+    import_functions.import_objects(db_map, (("unit", f"unit_{i}") for i in range(object_count)))
+    import_functions.import_object_parameters(db_map, (("unit", f"parameter_{i}") for i in range(parameter_count)))
+    for i in range(object_count):
+        import_functions.import_object_parameter_values(
+            db_map, (("unit", f"unit_{i}", f"parameter_{j}", float(i * j)) for j in range(parameter_count))
+        )
+    db_map.commit_session("Add test data.")
+    return db_map
+
+
+def _export_in_one_string(file_path, db_map):
+    """Exports the way the worker did before streaming."""
+    data = export_data(db_map)
+    indent = 4 * " "
+    json_data = "{{{0}{1}{0}}}".format(
+        "\n" if data else "",
+        ",\n".join(
+            [
+                indent
+                + json.dumps(key)
+                + ": [{0}{1}{0}]".format(
+                    "\n" + indent if values else "",
+                    (",\n" + indent).join([indent + json.dumps(value, cls=ParameterValueEncoder) for value in values]),
+                )
+                for key, values in data.items()
+            ]
+        ),
+    )
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(json_data)
+
+
+def _export_streaming(file_path, db_map):
+    tables = SpineDBWorker._export_tables({db_map: {}}, _JSON_EXPORT_ORDER)
+    SpineDBWorker.export_to_json(None, file_path, tables, mock.MagicMock())
+
+
+def run(object_count=20000, parameter_count=100):
+    with TemporaryDirectory() as temp_dir:
+        db_map = _make_db_map(os.path.join(temp_dir, "db.sqlite"), object_count, parameter_count)
+        print(f"{object_count * parameter_count} parameter values")
+        for name, export in (("one string", _export_in_one_string), ("streaming", _export_streaming)):
+            file_path = os.path.join(temp_dir, name.replace(" ", "_") + ".json")
+            tracemalloc.start()
+            start = time.perf_counter()
+            export(file_path, db_map)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            size = os.path.getsize(file_path)
+            print(f"  {name:<10} {elapsed:6.2f} s, peak {peak / 2**20:8.1f} MiB, file {size / 2**20:8.1f} MiB")
+        db_map.connection.close()
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:]))
@@ -152,6 +152,37 @@ class TestPivotModel(unittest.TestCase):
         index_header_values = model._get_unique_index_values(('test1', 'test2'))
         self.assertEqual(index_header_values, index_set)
 
+    def test_add_to_model_appends_new_headers(self):
+        model = PivotModel()
+        model.reset_model({}, self.index_ids, ('test1',), ('test2',), ('test3',), (5,))
+        self.assertEqual(model.add_to_model(self.data), (2, 2))
+        self.assertEqual(model.rows, [('d',), ('e',)])
+        self.assertEqual(model.columns, [('dd',), ('ee',)])
+        self.assertEqual(model.add_to_model({('f', 'dd', 5): 'value_f_dd_5', ('g', 'gg', 1): 'value_g_gg_1'}), (1, 0))
+        self.assertEqual(model.rows, [('d',), ('e',), ('f',)])
+        self.assertEqual(list(model.index_values['test1']), ['a', 'b', 'c', 'd', 'e', 'f', 'g'])
+        self.assertEqual(model.frozen_values(('test3',)), [(1,), (2,), (3,), (4,), (5,)])
+
+    def test_remove_from_model_drops_headers_that_are_no_longer_referenced(self):
+        model = PivotModel()
+        model.reset_model(dict(self.data), self.index_ids, ('test1',), ('test2',), ('test3',), (5,))
+        self.assertEqual(model.remove_from_model({('a', 'aa', 1): None, ('d', 'dd', 5): None}), (1, 1))
+        self.assertEqual(model.rows, [('e',)])
+        self.assertEqual(model.columns, [('ee',)])
+        self.assertEqual(list(model.index_values['test1']), ['a', 'b', 'c', 'e'])
+        self.assertEqual(list(model.index_values['test2']), ['bb', 'cc', 'ee'])
+        self.assertEqual(model.frozen_values(('test3',)), [(2,), (3,), (4,), (5,)])
+
+    def test_incremental_headers_match_full_rebuild(self):
+        model = PivotModel()
+        model.reset_model({}, self.index_ids, ('test1', 'test2'), ('test3',))
+        model.add_to_model(dict(list(self.data.items())[:3]))
+        model.add_to_model(dict(list(self.data.items())[3:]))
+        model.remove_from_model({('b', 'cc', 3): None})
+        model.add_to_model({('b', 'cc', 3): 'value_b_cc_3'})
+        self.assertEqual(model.rows, model._get_unique_index_values(('test1', 'test2')))
+        self.assertEqual(model.columns, model._get_unique_index_values(('test3',)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -19,6 +19,7 @@ import os.path
 from tempfile import TemporaryDirectory
 import unittest
 from unittest.mock import MagicMock, PropertyMock, patch
+from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QApplication
 from spinedb_api import (
     DiffDatabaseMapping,
@@ -28,6 +29,7 @@ from spinedb_api import (
     import_object_parameter_values,
     Map,
 )
+from spinetoolbox.mvcmodels.shared import PARSED_ROLE
 from spinetoolbox.spine_db_manager import SpineDBManager
 from spinetoolbox.spine_db_editor.widgets.spine_db_editor import SpineDBEditor
 
@@ -116,6 +118,13 @@ class TestParameterValuePivotTableModel(unittest.TestCase):
     def test_header_row_count(self):
         self.assertEqual(self._model.headerRowCount(), 2)
 
+    def test_column_data_matches_data(self):
+        rows = range(self._model.rowCount())
+        for column in range(self._model.columnCount()):
+            for role in (Qt.DisplayRole, PARSED_ROLE):
+                expected = [self._model.index(row, column).data(role) for row in rows]
+                self.assertEqual(self._model.column_data(column, rows, role), expected)
+
 
 class TestIndexExpansionPivotTableModel(unittest.TestCase):
     @classmethod
@@ -185,6 +194,13 @@ class TestIndexExpansionPivotTableModel(unittest.TestCase):
         ]
         self.assertEqual(model_data, expected)
 
+    def test_column_data_matches_data(self):
+        rows = [3, 2, 5, 9, 10]
+        for column in range(self._model.columnCount()):
+            for role in (Qt.DisplayRole, PARSED_ROLE):
+                expected = [self._model.index(row, column).data(role) for row in rows]
+                self.assertEqual(self._model.column_data(column, rows, role), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
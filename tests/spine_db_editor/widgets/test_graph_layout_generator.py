@@ -0,0 +1,233 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the ``graph_layout_generator`` module.
+
+:date:   18.10.2026
+"""
+
+import unittest
+import numpy as np
+from spinetoolbox.spine_db_editor.widgets.graph_layout_generator import (
+    GraphLayoutGenerator,
+    HeatMapGenerator,
+    HeatMapTriangulations,
+    IncrementalGraphLayoutGenerator,
+    MultilevelGraphLayoutGenerator,
+    SparseGraphLayoutGenerator,
+    MULTILEVEL_LAYOUT_THRESHOLD,
+    SPARSE_LAYOUT_THRESHOLD,
+    make_heat_map,
+    make_layout_generator,
+)
+
+
+class TestSparseGraphLayoutGenerator(unittest.TestCase):
+    def test_make_layout_generator_picks_sparse_generator_for_big_graphs(self):
+        self.assertIs(type(make_layout_generator(None, SPARSE_LAYOUT_THRESHOLD)), GraphLayoutGenerator)
+        self.assertIs(type(make_layout_generator(None, SPARSE_LAYOUT_THRESHOLD + 1)), SparseGraphLayoutGenerator)
+        layout_gen = make_layout_generator(None, MULTILEVEL_LAYOUT_THRESHOLD + 1)
+        self.assertIs(type(layout_gen), MultilevelGraphLayoutGenerator)
+
+    def test_path_graph_layout_preserves_graph_distances(self):
+        vertex_count = 40
+        src_inds = list(range(vertex_count - 1))
+        dst_inds = list(range(1, vertex_count))
+        layout_gen = SparseGraphLayoutGenerator(None, vertex_count, src_inds, dst_inds, spread=2.0, pivot_count=5)
+        layouts = []
+        layout_gen.layout_available.connect(lambda id_, x, y: layouts.append((x, y)))
+        layout_gen.run()
+        self.assertEqual(len(layouts), 1)
+        x, y = layouts[0]
+        self.assertEqual(len(x), vertex_count)
+        edge_lengths = np.hypot(np.diff(x), np.diff(y))
+        self.assertAlmostEqual(float(np.median(edge_lengths)), 2.0, delta=0.5)
+        self.assertGreater(np.hypot(x[-1] - x[0], y[-1] - y[0]), 0.8 * 2.0 * (vertex_count - 1))
+
+    def test_heavy_positions_and_disconnected_vertices(self):
+        heavy_positions = {0: {"x": 10.0, "y": -5.0}}
+        layout_gen = SparseGraphLayoutGenerator(None, 6, [0, 1], [1, 2], spread=1.0, heavy_positions=heavy_positions)
+        layout_gen.run()
+        self.assertEqual((layout_gen.x[0], layout_gen.y[0]), (10.0, -5.0))
+        self.assertTrue(np.all(np.isfinite(layout_gen.x)) and np.all(np.isfinite(layout_gen.y)))
+
+    def test_disconnected_components_are_laid_out_apart(self):
+        # 500 isolated vertices, 500 disjoint pairs and a path of 100 vertices
+        pair_src = list(range(500, 1500, 2))
+        pair_dst = list(range(501, 1500, 2))
+        path_src = list(range(1500, 1599))
+        path_dst = list(range(1501, 1600))
+        layout_gen = SparseGraphLayoutGenerator(
+            None, 1600, pair_src + path_src, pair_dst + path_dst, spread=2.0, pivot_count=10
+        )
+        messages = []
+        layout_gen.msg.connect(messages.append)
+        layout_gen.run()
+        self.assertEqual(messages[0], "Laying out 1001 connected components...")
+        x, y = layout_gen.x, layout_gen.y
+        components = [[ind] for ind in range(500)]
+        components += [[src, dst] for src, dst in zip(pair_src, pair_dst)]
+        components.append(list(range(1500, 1600)))
+        assert_components_are_apart(self, x, y, components)
+        pair_lengths = np.hypot(x[pair_src] - x[pair_dst], y[pair_src] - y[pair_dst])
+        np.testing.assert_allclose(pair_lengths, 2.0, rtol=0.1)
+        path_lengths = np.hypot(x[path_src] - x[path_dst], y[path_src] - y[path_dst])
+        self.assertAlmostEqual(float(np.median(path_lengths)), 2.0, delta=0.5)
+
+    def test_components_without_heavy_vertices_are_packed_beside_the_ones_with_them(self):
+        heavy_positions = {0: {"x": 10.0, "y": -5.0}, 1: {"x": 12.0, "y": -5.0}}
+        layout_gen = SparseGraphLayoutGenerator(None, 5, [0, 2], [1, 3], spread=1.0, heavy_positions=heavy_positions)
+        layout_gen.run()
+        self.assertEqual(list(zip(layout_gen.x[:2], layout_gen.y[:2])), [(10.0, -5.0), (12.0, -5.0)])
+        self.assertTrue(np.all(layout_gen.x[2:] >= 13.0))
+        assert_components_are_apart(self, layout_gen.x, layout_gen.y, [[0, 1], [2, 3], [4]])
+
+
+def assert_components_are_apart(test_case, x, y, components):
+    """Asserts that the bounding boxes of components do not overlap."""
+    mins = np.array([(np.min(x[inds]), np.min(y[inds])) for inds in components])
+    maxs = np.array([(np.max(x[inds]), np.max(y[inds])) for inds in components])
+    overlaps = np.all((mins[:, None, :] <= maxs[None, :, :]) & (mins[None, :, :] <= maxs[:, None, :]), axis=2)
+    np.fill_diagonal(overlaps, False)
+    test_case.assertFalse(overlaps.any())
+
+
+class TestIncrementalGraphLayoutGenerator(unittest.TestCase):
+    def setUp(self):
+        # A path of 20 vertices along the x axis
+        self._src_inds = list(range(19))
+        self._dst_inds = list(range(1, 20))
+        self._initial_positions = {ind: {"x": 2.0 * ind, "y": 0.0} for ind in range(20)}
+
+    def test_make_layout_generator_picks_incremental_generator_when_most_vertices_are_placed(self):
+        layout_gen = make_layout_generator(None, 21, initial_positions=self._initial_positions)
+        self.assertIsInstance(layout_gen, IncrementalGraphLayoutGenerator)
+        layout_gen = make_layout_generator(None, 41, initial_positions=self._initial_positions)
+        self.assertIs(type(layout_gen), GraphLayoutGenerator)
+        self.assertEqual(layout_gen.heavy_positions, self._initial_positions)
+
+    def test_new_vertex_is_laid_out_next_to_its_neighbors_and_far_vertices_keep_their_positions(self):
+        src_inds = self._src_inds + [20, 20]
+        dst_inds = self._dst_inds + [9, 11]
+        layout_gen = make_layout_generator(
+            None, 21, src_inds, dst_inds, spread=2.0, initial_positions=self._initial_positions
+        )
+        layout_gen.run()
+        for ind in list(range(8)) + list(range(13, 20)):
+            self.assertEqual((layout_gen.x[ind], layout_gen.y[ind]), (2.0 * ind, 0.0))
+        self.assertAlmostEqual(layout_gen.x[20], 20.0, delta=2.0)
+        self.assertAlmostEqual(abs(layout_gen.y[20]), 2.0 * 3 ** 0.5 / 2, delta=1.0)
+
+    def test_no_new_vertices_keeps_layout(self):
+        layout_gen = IncrementalGraphLayoutGenerator(
+            None, 20, self._src_inds, self._dst_inds, spread=2.0, initial_positions=self._initial_positions
+        )
+        layout_gen.run()
+        self.assertEqual(list(layout_gen.x), [2.0 * ind for ind in range(20)])
+
+
+class TestMultilevelGraphLayoutGenerator(unittest.TestCase):
+    def setUp(self):
+        # A 30 x 30 grid of objects with a relationship between each pair of adjacent objects
+        side = 30
+        self._src_inds = []
+        self._dst_inds = []
+        self._vertex_count = side * side
+        for row in range(side):
+            for column in range(side):
+                for neighbor_row, neighbor_column in ((row + 1, column), (row, column + 1)):
+                    if neighbor_row < side and neighbor_column < side:
+                        self._src_inds += 2 * [self._vertex_count]
+                        self._dst_inds += [row * side + column, neighbor_row * side + neighbor_column]
+                        self._vertex_count += 1
+
+    def test_coarsening_shrinks_graph_level_by_level(self):
+        layout_gen = MultilevelGraphLayoutGenerator(
+            None, self._vertex_count, self._src_inds, self._dst_inds, spread=1.0, coarsest_vertex_count=100
+        )
+        levels = layout_gen.build_levels(layout_gen.adjacency_matrix())
+        self.assertGreater(len(levels), 2)
+        vertex_counts = [links.shape[0] for links, _, _ in levels]
+        self.assertEqual(vertex_counts[0], self._vertex_count)
+        self.assertEqual(vertex_counts, sorted(vertex_counts, reverse=True))
+        self.assertLessEqual(vertex_counts[-1], 100)
+        for links, weights, to_level in levels:
+            self.assertEqual(weights.sum(), self._vertex_count)
+            self.assertEqual(to_level.max() + 1, links.shape[0])
+
+    def test_grid_layout_keeps_edges_short_and_reports_levels(self):
+        layout_gen = MultilevelGraphLayoutGenerator(
+            None, self._vertex_count, self._src_inds, self._dst_inds, spread=1.0, coarsest_vertex_count=100
+        )
+        messages = []
+        layout_gen.msg.connect(messages.append)
+        layout_gen.run()
+        self.assertIn("Step 2 of 3: Coarsening graph...", messages)
+        self.assertTrue(any(message.startswith("Step 3 of 3: Laying out level") for message in messages))
+        x, y = layout_gen.x, layout_gen.y
+        src_inds, dst_inds = np.array(self._src_inds), np.array(self._dst_inds)
+        edge_lengths = np.hypot(x[src_inds] - x[dst_inds], y[src_inds] - y[dst_inds])
+        self.assertAlmostEqual(float(np.median(edge_lengths)), 1.0, delta=0.3)
+        first_corner, opposite_corner = 0, 30 * 30 - 1
+        diagonal = np.hypot(x[first_corner] - x[opposite_corner], y[first_corner] - y[opposite_corner])
+        self.assertGreater(diagonal, 0.7 * 2 * 29 * 2 ** 0.5)
+
+    def test_disconnected_graph_components_are_laid_out_apart(self):
+        # Two copies of the grid, then isolated vertices
+        src_inds = self._src_inds + [ind + self._vertex_count for ind in self._src_inds]
+        dst_inds = self._dst_inds + [ind + self._vertex_count for ind in self._dst_inds]
+        vertex_count = 2 * self._vertex_count + 100
+        self.assertGreater(vertex_count, MULTILEVEL_LAYOUT_THRESHOLD)
+        layout_gen = make_layout_generator(None, vertex_count, src_inds, dst_inds, spread=1.0)
+        self.assertIs(type(layout_gen), MultilevelGraphLayoutGenerator)
+        layout_gen.run()
+        x, y = layout_gen.x, layout_gen.y
+        components = [list(range(self._vertex_count)), list(range(self._vertex_count, 2 * self._vertex_count))]
+        components += [[ind] for ind in range(2 * self._vertex_count, vertex_count)]
+        assert_components_are_apart(self, x, y, components)
+        src_inds, dst_inds = np.array(src_inds), np.array(dst_inds)
+        edge_lengths = np.hypot(x[src_inds] - x[dst_inds], y[src_inds] - y[dst_inds])
+        self.assertAlmostEqual(float(np.median(edge_lengths)), 1.0, delta=0.3)
+
+
+class TestMakeHeatMap(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self._x = rng.random(300) * 200.0
+        self._y = rng.random(300) * 100.0
+
+    def test_grid_is_capped_by_tick_count_and_keeps_aspect_ratio(self):
+        values = 2.0 * self._x - self._y
+        heat_map, xv, yv, min_x, min_y, max_x, max_y = make_heat_map(self._x, self._y, values, max_tick_count=64)
+        self.assertEqual(heat_map.shape, (round(64 * (max_y - min_y) / (max_x - min_x)), 64))
+        self.assertEqual(xv.shape, heat_map.shape)
+        self.assertEqual(yv.shape, heat_map.shape)
+        inside = np.isfinite(heat_map)
+        self.assertGreater(np.count_nonzero(inside), 0.8 * heat_map.size)
+        np.testing.assert_allclose(heat_map[inside], 2.0 * xv[inside] - yv[inside], rtol=1e-4)
+
+    def test_triangulation_is_shared_by_parameters_on_same_points(self):
+        triangulations = HeatMapTriangulations()
+        triangulation = triangulations.get(self._x, self._y)
+        self.assertIs(triangulations.get(list(self._x), list(self._y)), triangulation)
+        self.assertIsNot(triangulations.get(self._x[1:], self._y[1:]), triangulation)
+
+    def test_heat_map_generator_reports_degenerate_points(self):
+        results = []
+        heat_map_gen = HeatMapGenerator("id", [0.0, 1.0, 2.0], [0.0, 1.0, 2.0], [1.0, 2.0, 3.0])
+        heat_map_gen.finished.connect(lambda id_, heat_map_data: results.append((id_, heat_map_data)))
+        heat_map_gen.run()
+        self.assertEqual(results, [("id", None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,10 +17,12 @@ Unit tests for the spine_db_manager module.
 """
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QApplication
 from spinedb_api import (
+    DiffDatabaseMapping,
+    import_functions,
     to_database,
     DateTime,
     Duration,
@@ -28,6 +30,7 @@ from spinedb_api import (
     TimeSeriesFixedResolution,
     TimeSeriesVariableResolution,
 )
+from spinetoolbox.spine_db_cache import CacheItem
 from spinetoolbox.spine_db_manager import SpineDBManager
 
 
@@ -169,5 +172,116 @@ class TestParameterValueFormatting(unittest.TestCase):
         self.assertTrue(formatted.startswith('Could not decode the value'))
 
 
+class TestWrittenParameterValues(unittest.TestCase):
+    _COLUMNS = (
+        "id",
+        "entity_class_id",
+        "object_class_id",
+        "object_class_name",
+        "entity_id",
+        "object_id",
+        "object_name",
+        "parameter_id",
+        "parameter_name",
+        "alternative_id",
+        "alternative_name",
+        "value",
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self.db_mngr = SpineDBManager(None, None)
+        self.db_map = Mock()
+        self.db_map.object_parameter_value_sq.c.keys.return_value = list(self._COLUMNS)
+        self.db_mngr.cache_items("object_class", {self.db_map: [{"id": 1, "name": "unit"}]})
+        self.db_mngr.cache_items("object", {self.db_map: [{"id": 10, "name": "u1"}, {"id": 11, "name": "u2"}]})
+        self.db_mngr.cache_items("parameter_definition", {self.db_map: [{"id": 20, "parameter_name": "capacity"}]})
+        self.db_mngr.cache_items("alternative", {self.db_map: [{"id": 30, "name": "Base"}]})
+        self.db_mngr.get_parameter_values = Mock(side_effect=self._query_parameter_values)
+
+    def tearDown(self):
+        self.db_mngr.close_all_sessions()
+        self.db_mngr.clean_up()
+
+    def _query_parameter_values(self, db_map, ids=()):
+        yield [self._cache_item(id_, 10, "u1", "1.0") for id_ in ids]
+
+    def _cache_item(self, id_, entity_id, entity_name, value):
+        return CacheItem(
+            self._COLUMNS, (id_, 1, 1, "unit", entity_id, entity_id, entity_name, 20, "capacity", 30, "Base", value)
+        )
+
+    def _written(self, id_, entity_id, value):
+        return {
+            "id": id_,
+            "entity_class_id": 1,
+            "entity_id": entity_id,
+            "parameter_definition_id": 20,
+            "alternative_id": 30,
+            "value": value,
+        }
+
+    def test_added_values_are_built_from_cache_without_querying(self):
+        items = [self._written(1, 10, "1.0"), self._written(2, 11, "2.0")]
+        cache_items = self.db_mngr.make_written_parameter_values(self.db_map, items)
+        self.db_mngr.get_parameter_values.assert_not_called()
+        self.assertEqual(dict(cache_items[0]), dict(self._cache_item(1, 10, "u1", "1.0")))
+        self.assertEqual(dict(cache_items[1]), dict(self._cache_item(2, 11, "u2", "2.0")))
+        self.db_mngr.make_written_parameter_values(self.db_map, items)
+        self.db_map.object_parameter_value_sq.c.keys.assert_called_once_with()
+
+    def test_updated_values_are_merged_with_cached_values(self):
+        self.db_mngr.cache_items("parameter_value", {self.db_map: [self._cache_item(2, 11, "u2", "2.0")]})
+        cache_items = self.db_mngr.make_written_parameter_values(
+            self.db_map, [self._written(1, 10, "1.0"), {"id": 2, "value": "5.0"}]
+        )
+        self.assertEqual(cache_items[1]["value"], "5.0")
+        self.assertEqual(cache_items[1]["object_name"], "u2")
+
+    def test_missing_lookup_falls_back_to_query(self):
+        items = [self._written(1, 10, "1.0"), self._written(2, 99, "2.0")]
+        self.assertIsNone(self.db_mngr.make_written_parameter_values(self.db_map, items))
+
+
+class TestMakeQuery(unittest.TestCase):
+    def setUp(self):
+        self._db_map = DiffDatabaseMapping("sqlite://", create=True)
+        import_functions.import_data(
+            self._db_map,
+            object_classes=("oc1", "oc2", "oc3"),
+            objects=(("oc1", "o1"), ("oc2", "o2"), ("oc3", "o3")),
+            object_parameters=(("oc1", "p1"), ("oc2", "p2"), ("oc3", "p3")),
+            object_parameter_values=(("oc1", "o1", "p1", 1.0), ("oc2", "o2", "p2", 2.0), ("oc3", "o3", "p3", 3.0)),
+        )
+        self._db_map.commit_session("Add test data.")
+        self._class_ids = {x.name: x.id for x in self._db_map.query(self._db_map.object_class_sq)}
+        # Building the subquery calls in_() itself, so build it before any test spies on in_().
+        self._db_map.object_parameter_value_sq  # pylint: disable=pointless-statement
+
+    def tearDown(self):
+        self._db_map.connection.close()
+
+    def _parameter_names(self, entity_class_ids):
+        query = SpineDBManager._make_query(
+            self._db_map, "object_parameter_value_sq", key=["parameter_name"], entity_class_ids=entity_class_ids
+        )
+        return [x.parameter_name for x in query]
+
+    def test_single_entity_class_id_is_compared_without_in(self):
+        with patch.object(self._db_map, "in_", wraps=self._db_map.in_) as in_:
+            self.assertEqual(self._parameter_names((self._class_ids["oc2"],)), ["p2"])
+            in_.assert_not_called()
+
+    def test_multiple_entity_class_ids_use_in(self):
+        class_ids = {self._class_ids["oc1"], self._class_ids["oc3"]}
+        with patch.object(self._db_map, "in_", wraps=self._db_map.in_) as in_:
+            self.assertEqual(self._parameter_names(class_ids), ["p1", "p3"])
+            in_.assert_called_once()
+
+
 if __name__ == '__main__':
     unittest.main()
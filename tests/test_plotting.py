@@ -18,6 +18,7 @@ Unit tests for the plotting module.
 
 import unittest
 from unittest.mock import Mock, MagicMock, PropertyMock, patch
+import numpy as np
 from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
 from PySide2.QtWidgets import QApplication, QAction
 from spinedb_api import DateTime, from_database, Map, TimeSeries, TimeSeriesVariableResolution, to_database
@@ -25,6 +26,7 @@ from spinetoolbox.mvcmodels.shared import PARSED_ROLE
 from spinetoolbox.plotting import (
     add_map_plot,
     add_time_series_plot,
+    decimate,
     plot_pivot_column,
     plot_selection,
     PlottingError,
@@ -387,6 +389,39 @@ class TestPlotting(unittest.TestCase):
         self.assertEqual(len(lines), 1)
         self.assertEqual(list(lines[0].get_ydata(orig=True)), [0.0, 100.0])
 
+    def test_long_time_series_is_decimated_and_refetched_when_zoomed_in(self):
+        plot_widget = PlotWidget()
+        stamps = np.arange("2021-01-01T00:00", "2022-01-01T00:00", np.timedelta64(1, "h"), dtype="datetime64[s]")
+        values = np.sin(np.arange(len(stamps)) / 24.0)
+        values[5000] = 10.0
+        time_series = TimeSeriesVariableResolution(stamps, values, False, False)
+        add_time_series_plot(plot_widget, time_series)
+        line = plot_widget.canvas.axes.get_lines()[0]
+        bucket_count = plot_widget.decimation_bucket_count()
+        self.assertLessEqual(len(line.get_ydata()), 4 * bucket_count)
+        self.assertEqual(max(line.get_ydata()), 10.0)
+        half_hour = np.timedelta64(30, "m")
+        plot_widget.canvas.axes.set_xlim(stamps[100] + half_hour, stamps[200] + half_hour)
+        self.assertEqual(list(line.get_ydata()), list(values[100:202]))
+
+
+class TestDecimate(unittest.TestCase):
+    def test_short_data_is_kept(self):
+        self.assertEqual(list(decimate(np.array([1.0, 2.0, 3.0]), 100)), [0, 1, 2])
+
+    def test_peaks_and_ends_of_buckets_are_kept(self):
+        y = np.zeros(1000)
+        y[123] = 5.0
+        y[456] = -5.0
+        y[789] = np.nan
+        indexes = decimate(y, 10)
+        self.assertLessEqual(len(indexes), 40)
+        self.assertTrue(np.all(np.diff(indexes) > 0))
+        self.assertEqual(indexes[0], 0)
+        self.assertEqual(indexes[-1], 999)
+        self.assertIn(123, indexes)
+        self.assertIn(456, indexes)
+
 
 if __name__ == '__main__':
     unittest.main()
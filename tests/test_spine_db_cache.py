@@ -0,0 +1,252 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the spine_db_cache module.
+
+:date:   18.10.2026
+"""
+
+from copy import deepcopy
+import pickle
+import sys
+import unittest
+from spinetoolbox.spine_db_cache import CacheItem, ParsedValueCache, SpineDBCache
+
+
+class TestCacheItem(unittest.TestCase):
+    def test_behaves_like_dict(self):
+        item = CacheItem(("id", "name", "description"), (1, "Base", None))
+        self.assertEqual(item, {"id": 1, "name": "Base", "description": None})
+        self.assertEqual(item["name"], "Base")
+        self.assertIsNone(item.get("description", "default"))
+        self.assertEqual(item.get("parsed_value", "default"), "default")
+        self.assertIn("id", item)
+        self.assertNotIn("parsed_value", item)
+        self.assertEqual(list(item), ["id", "name", "description"])
+        self.assertEqual(len(item), 3)
+        self.assertEqual({**item}, {"id": 1, "name": "Base", "description": None})
+        with self.assertRaises(KeyError):
+            item["parsed_value"]  # pylint: disable=pointless-statement
+
+    def test_set_and_delete_keys(self):
+        item = CacheItem(("id", "name"), (1, "Base"))
+        item["name"] = "alt"
+        item["parsed_value"] = 2.3
+        self.assertEqual(item, {"id": 1, "name": "alt", "parsed_value": 2.3})
+        del item["parsed_value"]
+        del item["name"]
+        self.assertEqual(item, {"id": 1})
+        with self.assertRaises(KeyError):
+            del item["name"]
+
+    def test_items_with_same_columns_share_layout(self):
+        item1 = CacheItem.from_dict({"id": 1, "name": "Base"})
+        item2 = CacheItem.from_dict({"id": 2, "name": "alt"})
+        self.assertIs(item1._layout, item2._layout)  # pylint: disable=protected-access
+
+    def test_copies_are_dicts(self):
+        item = CacheItem(("id", "name"), (1, "Base"))
+        item["split_value_list"] = ["a"]
+        copy = item.copy()
+        self.assertIs(type(copy), dict)
+        self.assertEqual(copy, item)
+        copy = deepcopy(item)
+        self.assertIs(type(copy), dict)
+        self.assertIsNot(copy["split_value_list"], item["split_value_list"])
+
+    def test_pickle(self):
+        item = CacheItem(("id", "name"), (1, "Base"))
+        item["parsed_value"] = 2.3
+        restored = pickle.loads(pickle.dumps(item))
+        self.assertIsInstance(restored, CacheItem)
+        self.assertEqual(restored, item)
+
+
+class TestSpineDBCache(unittest.TestCase):
+    def setUp(self):
+        self._cache = SpineDBCache()
+        self._db_map = object()
+
+    def _add_values(self):
+        values = [
+            {"id": 1, "entity_class_id": 1, "entity_id": 10, "parameter_id": 100, "alternative_id": 1},
+            {"id": 2, "entity_class_id": 1, "entity_id": 11, "parameter_id": 100, "alternative_id": 2},
+            {"id": 3, "entity_class_id": 2, "entity_id": 12, "parameter_id": 101, "alternative_id": 1},
+        ]
+        self._cache.add_items(self._db_map, "parameter_value", values)
+
+    def test_get_item(self):
+        self._add_values()
+        self.assertEqual(self._cache.get_item(self._db_map, "parameter_value", 2)["entity_id"], 11)
+        self.assertEqual(self._cache.get_item(self._db_map, "parameter_value", 4), {})
+        self.assertEqual(self._cache.get_item(object(), "parameter_value", 1), {})
+
+    def test_find_items_by_foreign_key(self):
+        self._add_values()
+        found = self._cache.find_items(self._db_map, "parameter_value", "alternative_id", {1})
+        self.assertEqual({x["id"] for x in found}, {1, 3})
+        found = self._cache.find_items(self._db_map, "parameter_value", "parameter_id", {100, 101})
+        self.assertEqual({x["id"] for x in found}, {1, 2, 3})
+        self.assertEqual(self._cache.find_items(self._db_map, "parameter_value", "entity_id", {99}), [])
+
+    def test_update_moves_item_between_index_buckets(self):
+        self._add_values()
+        updated = {"id": 1, "entity_class_id": 1, "entity_id": 10, "parameter_id": 100, "alternative_id": 2}
+        self._cache.add_items(self._db_map, "parameter_value", [updated])
+        found = self._cache.find_items(self._db_map, "parameter_value", "alternative_id", {1})
+        self.assertEqual([x["id"] for x in found], [3])
+        found = self._cache.find_items(self._db_map, "parameter_value", "alternative_id", {2})
+        self.assertEqual({x["id"] for x in found}, {1, 2})
+
+    def test_pop_item_removes_it_from_indexes(self):
+        self._add_values()
+        popped = self._cache.pop_item(self._db_map, "parameter_value", 3)
+        self.assertEqual(popped["entity_id"], 12)
+        self.assertEqual(self._cache.find_items(self._db_map, "parameter_value", "entity_class_id", {2}), [])
+        self.assertEqual(self._cache.pop_item(self._db_map, "parameter_value", 3), {})
+
+    def test_find_items_by_id_list(self):
+        relationships = [
+            {"id": 1, "class_id": 5, "object_id_list": "1,2"},
+            {"id": 2, "class_id": 5, "object_id_list": "2,3"},
+        ]
+        self._cache.add_items(self._db_map, "relationship", relationships)
+        found = self._cache.find_items(self._db_map, "relationship", "object_id_list", {2})
+        self.assertEqual([x["id"] for x in found], [1, 2])
+        found = self._cache.find_items(self._db_map, "relationship", "object_id_list", {1, 3})
+        self.assertEqual({x["id"] for x in found}, {1, 2})
+
+    def test_untagged_definitions_are_found_with_tag_id_zero(self):
+        definitions = [
+            {"id": 1, "entity_class_id": 1, "value_list_id": None, "parameter_tag_id_list": None},
+            {"id": 2, "entity_class_id": 1, "value_list_id": None, "parameter_tag_id_list": "3"},
+        ]
+        self._cache.add_items(self._db_map, "parameter_definition", definitions)
+        found = self._cache.find_items(self._db_map, "parameter_definition", "parameter_tag_id_list", {0})
+        self.assertEqual([x["id"] for x in found], [1])
+
+    def test_find_items_by_field_that_is_not_indexed(self):
+        self._cache.add_items(self._db_map, "alternative", [{"id": 1, "name": "Base"}, {"id": 2, "name": "alt"}])
+        found = self._cache.find_items(self._db_map, "alternative", "id", {2})
+        self.assertEqual([x["name"] for x in found], ["alt"])
+
+    def test_find_items_by_field(self):
+        self._cache.add_items(self._db_map, "alternative", [{"id": 1, "name": "Base"}, {"id": 2, "name": "alt"}])
+        found = self._cache.find_items_by_field(self._db_map, "alternative", "name", "alt")
+        self.assertEqual([x["id"] for x in found], [2])
+        self.assertEqual(self._cache.find_items_by_field(self._db_map, "alternative", "name", "none"), [])
+        self.assertEqual(self._cache.find_items_by_field(object(), "alternative", "name", "alt"), [])
+
+    def test_find_items_by_field_after_updates(self):
+        self._cache.add_items(self._db_map, "alternative", [{"id": 1, "name": "Base"}, {"id": 2, "name": "alt"}])
+        self._cache.find_items_by_field(self._db_map, "alternative", "name", "alt")
+        self._cache.add_items(self._db_map, "alternative", [{"id": 2, "name": "renamed"}, {"id": 3, "name": "alt"}])
+        found = self._cache.find_items_by_field(self._db_map, "alternative", "name", "alt")
+        self.assertEqual([x["id"] for x in found], [3])
+        found = self._cache.find_items_by_field(self._db_map, "alternative", "name", "renamed")
+        self.assertEqual([x["id"] for x in found], [2])
+        self._cache.pop_item(self._db_map, "alternative", 3)
+        self.assertEqual(self._cache.find_items_by_field(self._db_map, "alternative", "name", "alt"), [])
+
+    def test_find_items_by_field_after_in_place_change(self):
+        items = [CacheItem.from_dict({"id": 1, "name": "Base"}), CacheItem.from_dict({"id": 2, "name": "alt"})]
+        self._cache.add_items(self._db_map, "alternative", items)
+        self._cache.find_items_by_field(self._db_map, "alternative", "name", "alt")
+        items[1]["name"] = "renamed"
+        found = self._cache.find_items_by_field(self._db_map, "alternative", "name", "renamed")
+        self.assertEqual([x["id"] for x in found], [2])
+        self.assertEqual(self._cache.find_items_by_field(self._db_map, "alternative", "name", "alt"), [])
+        del items[0]["name"]
+        found = self._cache.find_items_by_field(self._db_map, "alternative", "name", None)
+        self.assertEqual([x["id"] for x in found], [1])
+
+    def test_foreign_key_indexes_follow_in_place_changes(self):
+        item = CacheItem.from_dict({"id": 1, "class_id": 5, "object_id_list": "1,2"})
+        self._cache.add_items(self._db_map, "relationship", [item])
+        item["class_id"] = 6
+        item["object_id_list"] = "3"
+        self.assertEqual(self._cache.find_items(self._db_map, "relationship", "class_id", {5}), [])
+        self.assertEqual(self._cache.find_items(self._db_map, "relationship", "class_id", {6}), [item])
+        self.assertEqual(self._cache.find_items(self._db_map, "relationship", "object_id_list", {1, 2}), [])
+        self.assertEqual(self._cache.find_items(self._db_map, "relationship", "object_id_list", {3}), [item])
+
+    def test_items_leaving_the_cache_are_no_longer_tracked(self):
+        item = CacheItem.from_dict({"id": 1, "name": "Base"})
+        self._cache.add_items(self._db_map, "alternative", [item])
+        self._cache.find_items_by_field(self._db_map, "alternative", "name", "Base")
+        self._cache.add_items(self._db_map, "alternative", [{"id": 1, "name": "Base"}])
+        item["name"] = "stale"
+        self.assertEqual(self._cache.find_items_by_field(self._db_map, "alternative", "name", "stale"), [])
+        self.assertEqual(len(self._cache.find_items_by_field(self._db_map, "alternative", "name", "Base")), 1)
+
+    def test_find_items_by_foreign_key_field(self):
+        self._add_values()
+        found = self._cache.find_items_by_field(self._db_map, "parameter_value", "alternative_id", 1)
+        self.assertEqual([x["id"] for x in found], [1, 3])
+
+    def test_pop_db_map(self):
+        self._add_values()
+        self.assertTrue(self._cache.pop_db_map(self._db_map))
+        self.assertNotIn(self._db_map, self._cache)
+        self.assertFalse(self._cache.pop_db_map(self._db_map))
+        self.assertEqual(self._cache.find_items(self._db_map, "parameter_value", "entity_id", {10}), [])
+
+
+class TestParsedValueCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = ParsedValueCache()
+        self.assertEqual(cache.get("key", lambda: "value"), "value")
+        self.assertEqual(cache.get("key", lambda: "other value"), "value")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.reset_statistics()
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+
+    def test_least_recently_used_values_are_evicted(self):
+        cache = ParsedValueCache(max_size=2 * sys.getsizeof("a" * 1000))
+        cache.get(1, lambda: "a" * 1000)
+        cache.get(2, lambda: "b" * 1000)
+        cache.get(1, lambda: "not parsed")
+        cache.get(3, lambda: "c" * 1000)
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.size, cache.max_size)
+        self.assertEqual(cache.get(1, lambda: "reparsed"), "a" * 1000)
+        self.assertEqual(cache.get(2, lambda: "reparsed"), "reparsed")
+
+    def test_set_max_size_evicts(self):
+        cache = ParsedValueCache()
+        cache.get(1, lambda: "a" * 1000)
+        cache.set_max_size(10)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_too_large_values_are_not_cached(self):
+        cache = ParsedValueCache(max_size=10)
+        self.assertEqual(cache.get(1, lambda: "a" * 1000), "a" * 1000)
+        self.assertEqual(len(cache), 0)
+
+    def test_spine_db_cache_discards_parsed_values_of_updated_and_removed_items(self):
+        db_map = object()
+        cache = SpineDBCache()
+        cache.add_items(db_map, "parameter_value", [{"id": 1, "value": "1"}, {"id": 2, "value": "2"}])
+        cache.parsed_values.get((db_map, "parameter_value", 1), lambda: 1.0)
+        cache.parsed_values.get((db_map, "parameter_value", 2), lambda: 2.0)
+        cache.add_items(db_map, "parameter_value", [{"id": 1, "value": "5"}])
+        self.assertEqual(cache.parsed_values.get((db_map, "parameter_value", 1), lambda: 5.0), 5.0)
+        cache.pop_item(db_map, "parameter_value", 2)
+        self.assertEqual(cache.parsed_values.get((db_map, "parameter_value", 2), lambda: None), None)
+        cache.pop_db_map(db_map)
+        self.assertEqual(len(cache.parsed_values), 0)
+        self.assertEqual(cache.parsed_values.size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,10 +15,17 @@ Unit tests for ``spine_db_fetcher`` module.
 :authors: A. Soininen (VTT)
 :date:    4.2.2021
 """
+import functools
+import os.path
+import queue
+from tempfile import TemporaryDirectory
+import threading
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, PropertyMock, patch
 from PySide2.QtGui import QIcon
 from PySide2.QtWidgets import QApplication
+from spinedb_api import DiffDatabaseMapping, import_functions
+from spinetoolbox.spine_db_fetcher import ChunkPacer, SpineDBFetcher, _DONE, _FetchPool
 from spinetoolbox.spine_db_manager import SpineDBManager
 from spinetoolbox.helpers import SignalWaiter
 
@@ -359,6 +366,23 @@ class TestSpineDBFetcher(unittest.TestCase):
             },
         )
 
+    def test_prioritized_classes_get_their_parameter_values_first(self):
+        self._import_data(
+            object_classes=("oc1", "oc2"),
+            objects=(("oc1", "obj1"), ("oc2", "obj2")),
+            object_parameters=(("oc1", "param1"), ("oc2", "param2")),
+            object_parameter_values=(("oc1", "obj1", "param1", 2.3), ("oc2", "obj2", "param2", 5.0)),
+        )
+        tables_fetched = MagicMock()
+        self._fetcher.tables_fetched.connect(tables_fetched)
+        self._fetcher.prioritize({self._db_map: {2}})
+        self._fetch()
+        tables_fetched.assert_called_once_with()
+        calls = self._listener.receive_parameter_values_added.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual([x["object_class_name"] for x in calls[0][0][0][self._db_map]], ["oc2"])
+        self.assertEqual([x["object_class_name"] for x in calls[1][0][0][self._db_map]], ["oc1"])
+
     def test_fetch_parameter_value_lists(self):
         self._import_data(parameter_value_lists=(("value_list", (2.3,)),))
         self._fetch()
@@ -471,6 +495,322 @@ class TestSpineDBFetcher(unittest.TestCase):
             {'commit_id': 2, 'id': 1, 'method_index': 0, 'parameter_value_list_id': 1, 'tool_feature_id': 1},
         )
 
+    def test_fetch_finishes_without_commit_id_when_commits_cannot_be_read(self):
+        self._import_data(alternatives=("alt",))
+        with patch("spinetoolbox.spine_db_snapshot.select", side_effect=AttributeError("no commit table")):
+            self._fetch()
+        self._listener.receive_alternatives_added.assert_called_once()
+        self.assertIsNone(self._db_mngr.cached_commit_id(self._db_map))
+
+    def test_refresh_session_refetches_in_full_when_commits_cannot_be_read(self):
+        self._import_data(alternatives=("alt",))
+        self._fetch()
+        self.assertIsNotNone(self._db_mngr.cached_commit_id(self._db_map))
+        waiter = SignalWaiter()
+        self._db_mngr.session_refreshed.connect(waiter.trigger)
+        with patch.object(self._db_mngr, "get_latest_commit_id", return_value=None):
+            self._db_mngr.refresh_session(self._db_map)
+            waiter.wait()
+        self.assertIsNone(self._db_mngr.cached_commit_id(self._db_map))
+        self.assertEqual(self._db_mngr.get_item(self._db_map, "alternative", 2), {})
+
+
+class TestSpineDBFetcherWithFileDatabases(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._temp_dir = TemporaryDirectory()
+        self._logger = MagicMock()
+        self._db_mngr = SpineDBManager(MagicMock(), None)
+        self._db_mngr._get_commit_msg = lambda *args, **kwargs: "Add test data."
+        self._db_maps = []
+        for name in ("db1", "db2"):
+            url = "sqlite:///" + os.path.join(self._temp_dir.name, name + ".sqlite")
+            self._db_maps.append(self._db_mngr.get_db_map(url, self._logger, codename=name, create=True))
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+        self._temp_dir.cleanup()
+
+    def _import_and_commit(self, db_map, **data):
+        waiter = SignalWaiter()
+        self._db_mngr.data_imported.connect(waiter.trigger)
+        self._db_mngr.import_data({db_map: data})
+        waiter.wait()
+        self._db_mngr.data_imported.disconnect(waiter.trigger)
+        self._db_mngr.session_committed.connect(waiter.trigger)
+        self._db_mngr.commit_session(db_map)
+        waiter.wait()
+        self._db_mngr.session_committed.disconnect(waiter.trigger)
+
+    def test_pool_reads_file_database_without_locking_it(self):
+        db_map = self._db_maps[0]
+        self._import_and_commit(db_map, object_classes=("oc1", "oc2"))
+        pool = _FetchPool(4, lambda: False)
+        try:
+            task_chunks = []
+            for _ in range(8):
+                chunks = queue.Queue(8)
+                pool.submit(db_map.db_url, self._db_mngr.get_object_classes, chunks)
+                task_chunks.append(chunks)
+            for chunks in task_chunks:
+                names = []
+                for chunk in iter(functools.partial(chunks.get, timeout=10), _DONE):
+                    self.assertNotIsInstance(chunk, Exception)
+                    names += [x["name"] for x in chunk]
+                self.assertEqual(names, ["oc1", "oc2"])
+            # The workers keep their connections open until shutdown, yet the database can still be written
+            external_db_map = DiffDatabaseMapping(db_map.db_url)
+            try:
+                import_functions.import_object_classes(external_db_map, ("oc3",))
+                external_db_map.commit_session("External changes.")
+            finally:
+                external_db_map.connection.close()
+        finally:
+            pool.shutdown()
+
+    def test_database_can_be_opened_while_fetch_waits_for_listeners(self):
+        db_map = self._db_maps[0]
+        object_names = [f"o{i}" for i in range(20)]
+        self._import_and_commit(db_map, object_classes=("oc",), objects=[("oc", name) for name in object_names])
+        listener = MagicMock()
+        fetcher = self._db_mngr.get_fetcher()
+        fetcher._pacer = ChunkPacer(initial_chunk_size=1, min_chunk_size=1)
+        fetcher._mini.signaller.pacer = fetcher._pacer
+        waiter = SignalWaiter()
+        fetcher.finished.connect(waiter.trigger)
+        fetcher.fetch(listener, [db_map], ["object_class", "object"])
+        # The fetch runs in the database thread while this thread, which handles the chunks, blocks on the call
+        url = "sqlite:///" + os.path.join(self._temp_dir.name, "db3.sqlite")
+        new_db_map = self._db_mngr.get_db_map(url, self._logger, codename="db3", create=True)
+        self.assertIsNotNone(new_db_map)
+        waiter.wait()
+        fetched = [x["name"] for call in listener.receive_objects_added.call_args_list for x in call[0][0][db_map]]
+        self.assertEqual(sorted(fetched), sorted(object_names))
+
+    def test_committed_databases_are_fetched_in_dependency_order(self):
+        for db_map in self._db_maps:
+            self.assertTrue(SpineDBFetcher._can_fetch_in_parallel(db_map))
+            self._import_and_commit(
+                db_map,
+                object_classes=("oc",),
+                objects=(("oc", "obj"),),
+                object_parameters=(("oc", "param"),),
+                object_parameter_values=(("oc", "obj", "param", 2.3),),
+            )
+        listener = MagicMock()
+        received = []
+        listener.receive_object_classes_added.side_effect = lambda data: received.append(("object_class", data))
+        listener.receive_objects_added.side_effect = lambda data: received.append(("object", data))
+        listener.receive_parameter_values_added.side_effect = lambda data: received.append(("parameter_value", data))
+        fetcher = self._db_mngr.get_fetcher()
+        waiter = SignalWaiter()
+        fetcher.finished.connect(waiter.trigger)
+        fetcher.fetch(listener, self._db_maps)
+        waiter.wait()
+        self.assertEqual(
+            [(item_type, next(iter(data))) for item_type, data in received],
+            [
+                ("object_class", self._db_maps[0]),
+                ("object_class", self._db_maps[1]),
+                ("object", self._db_maps[0]),
+                ("object", self._db_maps[1]),
+                ("parameter_value", self._db_maps[0]),
+                ("parameter_value", self._db_maps[1]),
+            ],
+        )
+        for db_map in self._db_maps:
+            self.assertEqual(self._db_mngr.get_item(db_map, "parameter_value", 1)["value"], "2.3")
+
+    def test_parameter_values_are_fetched_by_the_pool_for_the_fetched_classes(self):
+        for db_map in self._db_maps:
+            self._import_and_commit(
+                db_map,
+                object_classes=("oc1", "oc2"),
+                objects=(("oc1", "obj1"), ("oc2", "obj2")),
+                object_parameters=(("oc1", "param1"), ("oc2", "param2")),
+                object_parameter_values=(("oc1", "obj1", "param1", 2.3), ("oc2", "obj2", "param2", 5.0)),
+            )
+        listener = MagicMock()
+        submitted_getters = []
+        submit = _FetchPool.submit
+
+        def record_submit(pool, url, getter, chunks):
+            submitted_getters.append(getter)
+            submit(pool, url, getter, chunks)
+
+        fetcher = self._db_mngr.get_fetcher()
+        waiter = SignalWaiter()
+        fetcher.finished.connect(waiter.trigger)
+        # Classes must come from the fetched rows, not from the cache which is filled asynchronously
+        with patch.object(_FetchPool, "submit", record_submit), patch.object(
+            self._db_mngr, "get_items", return_value=[]
+        ):
+            fetcher.fetch(listener, self._db_maps)
+            waiter.wait()
+        value_queries = [getter for getter in submitted_getters if isinstance(getter, functools.partial)]
+        self.assertEqual(len(value_queries), 4)
+        received = {}
+        for call in listener.receive_parameter_values_added.call_args_list:
+            for db_map, items in call[0][0].items():
+                received.setdefault(db_map, set()).update(x["parameter_name"] for x in items)
+        self.assertEqual(received, {db_map: {"param1", "param2"} for db_map in self._db_maps})
+
+    def test_snapshot_holds_every_emitted_row_even_if_not_cached_yet(self):
+        db_map = self._db_maps[0]
+        self._import_and_commit(
+            db_map,
+            object_classes=("oc",),
+            objects=(("oc", "obj1"), ("oc", "obj2")),
+            object_parameters=(("oc", "param"),),
+            object_parameter_values=(("oc", "obj1", "param", 2.3), ("oc", "obj2", "param", 5.0)),
+        )
+        fetcher = self._db_mngr.get_fetcher()
+        waiter = SignalWaiter()
+        fetcher.finished.connect(waiter.trigger)
+        snapshot_dir = os.path.join(self._temp_dir.name, "snapshots")
+        with patch.object(SpineDBManager, "snapshot_dir", new_callable=PropertyMock, return_value=snapshot_dir), patch(
+            "spinetoolbox.spine_db_fetcher.save_snapshot"
+        ) as save_snapshot, patch.object(self._db_mngr, "get_items", return_value=[]):
+            fetcher.fetch(MagicMock(), [db_map])
+            waiter.wait()
+        save_snapshot.assert_called_once()
+        tables = save_snapshot.call_args[0][3]
+        object_names = sorted(row[keys.index("name")] for keys, rows in tables["object"] for row in rows)
+        self.assertEqual(object_names, ["obj1", "obj2"])
+        self.assertEqual(sum(len(rows) for _, rows in tables["parameter_value"]), 2)
+
+    def test_database_with_pending_changes_is_fetched_through_its_own_connection(self):
+        db_map = self._db_maps[0]
+        waiter = SignalWaiter()
+        self._db_mngr.data_imported.connect(waiter.trigger)
+        self._db_mngr.import_data({db_map: {"object_classes": ("oc",)}})
+        waiter.wait()
+        self.assertFalse(SpineDBFetcher._can_fetch_in_parallel(db_map))
+
+    def test_refresh_session_applies_external_commits_incrementally(self):
+        db_map = self._db_maps[0]
+        self._import_and_commit(db_map, object_classes=("oc",), objects=(("oc", "obj1"), ("oc", "obj2")))
+        fetcher = self._db_mngr.get_fetcher()
+        waiter = SignalWaiter()
+        fetcher.finished.connect(waiter.trigger)
+        fetcher.fetch(MagicMock(), [db_map])
+        waiter.wait()
+        self.assertIsNotNone(self._db_mngr.cached_commit_id(db_map))
+        external_db_map = DiffDatabaseMapping(db_map.db_url)
+        import_functions.import_alternatives(external_db_map, ("alt",))
+        external_db_map.remove_items(**external_db_map.cascading_ids(object={2}))
+        external_db_map.commit_session("External changes.")
+        external_db_map.connection.close()
+        session_refreshed = MagicMock()
+        objects_removed = MagicMock()
+        self._db_mngr.session_refreshed.connect(session_refreshed)
+        self._db_mngr.objects_removed.connect(objects_removed)
+        waiter = SignalWaiter()
+        self._db_mngr.alternatives_added.connect(waiter.trigger)
+        self._db_mngr.refresh_session(db_map)
+        waiter.wait()
+        session_refreshed.assert_not_called()
+        objects_removed.assert_called_once()
+        self.assertEqual(self._db_mngr.get_item(db_map, "alternative", 2)["name"], "alt")
+        self.assertEqual(self._db_mngr.get_item(db_map, "object", 1)["name"], "obj1")
+        self.assertEqual(self._db_mngr.get_item(db_map, "object", 2), {})
+
+
+class TestFetchedChunks(unittest.TestCase):
+    def test_rows_delivered_before_worker_fails_are_not_fetched_again(self):
+        table = [[{"id": 1}, {"id": 2}], [{"id": 3}]]
+
+        def fail_mid_table(db_map):
+            yield table[0]
+            raise RuntimeError("connection lost")
+
+        chunks = queue.Queue(8)
+        with patch("spinetoolbox.spine_db_fetcher.DatabaseMappingBase"):
+            pool = _FetchPool(1, lambda: False)
+            pool.submit("sqlite:///db.sqlite", fail_mid_table, chunks)
+            fetched = list(SpineDBFetcher._chunks(MagicMock(), lambda db_map: iter(table), chunks))
+            pool.shutdown()
+        self.assertEqual(fetched, [[{"id": 1}, {"id": 2}], [{"id": 3}]])
+
+    def test_worker_failing_before_first_chunk_falls_back_to_whole_table(self):
+        table = [[{"id": 1}, {"id": 2}]]
+        chunks = queue.Queue(8)
+        chunks.put(RuntimeError("no connection"))
+        fetched = list(SpineDBFetcher._chunks(MagicMock(), lambda db_map: iter(table), chunks))
+        self.assertEqual(fetched, table)
+
+    def test_waiting_for_chunks_ends_when_fetching_stops(self):
+        fetched = list(SpineDBFetcher._chunks(MagicMock(), MagicMock(), queue.Queue(8), lambda: True))
+        self.assertEqual(fetched, [])
+
+
+class TestChunkPacer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def test_chunk_size_follows_handling_time(self):
+        pacer = ChunkPacer(initial_chunk_size=1000, min_chunk_size=10, max_chunk_size=5000)
+        self.assertEqual(pacer.chunk_size, 1000)
+        pacer.record(1000, 2 * ChunkPacer.FRAME_BUDGET)
+        self.assertEqual(pacer.chunk_size, 500)
+        pacer.record(1000, 0.0)
+        self.assertGreater(pacer.chunk_size, 500)
+        pacer.record(10, 100.0)
+        self.assertEqual(pacer.chunk_size, 10)
+
+    def test_paced_reslices_chunks(self):
+        pacer = ChunkPacer(initial_chunk_size=3)
+        chunks = list(pacer.paced([[1, 2], [3, 4, 5, 6, 7], [8]]))
+        self.assertEqual(chunks, [[1, 2, 3], [4, 5, 6], [7, 8]])
+
+    def test_wait_for_room_blocks_until_listeners_catch_up(self):
+        pacer = ChunkPacer()
+        rooms = []
+
+        def fetch():
+            # Chunks are emitted from the fetcher's thread, so the markers are queued to the pacer's thread
+            for _ in range(ChunkPacer.MAX_PENDING):
+                rooms.append(pacer.wait_for_room(lambda: False))
+                pacer.chunk_emitted()
+            rooms.append(pacer.wait_for_room(lambda: True))
+
+        fetcher_thread = threading.Thread(target=fetch)
+        fetcher_thread.start()
+        fetcher_thread.join()
+        self.assertEqual(rooms, ChunkPacer.MAX_PENDING * [True] + [False])
+        QApplication.processEvents()
+        self.assertTrue(pacer.wait_for_room(lambda: True))
+
+    def _fill_up(self, pacer):
+        def fetch():
+            for _ in range(ChunkPacer.MAX_PENDING):
+                pacer.wait_for_room(lambda: False)
+                pacer.chunk_emitted()
+
+        fetcher_thread = threading.Thread(target=fetch)
+        fetcher_thread.start()
+        fetcher_thread.join()
+
+    def test_wait_for_room_does_not_wait_while_listeners_wait_on_fetcher(self):
+        pacer = ChunkPacer()
+        self._fill_up(pacer)
+        self.assertTrue(pacer.wait_for_room(lambda: False, lambda: True))
+        QApplication.processEvents()
+
+    def test_wait_for_room_gives_up_waiting_after_max_wait(self):
+        pacer = ChunkPacer()
+        pacer.MAX_WAIT = 0.05
+        self._fill_up(pacer)
+        self.assertTrue(pacer.wait_for_room(lambda: False))
+        QApplication.processEvents()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the spine_db_icon_manager module.
+
+:date:   18.10.2026
+"""
+
+import unittest
+from PySide2.QtCore import QSize
+from PySide2.QtWidgets import QApplication
+from spinetoolbox.spine_db_icon_manager import SpineDBIconManager
+
+
+class TestSpineDBIconManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        self._icon_mngr = SpineDBIconManager()
+        object_classes = [{"name": "oc1", "display_icon": None}, {"name": "oc2", "display_icon": None}]
+        self._icon_mngr.update_icon_caches(object_classes)
+
+    def test_renderer_pixmap_is_rendered_once_per_size_and_device_pixel_ratio(self):
+        renderer = self._icon_mngr.object_renderer("oc1")
+        pixmap = self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16))
+        self.assertEqual(pixmap.size(), QSize(16, 16))
+        self.assertIs(self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16)), pixmap)
+        hi_dpi_pixmap = self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16), 2.0)
+        self.assertIsNot(hi_dpi_pixmap, pixmap)
+        self.assertEqual(hi_dpi_pixmap.size(), QSize(32, 32))
+        self.assertEqual(hi_dpi_pixmap.devicePixelRatio(), 2.0)
+        self.assertIsNot(self._icon_mngr.renderer_pixmap(renderer, QSize(32, 32)), pixmap)
+
+    def test_icon_from_renderer_is_shared(self):
+        renderer = self._icon_mngr.object_renderer("oc1")
+        icon = self._icon_mngr.icon_from_renderer(renderer)
+        self.assertIs(self._icon_mngr.icon_from_renderer(renderer), icon)
+        self.assertEqual(icon.pixmap(QSize(24, 24)).size(), QSize(24, 24))
+
+    def test_updating_object_classes_drops_obsolete_pixmaps(self):
+        renderer = self._icon_mngr.relationship_renderer("oc1,oc2")
+        pixmap = self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16))
+        icon = self._icon_mngr.icon_from_renderer(renderer)
+        self._icon_mngr.update_icon_caches([{"name": "oc2", "display_icon": None}])
+        self.assertIsNot(self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16)), pixmap)
+        self.assertIsNot(self._icon_mngr.icon_from_renderer(renderer), icon)
+        self.assertIsNot(self._icon_mngr.relationship_renderer("oc1,oc2"), renderer)
+
+    def test_updating_object_classes_drops_pixmaps_of_their_renderers(self):
+        renderer = self._icon_mngr.object_renderer("oc1")
+        pixmap = self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16))
+        self._icon_mngr.update_icon_caches([{"name": "oc1", "display_icon": None}])
+        self.assertEqual(self._icon_mngr.pixmap_cache_size, 0)
+        self.assertIsNot(self._icon_mngr.renderer_pixmap(renderer, QSize(16, 16)), pixmap)
+
+    def test_least_recently_used_pixmaps_are_dropped_beyond_size_limit(self):
+        pixmap_size = 16 * 16 * 4
+        icon_mngr = SpineDBIconManager(pixmap_cache_max_size=2 * pixmap_size)
+        renderer = icon_mngr.icon_renderer("\uf1b3", 0)
+        first = icon_mngr.renderer_pixmap(renderer, QSize(16, 16))
+        second = icon_mngr.renderer_pixmap(renderer, QSize(16, 16), 1.01)
+        self.assertIs(icon_mngr.renderer_pixmap(renderer, QSize(16, 16)), first)
+        icon_mngr.renderer_pixmap(renderer, QSize(16, 16), 1.02)
+        self.assertEqual(icon_mngr.pixmap_cache_size, 2 * pixmap_size)
+        self.assertIs(icon_mngr.renderer_pixmap(renderer, QSize(16, 16)), first)
+        self.assertIsNot(icon_mngr.renderer_pixmap(renderer, QSize(16, 16), 1.01), second)
+        self.assertEqual(icon_mngr.pixmap_cache_size, 2 * pixmap_size)
+        big_pixmap = icon_mngr.renderer_pixmap(renderer, QSize(64, 64))
+        self.assertEqual(big_pixmap.size(), QSize(64, 64))
+        self.assertEqual(icon_mngr.pixmap_cache_size, 2 * pixmap_size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,400 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for the spine_db_worker module.
+
+:date:   18.10.2026
+"""
+
+from contextlib import closing
+import json
+import os.path
+import sqlite3
+from tempfile import TemporaryDirectory
+import unittest
+from unittest import mock
+from PySide2.QtWidgets import QApplication
+from spinedb_api import Asterisk, DiffDatabaseMapping, Map, ParameterValueEncoder, export_data, import_functions
+from spinetoolbox.helpers import SignalWaiter
+from spinetoolbox.spine_db_manager import SpineDBManager
+from spinetoolbox.spine_db_worker import SpineDBWorker, _JSON_EXPORT_ORDER
+
+
+class TestImportBatches(unittest.TestCase):
+    def test_batches_are_bounded_and_in_dependency_order(self):
+        data = {"objects": [("oc", f"o{i}") for i in range(5)], "object_classes": ["oc"], "unknown": [1]}
+        with mock.patch("spinetoolbox.spine_db_worker._BULK_IMPORT_BATCH_SIZE", 2):
+            batches = list(SpineDBWorker._import_batches(data))
+        self.assertEqual(
+            batches,
+            [
+                {"object_classes": ["oc"]},
+                {"objects": [("oc", "o0"), ("oc", "o1")]},
+                {"objects": [("oc", "o2"), ("oc", "o3")]},
+                {"objects": [("oc", "o4")]},
+                {"unknown": [1]},
+            ],
+        )
+
+
+class TestWrittenItems(unittest.TestCase):
+    def setUp(self):
+        self._worker = mock.MagicMock()
+        self._worker._number_added_items = SpineDBWorker._number_added_items
+        self._worker._match_added_items = SpineDBWorker._match_added_items
+        self._db_map = mock.MagicMock()
+        self._builder = self._worker._db_mngr.make_written_parameter_values
+
+    def _make_written_items(self, items, ids, rows):
+        self._db_map.query.return_value.filter.return_value = rows
+        return SpineDBWorker._make_written_items(self._worker, self._db_map, items, ids, "get_parameter_values")
+
+    @staticmethod
+    def _value(entity_id, definition_id, value):
+        return {"entity_id": entity_id, "parameter_definition_id": definition_id, "alternative_id": 1, "value": value}
+
+    def test_added_items_get_ids_in_order_without_querying(self):
+        items = [self._value(10, 20, "a"), self._value(11, 20, "b"), self._value(10, 21, "c")]
+        written = self._make_written_items(items, {5, 3, 4}, [])
+        self.assertIs(written, self._builder.return_value)
+        self._builder.assert_called_once_with(
+            self._db_map, [{"id": 3, **items[0]}, {"id": 4, **items[1]}, {"id": 5, **items[2]}]
+        )
+        self._db_map.query.assert_not_called()
+
+    def test_added_items_are_matched_to_ids_by_unique_key_if_ids_are_not_consecutive(self):
+        items = [self._value(10, 20, "a"), self._value(11, 20, "b"), self._value(10, 21, "c")]
+        rows = [(8, 10, 21, 1), (3, 11, 20, 1), (4, 10, 20, 1)]
+        written = self._make_written_items(items, {3, 4, 8}, rows)
+        self.assertIs(written, self._builder.return_value)
+        self._builder.assert_called_once_with(
+            self._db_map, [{"id": 4, **items[0]}, {"id": 3, **items[1]}, {"id": 8, **items[2]}]
+        )
+
+    def test_items_that_failed_to_be_added_are_skipped(self):
+        items = [self._value(10, 20, "a"), self._value(10, 20, "duplicate"), self._value(11, 20, "b")]
+        self._make_written_items(items, {7}, [(7, 11, 20, 1)])
+        self._builder.assert_called_once_with(self._db_map, [{"id": 7, **items[2]}])
+
+    def test_items_without_unique_key_or_unmatched_ids_are_queried(self):
+        items = 2 * [{"entity_id": 10, "parameter_definition_id": 20, "value": "a"}]
+        self.assertIsNone(self._make_written_items(items, {1}, [(1, 10, 20, 1)]))
+        self.assertIsNone(self._make_written_items([self._value(10, 20, "a")], {1, 2}, [(1, 10, 20, 1), (2, 9, 9, 1)]))
+        self._builder.assert_not_called()
+
+
+class TestExportToJson(unittest.TestCase):
+    def _export(self, tables):
+        caller = mock.MagicMock()
+        with TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "export.json")
+            SpineDBWorker.export_to_json(None, file_path, tables, caller)
+            with open(file_path, encoding="utf-8") as f:
+                contents = f.read()
+        caller.file_exported.emit.assert_called_once_with(file_path)
+        return contents
+
+    def test_empty_export_is_empty_object(self):
+        self.assertEqual(self._export([]), "{}")
+
+    def test_tables_are_written_one_item_per_line(self):
+        tables = (("object_classes", [("oc", None)]), ("objects", [("oc", f"o{i}", "") for i in range(3)]))
+        with mock.patch("spinetoolbox.spine_db_worker._JSON_EXPORT_BATCH_SIZE", 2):
+            contents = self._export(tables)
+        self.assertEqual(
+            contents,
+            "{\n"
+            '    "object_classes": [\n'
+            '        ["oc", null]\n'
+            "    ],\n"
+            '    "objects": [\n'
+            '        ["oc", "o0", ""],\n'
+            '        ["oc", "o1", ""],\n'
+            '        ["oc", "o2", ""]\n'
+            "    ]\n"
+            "}",
+        )
+        self.assertEqual(json.loads(contents)["objects"][2], ["oc", "o2", ""])
+
+
+def _export_in_one_string(data):
+    """Formats exported data the way export_to_json did before it streamed tables."""
+    indent = 4 * " "
+    return "{{{0}{1}{0}}}".format(
+        "\n" if data else "",
+        ",\n".join(
+            [
+                indent
+                + json.dumps(key)
+                + ": [{0}{1}{0}]".format(
+                    "\n" + indent if values else "",
+                    (",\n" + indent).join([indent + json.dumps(value, cls=ParameterValueEncoder) for value in values]),
+                )
+                for key, values in data.items()
+            ]
+        ),
+    )
+
+
+class TestStreamedJsonExport(unittest.TestCase):
+    def setUp(self):
+        self._db_map = DiffDatabaseMapping("sqlite://", create=True)
+        object_names = ("a b", "a", "B", "ä")
+        import_functions.import_data(
+            self._db_map,
+            object_classes=["unit", "Node"],
+            objects=[("unit", name) for name in object_names] + [("Node", "x"), ("Node", "x y"), ("Node", "!")],
+            relationship_classes=[("unit__node", ["unit", "Node"])],
+            relationships=[("unit__node", ["a b", "x"]), ("unit__node", ["a", "x y"]), ("unit__node", ["a", "!"])],
+            object_parameters=[("unit", "p"), ("unit", "P")],
+            relationship_parameters=[("unit__node", "r")],
+            alternatives=["alt", "Alt"],
+            object_parameter_values=[
+                ("unit", name, parameter, value, alternative)
+                for name in object_names
+                for parameter in ("p", "P")
+                for value, alternative in ((1.5, "Base"), ("s", "alt"), (Map(["t"], [1.0]), "Alt"))
+            ],
+            relationship_parameter_values=[
+                ("unit__node", names, "r", float(i), alternative)
+                for i, names in enumerate((["a b", "x"], ["a", "x y"], ["a", "!"]))
+                for alternative in ("Base", "alt")
+            ],
+        )
+        self._db_map.commit_session("Add test data.")
+
+    def tearDown(self):
+        self._db_map.connection.close()
+
+    def _export(self, item_ids):
+        with TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "export.json")
+            tables = SpineDBWorker._export_tables({self._db_map: item_ids}, _JSON_EXPORT_ORDER)
+            with mock.patch("spinetoolbox.spine_db_worker._EXPORT_YIELD_PER", 2):
+                SpineDBWorker.export_to_json(None, file_path, tables, mock.MagicMock())
+            with open(file_path, encoding="utf-8") as f:
+                return f.read()
+
+    def test_whole_database_exports_as_before(self):
+        self.assertEqual(self._export({}), _export_in_one_string(export_data(self._db_map)))
+
+    def test_selected_items_export_as_before(self):
+        item_ids = {"object_parameter_value_ids": {1, 4, 7}, "relationship_ids": {2}, "alternative_ids": ()}
+        self.assertEqual(self._export(item_ids), _export_in_one_string(export_data(self._db_map, **item_ids)))
+
+
+class TestExportToSqlite(unittest.TestCase):
+    def _db_map(self, url, has_pending_changes=False):
+        db_map = mock.MagicMock()
+        db_map.db_url = url
+        db_map.has_pending_changes.return_value = has_pending_changes
+        return db_map
+
+    def test_whole_committed_sqlite_database_can_be_copied(self):
+        db_map = self._db_map("sqlite:///path/to/db.sqlite")
+        everything = {"object_class_ids": Asterisk, "object_ids": Asterisk}
+        self.assertEqual(SpineDBWorker._whole_sqlite_database({db_map: everything}), "path/to/db.sqlite")
+        self.assertEqual(SpineDBWorker._whole_sqlite_database({db_map: {}}), "path/to/db.sqlite")
+
+    def test_partial_uncommitted_in_memory_or_multiple_databases_cannot_be_copied(self):
+        db_map = self._db_map("sqlite:///db.sqlite")
+        self.assertIsNone(SpineDBWorker._whole_sqlite_database({db_map: {"object_ids": {1, 2}}}))
+        self.assertIsNone(SpineDBWorker._whole_sqlite_database({db_map: {"object_ids": ()}}))
+        self.assertIsNone(SpineDBWorker._whole_sqlite_database({self._db_map("sqlite:///db.sqlite", True): {}}))
+        self.assertIsNone(SpineDBWorker._whole_sqlite_database({self._db_map("sqlite://"): {}}))
+        self.assertIsNone(SpineDBWorker._whole_sqlite_database({self._db_map("mysql://host/db"): {}}))
+        other_db_map = self._db_map("sqlite:///other.sqlite")
+        self.assertIsNone(SpineDBWorker._whole_sqlite_database({db_map: {}, other_db_map: {}}))
+
+    def test_copy_sqlite_database(self):
+        worker = mock.MagicMock()
+        worker._db_mngr.is_url_available.return_value = True
+        caller = mock.MagicMock()
+        with TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "source.sqlite")
+            with closing(sqlite3.connect(source_path)) as connection:
+                connection.execute("CREATE TABLE entity (id INTEGER PRIMARY KEY, name TEXT)")
+                connection.executemany("INSERT INTO entity (name) VALUES (?)", ((f"o{i}",) for i in range(3)))
+                connection.commit()
+            file_path = os.path.join(temp_dir, "export.sqlite")
+            SpineDBWorker.copy_sqlite_database(worker, source_path, file_path, caller)
+            caller.sqlite_file_exported.emit.assert_called_once_with(file_path)
+            with closing(sqlite3.connect(file_path)) as connection:
+                rows = connection.execute("SELECT id, name FROM entity").fetchall()
+        self.assertEqual(rows, [(1, "o0"), (2, "o1"), (3, "o2")])
+
+    def test_copied_selection_equals_imported_selection(self):
+        worker = mock.MagicMock()
+        worker._db_mngr.is_url_available.return_value = True
+        worker._copy_selected_rows = SpineDBWorker._copy_selected_rows
+        caller = mock.MagicMock()
+        with TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "source.sqlite")
+            db_map = DiffDatabaseMapping("sqlite:///" + source_path, create=True)
+            import_functions.import_data(
+                db_map,
+                object_classes=("oc1", "oc2"),
+                objects=(("oc1", "o1"), ("oc1", "o2"), ("oc2", "p1")),
+                parameter_value_lists=(("list", "a"), ("list", "b")),
+                object_parameters=(
+                    ("oc1", "x"),
+                    ("oc2", "y"),
+                    ("oc1", "f1", None, "list"),
+                    ("oc2", "f2", None, "list"),
+                ),
+                relationship_classes=(("rc", ("oc1", "oc2")),),
+                relationships=(("rc", ("o1", "p1")),),
+                object_parameter_values=(("oc1", "o1", "x", 1.0), ("oc1", "o2", "x", 2.0), ("oc2", "p1", "y", 3.0)),
+                alternatives=("alt",),
+                features=(("oc1", "f1"), ("oc2", "f2")),
+            )
+            db_map.commit_session("Add test data.")
+
+            def ids(sq, *names):
+                return {x.id for x in db_map.query(sq) if x.name in names}
+
+            parameter_ids = {x.id for x in db_map.query(db_map.parameter_definition_sq) if x.name in ("x", "f1")}
+            value_ids = {x.id for x in db_map.query(db_map.object_parameter_value_sq) if x.object_name == "o1"}
+            selection = {
+                "object_class_ids": ids(db_map.object_class_sq, "oc1", "oc2"),
+                "relationship_class_ids": ids(db_map.wide_relationship_class_sq, "rc"),
+                "parameter_value_list_ids": ids(db_map.wide_parameter_value_list_sq, "list"),
+                "object_parameter_ids": parameter_ids,
+                "relationship_parameter_ids": set(),
+                "object_ids": ids(db_map.object_sq, "o1", "p1"),
+                "relationship_ids": {x.id for x in db_map.query(db_map.wide_relationship_sq)},
+                "object_group_ids": set(),
+                "object_parameter_value_ids": value_ids,
+                "relationship_parameter_value_ids": set(),
+                "alternative_ids": ids(db_map.alternative_sq, "Base"),
+                "scenario_ids": set(),
+                "scenario_alternative_ids": set(),
+            }
+            copied_path = os.path.join(temp_dir, "copied.sqlite")
+            self.assertTrue(SpineDBWorker.copy_sqlite_selection(worker, source_path, selection, copied_path, caller))
+            caller.sqlite_file_exported.emit.assert_called_once_with(copied_path)
+            imported_path = os.path.join(temp_dir, "imported.sqlite")
+            SpineDBWorker.export_to_sqlite(worker, imported_path, export_data(db_map, **selection), caller)
+            db_map.connection.close()
+            exported = []
+            for path in (copied_path, imported_path):
+                exported_db_map = DiffDatabaseMapping("sqlite:///" + path)
+                exported.append({key: sorted(items) for key, items in export_data(exported_db_map).items()})
+                exported_db_map.connection.close()
+        copied, imported = exported
+        # Importing features puts the value list name into the description, copying keeps the description intact
+        self.assertEqual(copied.pop("features"), [("oc1", "f1", "list", None)])
+        imported.pop("features")
+        self.assertEqual(copied, imported)
+        self.assertEqual(copied["objects"], [("oc1", "o1", None), ("oc2", "p1", None)])
+        self.assertEqual(len(copied["object_parameter_values"]), 1)
+
+    def test_selection_is_not_copied_from_database_of_other_schema(self):
+        worker = mock.MagicMock()
+        worker._db_mngr.is_url_available.return_value = True
+        worker._copy_selected_rows = SpineDBWorker._copy_selected_rows
+        caller = mock.MagicMock()
+        with TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, "source.sqlite")
+            with closing(sqlite3.connect(source_path)) as connection:
+                connection.execute("CREATE TABLE alembic_version (version_num TEXT)")
+                connection.execute("INSERT INTO alembic_version VALUES ('0')")
+                connection.commit()
+            file_path = os.path.join(temp_dir, "export.sqlite")
+            self.assertFalse(SpineDBWorker.copy_sqlite_selection(worker, source_path, {}, file_path, caller))
+            self.assertFalse(os.path.exists(file_path))
+        caller.sqlite_file_exported.emit.assert_not_called()
+
+
+class TestExportToExcel(unittest.TestCase):
+    def test_whole_database_is_exported_without_staging(self):
+        worker = mock.MagicMock()
+        worker._whole_database = SpineDBWorker._whole_database
+        db_map = mock.MagicMock()
+        SpineDBWorker._export_data(worker, "caller", {db_map: {"object_ids": Asterisk}}, "out.xlsx", "Excel (*.xlsx)")
+        worker.export_to_excel.assert_called_once_with("out.xlsx", db_map, "caller")
+        worker._make_staging_database.assert_not_called()
+
+    def test_selected_items_are_staged_table_by_table_on_disk(self):
+        worker = mock.MagicMock()
+        worker._whole_database = SpineDBWorker._whole_database
+        db_map = mock.MagicMock()
+        tables = iter([("objects", [("oc", "o")])])
+        worker._export_tables.return_value = tables
+        staging_db_map = worker._make_staging_database.return_value
+        SpineDBWorker._export_data(worker, "caller", {db_map: {"object_ids": {1}}}, "out.xlsx", "Excel (*.xlsx)")
+        worker._export_tables.assert_called_once_with({db_map: {"object_ids": {1}}})
+        staging_path, staged_tables = worker._make_staging_database.call_args[0]
+        self.assertTrue(staging_path.endswith("export.sqlite"))
+        self.assertIs(staged_tables, tables)
+        worker.export_to_excel.assert_called_once_with("out.xlsx", staging_db_map, "caller")
+        staging_db_map.connection.close.assert_called_once_with()
+
+
+class TestBulkImport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def setUp(self):
+        app_settings = mock.MagicMock()
+        self._logger = mock.MagicMock()
+        self._db_mngr = SpineDBManager(app_settings, None)
+        self._db_map = self._db_mngr.get_db_map("sqlite://", self._logger, codename="test_db", create=True)
+
+    def tearDown(self):
+        self._db_mngr.close_all_sessions()
+        self._db_mngr.clean_up()
+
+    def _wait_for(self, signal, action):
+        waiter = SignalWaiter()
+        slot = lambda *args: waiter.trigger()
+        signal.connect(slot)
+        action()
+        waiter.wait()
+        signal.disconnect(slot)
+
+    def _bulk_import(self, **data):
+        self._wait_for(self._db_mngr.data_imported, lambda: self._db_mngr.import_data({self._db_map: data}, bulk=True))
+
+    def test_items_are_imported_in_batches_with_one_notification_per_item_type(self):
+        objects_added = mock.MagicMock()
+        self._db_mngr.objects_added.connect(objects_added)
+        with mock.patch("spinetoolbox.spine_db_worker._BULK_IMPORT_BATCH_SIZE", 2):
+            self._bulk_import(object_classes=("oc",), objects=[("oc", f"o{i}") for i in range(5)])
+        objects_added.assert_called_once()
+        names = sorted(x["name"] for x in self._db_mngr.get_items(self._db_map, "object"))
+        self.assertEqual(names, [f"o{i}" for i in range(5)])
+        self.assertEqual(self._db_mngr.undo_stack[self._db_map].count(), 1)
+
+    def test_undo_removes_imported_items_and_redo_adds_them_back(self):
+        self._bulk_import(object_classes=("oc",), objects=[("oc", "o1"), ("oc", "o2")])
+        undo_stack = self._db_mngr.undo_stack[self._db_map]
+        self._wait_for(self._db_mngr.items_removed_from_cache, undo_stack.undo)
+        self.assertEqual(self._db_mngr.get_items(self._db_map, "object_class"), [])
+        self.assertEqual(self._db_mngr.get_items(self._db_map, "object"), [])
+        self._wait_for(self._db_mngr.objects_added, undo_stack.redo)
+        names = sorted(x["name"] for x in self._db_mngr.get_items(self._db_map, "object"))
+        self.assertEqual(names, ["o1", "o2"])
+
+    def test_undo_restores_updated_items(self):
+        self._bulk_import(object_classes=(("oc", "old description"),))
+        self._bulk_import(object_classes=(("oc", "new description"),))
+        self.assertEqual(self._db_mngr.get_items(self._db_map, "object_class")[0]["description"], "new description")
+        undo_stack = self._db_mngr.undo_stack[self._db_map]
+        self._wait_for(self._db_mngr.object_classes_updated, undo_stack.undo)
+        self.assertEqual(self._db_mngr.get_items(self._db_map, "object_class")[0]["description"], "old description")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+######################################################################################################################
+# Copyright (C) 2017-2021 Spine project consortium
+# This file is part of Spine Toolbox.
+# Spine Toolbox is free software: you can redistribute it and/or modify it under the terms of the GNU Lesser General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your option)
+# any later version. This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Lesser General
+# Public License for more details. You should have received a copy of the GNU Lesser General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+######################################################################################################################
+
+"""
+Unit tests for ``spine_engine_manager`` module.
+
+:date:   18.10.2026
+"""
+
+import json
+import socket
+import socketserver
+from threading import Event, Thread
+import unittest
+from unittest import mock
+from spinetoolbox.spine_engine_manager import (
+    FRAMED_PROTOCOL_VERSION,
+    LEGACY_PROTOCOL_VERSION,
+    RemoteSpineEngineManager,
+    recv_frame,
+    send_frame,
+)
+
+
+class _StandInEngineServer(socketserver.ThreadingTCPServer):
+    """A minimal engine server."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, handler_class, event_batches):
+        super().__init__(("127.0.0.1", 0), handler_class)
+        self.event_batches = event_batches
+        self.connection_count = 0
+        self.requests = []
+        self.released = Event()
+
+
+def _recv_legacy_request(connection):
+    fragments = []
+    while True:
+        chunk = connection.recv(4096)
+        fragments.append(chunk)
+        if len(chunk) < 4096:
+            break
+    return json.loads(b"".join(fragments).decode("ascii"))
+
+
+class _FramedRequestHandler(socketserver.BaseRequestHandler):
+    """Speaks the framed protocol, and answers legacy protocol version requests."""
+
+    def handle(self):
+        self.server.connection_count += 1
+        if self.request.recv(1, socket.MSG_PEEK) == b"[":
+            request, args = _recv_legacy_request(self.request)
+            self.server.requests.append((request, args))
+            self.request.sendall(json.dumps(FRAMED_PROTOCOL_VERSION).encode("ascii"))
+            return
+        while True:
+            try:
+                request, args = json.loads(recv_frame(self.request).decode("utf-8"))
+            except ConnectionError:
+                return
+            self.server.requests.append((request, args))
+            if request == "subscribe_engine_events":
+                for batch in self.server.event_batches:
+                    send_frame(self.request, json.dumps(batch).encode("utf-8"))
+                continue
+            response = {"run_engine": "engine_1", "echo": args}.get(request)
+            send_frame(self.request, json.dumps(response).encode("utf-8"))
+
+
+class _LegacyRequestHandler(socketserver.BaseRequestHandler):
+    """Speaks the legacy protocol and drops the connection on unknown requests."""
+
+    def handle(self):
+        self.server.connection_count += 1
+        request, args = _recv_legacy_request(self.request)
+        self.server.requests.append((request, args))
+        if request == "run_engine":
+            response = "engine_1"
+        elif request == "get_engine_event":
+            response = self.server.event_batches[0].pop(0)
+            if not self.server.event_batches[0]:
+                self.server.event_batches.pop(0)
+        else:
+            return
+        self.request.sendall(json.dumps(response).encode("ascii"))
+
+
+class _SilentRequestHandler(_LegacyRequestHandler):
+    """Speaks the legacy protocol but never answers unknown requests."""
+
+    def handle(self):
+        request, args = _recv_legacy_request(self.request)
+        if request == "get_protocol_version":
+            self.server.released.wait()
+            return
+        self.server.requests.append((request, args))
+        self.request.sendall(json.dumps("engine_1").encode("ascii"))
+
+
+class _EngineServerTestBase(unittest.TestCase):
+    _handler_class = None
+
+    def setUp(self):
+        self._batches = [
+            [["exec_started", {"item_name": "a"}], ["event_msg", {"msg_text": "ü" * 10000}]],
+            [["exec_finished", {"item_name": "a"}], ["dag_exec_finished", "COMPLETED"]],
+        ]
+        self._expected_events = [tuple(event) for batch in self._batches for event in batch]
+        self._server = _StandInEngineServer(self._handler_class, self._batches)
+        self._server_thread = Thread(target=self._server.serve_forever)
+        self._server_thread.start()
+        host, port = self._server.server_address
+        self._manager = RemoteSpineEngineManager(f"{host}:{port}")
+
+    def tearDown(self):
+        self._manager.close()
+        self._server.released.set()
+        self._server.shutdown()
+        self._server.server_close()
+        self._server_thread.join()
+
+    def _get_events(self):
+        events = []
+        while True:
+            event = self._manager.get_engine_event()
+            events.append(event)
+            if event[0] == "dag_exec_finished":
+                return events
+
+
+class TestRemoteSpineEngineManager(_EngineServerTestBase):
+    _handler_class = _FramedRequestHandler
+
+    def test_events_are_streamed_in_order(self):
+        self._manager.run_engine({"items": {}})
+        self.assertEqual(self._get_events(), self._expected_events)
+        self.assertEqual(self._manager.protocol_version, FRAMED_PROTOCOL_VERSION)
+        self.assertIn(("subscribe_engine_events", ["engine_1"]), self._server.requests)
+
+    def test_control_connection_is_reused(self):
+        self._manager.run_engine({})
+        large_argument = {"data": list(range(5000))}
+        for _ in range(10):
+            self.assertEqual(self._manager._send("echo", large_argument), [large_argument])
+        self._manager.stop_engine()
+        # One connection for the protocol version, one for the requests
+        self.assertEqual(self._server.connection_count, 2)
+        self.assertEqual(self._server.requests[0], ("get_protocol_version", []))
+        self.assertEqual(self._server.requests[-1], ("stop_engine", ["engine_1"]))
+
+
+class TestRemoteSpineEngineManagerWithLegacyServer(_EngineServerTestBase):
+    _handler_class = _LegacyRequestHandler
+
+    def test_falls_back_to_polling_over_a_connection_per_request(self):
+        self._batches[0][1][1]["msg_text"] = "a" * 10000
+        self._expected_events[1] = tuple(self._batches[0][1])
+        self._manager.run_engine({"items": {}})
+        self.assertEqual(self._manager.protocol_version, LEGACY_PROTOCOL_VERSION)
+        self.assertEqual(self._get_events(), self._expected_events)
+        requests = [request for request, _ in self._server.requests]
+        self.assertEqual(requests, ["get_protocol_version", "run_engine"] + 4 * ["get_engine_event"])
+        self.assertEqual(self._server.connection_count, len(requests))
+
+
+class TestRemoteSpineEngineManagerWithSilentServer(_EngineServerTestBase):
+    _handler_class = _SilentRequestHandler
+
+    def test_falls_back_to_legacy_protocol_when_protocol_version_does_not_come(self):
+        with mock.patch("spinetoolbox.spine_engine_manager._PROTOCOL_VERSION_TIMEOUT", 0.1):
+            self._manager.run_engine({})
+        self.assertEqual(self._manager.protocol_version, LEGACY_PROTOCOL_VERSION)
+        self.assertEqual(self._server.requests, [("run_engine", [{}])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,10 +17,10 @@ Unit tests for ``spine_engine_worker`` module.
 """
 import time
 import unittest
-from PySide2.QtCore import QObject, Slot
+from PySide2.QtCore import QObject, Signal, Slot
 from PySide2.QtWidgets import QApplication
 from spinetoolbox.dag_handler import DirectedGraphHandler
-from spinetoolbox.spine_engine_worker import SpineEngineWorker
+from spinetoolbox.spine_engine_worker import SpineEngineWorker, _MessageBatcher
 
 
 class TestSpineEngineWorker(unittest.TestCase):
@@ -48,6 +48,40 @@ class TestSpineEngineWorker(unittest.TestCase):
             receiver.deleteLater()
 
 
+class TestMessageBatcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QApplication.instance():
+            QApplication()
+
+    def test_messages_are_delivered_in_batches_in_order_with_emissions(self):
+        batcher = _MessageBatcher(60000, 3)
+        emitter = _Emitter()
+        deliveries = []
+        batcher.messages_arrived.connect(lambda messages: deliveries.append(("messages", messages)))
+        emitter.emitted.connect(lambda text: deliveries.append(("emission", text)))
+        messages = [(None, "", True, "msg", f"line {i}") for i in range(6)]
+        try:
+            batcher.add(messages[0])
+            batcher.add(messages[1])
+            batcher.add_emission(emitter.emitted, "node finished")
+            for message in messages[2:]:
+                batcher.add(message)
+            QApplication.processEvents()
+            self.assertEqual(deliveries, [("messages", messages[:2]), ("emission", "node finished")])
+            QApplication.processEvents()
+            self.assertEqual(deliveries[2:], [("messages", messages[2:5])])
+            batcher.flush()
+            self.assertEqual(deliveries[3:], [("messages", messages[5:])])
+        finally:
+            batcher.deleteLater()
+            emitter.deleteLater()
+
+
+class _Emitter(QObject):
+    emitted = Signal(str)
+
+
 class _Receiver(QObject):
     def __init__(self, worker):
         super().__init__()